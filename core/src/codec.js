@@ -0,0 +1,325 @@
+// the JS counterpart of pyscript.codec (see its documentation for the format)
+const VERSION = 1;
+
+const EXT_REFERENCE = 1;
+const EXT_MEMORYVIEW = 2;
+const EXT_BIGINT = 3;
+
+const { isView } = ArrayBuffer;
+const { isArray } = Array;
+const { isSafeInteger } = Number;
+
+const encoder = new TextEncoder();
+const decoder = new TextDecoder();
+
+class Writer {
+    constructor() {
+        this.bytes = new Uint8Array(256);
+        this.view = new DataView(this.bytes.buffer);
+        this.length = 0;
+    }
+    reserve(size) {
+        const length = this.length + size;
+        if (length > this.bytes.length) {
+            const grown = Math.max(length, this.bytes.length * 2);
+            const bytes = new Uint8Array(grown);
+            bytes.set(this.bytes);
+            this.bytes = bytes;
+            this.view = new DataView(bytes.buffer);
+        }
+        const offset = this.length;
+        this.length = length;
+        return offset;
+    }
+    // the offset is always reserved first, as growing replaces the buffer
+    set(method, size, value) {
+        const offset = this.reserve(size);
+        this.view[method](offset, value);
+    }
+    byte(value) {
+        const offset = this.reserve(1);
+        this.bytes[offset] = value;
+    }
+    uint16(value) {
+        this.set("setUint16", 2, value);
+    }
+    uint32(value) {
+        this.set("setUint32", 4, value);
+    }
+    raw(data) {
+        const offset = this.reserve(data.length);
+        this.bytes.set(data, offset);
+    }
+    size(length, small, limit, codes) {
+        if (length < limit) this.byte(small | length);
+        else if (length < 0x100 && codes[0] !== null) {
+            this.byte(codes[0]);
+            this.byte(length);
+        } else if (length < 0x10000) {
+            this.byte(codes[1]);
+            this.uint16(length);
+        } else {
+            this.byte(codes[2]);
+            this.uint32(length);
+        }
+    }
+    ext(kind, data) {
+        const { length } = data;
+        if (length < 0x100) {
+            this.byte(0xc7);
+            this.byte(length);
+        } else if (length < 0x10000) {
+            this.byte(0xc8);
+            this.uint16(length);
+        } else {
+            this.byte(0xc9);
+            this.uint32(length);
+        }
+        this.byte(kind);
+        this.raw(data);
+    }
+}
+
+const encodeInt = (out, value) => {
+    if (0 <= value && value < 0x80) out.byte(value);
+    else if (-32 <= value && value < 0) out.byte(value & 0xff);
+    else if (0 <= value && value < 0x100) {
+        out.byte(0xcc);
+        out.byte(value);
+    } else if (0 <= value && value < 0x10000) {
+        out.byte(0xcd);
+        out.uint16(value);
+    } else if (0 <= value && value < 0x100000000) {
+        out.byte(0xce);
+        out.uint32(value);
+    } else if (-0x80 <= value && value < 0) {
+        out.byte(0xd0);
+        out.set("setInt8", 1, value);
+    } else if (-0x8000 <= value && value < 0) {
+        out.byte(0xd1);
+        out.set("setInt16", 2, value);
+    } else if (-0x80000000 <= value && value < 0) {
+        out.byte(0xd2);
+        out.set("setInt32", 4, value);
+    } else encodeBigInt(out, BigInt(value));
+};
+
+const encodeBigInt = (out, value) => {
+    if (0n <= value && value < 0x10000000000000000n) {
+        out.byte(0xcf);
+        out.set("setBigUint64", 8, value);
+    } else if (-0x8000000000000000n <= value && value < 0n) {
+        out.byte(0xd3);
+        out.set("setBigInt64", 8, value);
+    } else out.ext(EXT_BIGINT, encoder.encode(String(value)));
+};
+
+const encodeValue = (out, value, seen) => {
+    switch (typeof value) {
+        case "undefined":
+            out.byte(0xc0);
+            return;
+        case "boolean":
+            out.byte(value ? 0xc3 : 0xc2);
+            return;
+        case "number":
+            if (isSafeInteger(value)) encodeInt(out, value);
+            else {
+                out.byte(0xcb);
+                out.set("setFloat64", 8, value);
+            }
+            return;
+        case "bigint":
+            encodeBigInt(out, value);
+            return;
+        case "string": {
+            const data = encoder.encode(value);
+            out.size(data.length, 0xa0, 32, [0xd9, 0xda, 0xdb]);
+            out.raw(data);
+            return;
+        }
+        case "object":
+            if (value === null) {
+                out.byte(0xc0);
+                return;
+            }
+            if (value instanceof ArrayBuffer) {
+                out.size(value.byteLength, 0xc4, 0, [0xc4, 0xc5, 0xc6]);
+                out.raw(new Uint8Array(value));
+                return;
+            }
+            if (isView(value)) {
+                const { buffer, byteOffset, byteLength } = value;
+                const data = new Uint8Array(buffer, byteOffset, byteLength);
+                out.ext(EXT_MEMORYVIEW, data);
+                return;
+            }
+            if (seen.has(value)) {
+                out.byte(0xd6);
+                out.byte(EXT_REFERENCE);
+                out.uint32(seen.get(value));
+                return;
+            }
+            seen.set(value, seen.size);
+            if (isArray(value)) {
+                out.size(value.length, 0x90, 16, [null, 0xdc, 0xdd]);
+                for (const item of value) encodeValue(out, item, seen);
+            } else {
+                const entries = Object.entries(value);
+                out.size(entries.length, 0x80, 16, [null, 0xde, 0xdf]);
+                for (const [key, item] of entries) {
+                    encodeValue(out, key, seen);
+                    encodeValue(out, item, seen);
+                }
+            }
+            return;
+        default:
+            throw new TypeError(`Unexpected value: ${String(value)}`);
+    }
+};
+
+/**
+ * Return the encoded form of `value` as a Uint8Array.
+ * @param {any} value
+ * @returns {Uint8Array}
+ */
+export const encode = (value) => {
+    const out = new Writer();
+    out.byte(VERSION);
+    encodeValue(out, value, new Map());
+    return out.bytes.slice(0, out.length);
+};
+
+class Reader {
+    constructor(bytes) {
+        this.bytes = bytes;
+        const { buffer, byteOffset, byteLength } = bytes;
+        this.view = new DataView(buffer, byteOffset, byteLength);
+        this.offset = 0;
+        this.refs = [];
+    }
+    take(size) {
+        const offset = this.offset;
+        this.offset += size;
+        return offset;
+    }
+    text(length) {
+        const offset = this.take(length);
+        return decoder.decode(this.bytes.subarray(offset, offset + length));
+    }
+    array(length) {
+        const result = [];
+        this.refs.push(result);
+        for (let i = 0; i < length; i++) result.push(this.value());
+        return result;
+    }
+    map(length) {
+        const result = {};
+        this.refs.push(result);
+        for (let i = 0; i < length; i++) {
+            const key = this.value();
+            result[key] = this.value();
+        }
+        return result;
+    }
+    ext(length) {
+        const kind = this.bytes[this.take(1)];
+        const offset = this.take(length);
+        const data = this.bytes.subarray(offset, offset + length);
+        if (kind === EXT_REFERENCE)
+            return this.refs[this.view.getUint32(offset)];
+        if (kind === EXT_MEMORYVIEW) return data.slice();
+        if (kind === EXT_BIGINT) return BigInt(decoder.decode(data));
+        throw new TypeError(`Unsupported extension type: ${kind}`);
+    }
+    int64(value) {
+        return -0x20000000000000n < value && value < 0x20000000000000n
+            ? Number(value)
+            : value;
+    }
+    value() {
+        const { bytes, view } = this;
+        const code = bytes[this.take(1)];
+        if (code < 0x80) return code;
+        if (code >= 0xe0) return code - 0x100;
+        if (code >= 0xa0 && code <= 0xbf) return this.text(code & 0x1f);
+        if (code >= 0x90 && code <= 0x9f) return this.array(code & 0x0f);
+        if (code >= 0x80 && code <= 0x8f) return this.map(code & 0x0f);
+        switch (code) {
+            case 0xc0:
+                return null;
+            case 0xc2:
+                return false;
+            case 0xc3:
+                return true;
+            case 0xc4:
+            case 0xc5:
+            case 0xc6: {
+                const length = this.length(code - 0xc4);
+                const offset = this.take(length);
+                return bytes.slice(offset, offset + length).buffer;
+            }
+            case 0xc7:
+            case 0xc8:
+            case 0xc9:
+                return this.ext(this.length(code - 0xc7));
+            case 0xca:
+                return view.getFloat32(this.take(4));
+            case 0xcb:
+                return view.getFloat64(this.take(8));
+            case 0xcc:
+                return bytes[this.take(1)];
+            case 0xcd:
+                return view.getUint16(this.take(2));
+            case 0xce:
+                return view.getUint32(this.take(4));
+            case 0xcf:
+                return this.int64(view.getBigUint64(this.take(8)));
+            case 0xd0:
+                return view.getInt8(this.take(1));
+            case 0xd1:
+                return view.getInt16(this.take(2));
+            case 0xd2:
+                return view.getInt32(this.take(4));
+            case 0xd3:
+                return this.int64(view.getBigInt64(this.take(8)));
+            case 0xd4:
+            case 0xd5:
+            case 0xd6:
+            case 0xd7:
+            case 0xd8:
+                return this.ext(1 << (code - 0xd4));
+            case 0xd9:
+            case 0xda:
+            case 0xdb:
+                return this.text(this.length(code - 0xd9));
+            case 0xdc:
+            case 0xdd:
+                return this.array(this.length(code - 0xdb));
+            case 0xde:
+            case 0xdf:
+                return this.map(this.length(code - 0xdd));
+        }
+        throw new TypeError(`Invalid type code: ${code}`);
+    }
+    // 0: uint8, 1: uint16, 2: uint32
+    length(size) {
+        const { view } = this;
+        if (size === 0) return view.getUint8(this.take(1));
+        if (size === 1) return view.getUint16(this.take(2));
+        return view.getUint32(this.take(4));
+    }
+}
+
+/**
+ * Return the value encoded in `data`, as created by `encode`.
+ * @param {Uint8Array} data
+ * @returns {any}
+ */
+export const decode = (data) => {
+    if (!data.length || data[0] !== VERSION)
+        throw new TypeError("Unsupported encoding version");
+    const reader = new Reader(data);
+    reader.take(1);
+    return reader.value();
+};
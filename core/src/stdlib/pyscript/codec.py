@@ -0,0 +1,290 @@
+"""
+This module provides a compact, versioned, binary encoding of Python values,
+based on [MessagePack](https://msgpack.org/). It's how `pyscript.storage`
+stores values in IndexedDB (with a JavaScript counterpart used by PyScript
+itself), being both smaller and much faster to encode and decode than
+JSON based formats.
+
+The supported types are `None`, `bool`, `int`, `float`, `str`, `list`,
+`tuple` and `dict` (including nested and circular structures), and binary
+data (`bytes`, `bytearray` and `memoryview`). Tuples are decoded as lists,
+and `bytes` as `bytearray`.
+
+```python
+from pyscript import codec
+
+
+data = codec.encode({"name": "PyScript", "tags": ["python", "web"]})
+value = codec.decode(data)
+```
+
+The encoded data starts with a single byte containing the `VERSION` of the
+encoding, followed by a MessagePack value. Three MessagePack extension types
+are used:
+
+- `1`: a reference to a list or dict that was already encoded (identified
+  by its position, counting from zero, in the order they were encoded), so
+  shared and circular references are preserved. This is only used when a
+  structure is encountered for a second time.
+- `2`: a `memoryview`, containing its bytes.
+- `3`: an integer too big for 64 bits, as decimal ASCII digits.
+"""
+
+import struct
+
+# The version of the encoding, stored as the first byte of encoded data.
+VERSION = 1
+
+_EXT_REFERENCE = 1
+_EXT_MEMORYVIEW = 2
+_EXT_BIGINT = 3
+
+
+def encode(value):
+    """
+    Return the encoded form of `value` as a `bytearray`.
+
+    Will raise a TypeError if the value type (or the type of anything it
+    contains) is not supported.
+    """
+    out = bytearray()
+    out.append(VERSION)
+    _encode(value, out, {})
+    return out
+
+
+def _encode_length(out, length, small, small_limit, codes):
+    """
+    Add the header of a string, binary, array or map of `length` to `out`.
+    """
+    if length < small_limit:
+        out.append(small | length)
+    elif length < 0x100 and codes[0] is not None:
+        out.append(codes[0])
+        out.append(length)
+    elif length < 0x10000:
+        out.append(codes[1])
+        out.extend(struct.pack(">H", length))
+    else:
+        out.append(codes[2])
+        out.extend(struct.pack(">I", length))
+
+
+def _encode_ext(out, kind, data):
+    length = len(data)
+    if length < 0x100:
+        out.append(0xC7)
+        out.append(length)
+    elif length < 0x10000:
+        out.append(0xC8)
+        out.extend(struct.pack(">H", length))
+    else:
+        out.append(0xC9)
+        out.extend(struct.pack(">I", length))
+    out.append(kind)
+    out.extend(data)
+
+
+def _encode_int(value, out):
+    if 0 <= value < 0x80:
+        out.append(value)
+    elif -32 <= value < 0:
+        out.append(value & 0xFF)
+    elif 0 <= value < 0x100:
+        out.append(0xCC)
+        out.append(value)
+    elif 0 <= value < 0x10000:
+        out.append(0xCD)
+        out.extend(struct.pack(">H", value))
+    elif 0 <= value < 0x100000000:
+        out.append(0xCE)
+        out.extend(struct.pack(">I", value))
+    elif 0 <= value < 0x10000000000000000:
+        out.append(0xCF)
+        out.extend(struct.pack(">Q", value))
+    elif -0x80 <= value < 0:
+        out.append(0xD0)
+        out.extend(struct.pack(">b", value))
+    elif -0x8000 <= value < 0:
+        out.append(0xD1)
+        out.extend(struct.pack(">h", value))
+    elif -0x80000000 <= value < 0:
+        out.append(0xD2)
+        out.extend(struct.pack(">i", value))
+    elif -0x8000000000000000 <= value < 0:
+        out.append(0xD3)
+        out.extend(struct.pack(">q", value))
+    else:
+        _encode_ext(out, _EXT_BIGINT, str(value).encode("ascii"))
+
+
+def _encode(value, out, seen):
+    """
+    Add the MessagePack encoding of `value` to `out`. The `seen` dict maps
+    the `id()` of every list and dict already encoded to its position.
+    """
+    if value is None:
+        out.append(0xC0)
+    elif value is True:
+        out.append(0xC3)
+    elif value is False:
+        out.append(0xC2)
+    elif isinstance(value, int):
+        _encode_int(value, out)
+    elif isinstance(value, float):
+        out.append(0xCB)
+        out.extend(struct.pack(">d", value))
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        _encode_length(out, len(data), 0xA0, 32, (0xD9, 0xDA, 0xDB))
+        out.extend(data)
+    elif isinstance(value, (list, tuple, dict)):
+        key = id(value)
+        if key in seen:
+            out.append(0xD6)
+            out.append(_EXT_REFERENCE)
+            out.extend(struct.pack(">I", seen[key]))
+            return
+        seen[key] = len(seen)
+        if isinstance(value, dict):
+            _encode_length(out, len(value), 0x80, 16, (None, 0xDE, 0xDF))
+            for item_key, item in value.items():
+                _encode(item_key, out, seen)
+                _encode(item, out, seen)
+        else:
+            _encode_length(out, len(value), 0x90, 16, (None, 0xDC, 0xDD))
+            for item in value:
+                _encode(item, out, seen)
+    elif isinstance(value, (bytes, bytearray)):
+        _encode_length(out, len(value), 0xC4, 0, (0xC4, 0xC5, 0xC6))
+        out.extend(value)
+    elif isinstance(value, memoryview):
+        _encode_ext(out, _EXT_MEMORYVIEW, bytes(value))
+    else:
+        raise TypeError(f"Cannot serialize type {type(value).__name__} for storage.")
+
+
+def decode(data):
+    """
+    Return the value encoded in `data` (a `bytes`-like object), as created
+    by `encode`.
+
+    Will raise a ValueError if the data was encoded with an unsupported
+    version of the encoding.
+    """
+    if not data or data[0] != VERSION:
+        raise ValueError("Unsupported encoding version.")
+    value, _ = _decode(data, 1, [])
+    return value
+
+
+# The number of bytes, and struct format, of the fixed size values (that
+# follow their type code).
+_FIXED = {
+    0xCA: (4, ">f"),
+    0xCB: (8, ">d"),
+    0xCC: (1, ">B"),
+    0xCD: (2, ">H"),
+    0xCE: (4, ">I"),
+    0xCF: (8, ">Q"),
+    0xD0: (1, ">b"),
+    0xD1: (2, ">h"),
+    0xD2: (4, ">i"),
+    0xD3: (8, ">q"),
+}
+# The number of bytes, and struct format, of the lengths of variable size
+# values (that follow their type code).
+_LENGTHS = {
+    0xC4: (1, ">B"),
+    0xC5: (2, ">H"),
+    0xC6: (4, ">I"),
+    0xC7: (1, ">B"),
+    0xC8: (2, ">H"),
+    0xC9: (4, ">I"),
+    0xD9: (1, ">B"),
+    0xDA: (2, ">H"),
+    0xDB: (4, ">I"),
+    0xDC: (2, ">H"),
+    0xDD: (4, ">I"),
+    0xDE: (2, ">H"),
+    0xDF: (4, ">I"),
+}
+# The lengths of the data of the fixed size extension types.
+_FIXEXT = {0xD4: 1, 0xD5: 2, 0xD6: 4, 0xD7: 8, 0xD8: 16}
+
+
+def _decode(data, pos, refs):
+    """
+    Decode the value starting at `pos` in `data`, returning it and the
+    position after it. Decoded lists and dicts are added to `refs`, in the
+    order they were encoded.
+    """
+    code = data[pos]
+    pos += 1
+    if code < 0x80:
+        return code, pos
+    if code >= 0xE0:
+        return code - 0x100, pos
+    if 0xA0 <= code <= 0xBF:
+        end = pos + (code & 0x1F)
+        return str(data[pos:end], "utf-8"), end
+    if 0x90 <= code <= 0x9F:
+        return _decode_array(data, pos, code & 0x0F, refs)
+    if 0x80 <= code <= 0x8F:
+        return _decode_map(data, pos, code & 0x0F, refs)
+    if code == 0xC0:
+        return None, pos
+    if code == 0xC2:
+        return False, pos
+    if code == 0xC3:
+        return True, pos
+    if code in _FIXED:
+        size, fmt = _FIXED[code]
+        return struct.unpack_from(fmt, data, pos)[0], pos + size
+    if code in _FIXEXT:
+        return _decode_ext(data, pos + 1, _FIXEXT[code], data[pos], refs)
+    if code not in _LENGTHS:
+        raise ValueError(f"Invalid type code: {code}")
+    size, fmt = _LENGTHS[code]
+    length = struct.unpack_from(fmt, data, pos)[0]
+    pos += size
+    if code <= 0xC6:
+        end = pos + length
+        return bytearray(data[pos:end]), end
+    if code <= 0xC9:
+        return _decode_ext(data, pos + 1, length, data[pos], refs)
+    if code <= 0xDB:
+        end = pos + length
+        return str(data[pos:end], "utf-8"), end
+    if code <= 0xDD:
+        return _decode_array(data, pos, length, refs)
+    return _decode_map(data, pos, length, refs)
+
+
+def _decode_array(data, pos, length, refs):
+    result = []
+    refs.append(result)
+    for _ in range(length):
+        item, pos = _decode(data, pos, refs)
+        result.append(item)
+    return result, pos
+
+
+def _decode_map(data, pos, length, refs):
+    result = {}
+    refs.append(result)
+    for _ in range(length):
+        key, pos = _decode(data, pos, refs)
+        result[key], pos = _decode(data, pos, refs)
+    return result, pos
+
+
+def _decode_ext(data, pos, length, kind, refs):
+    end = pos + length
+    if kind == _EXT_REFERENCE:
+        return refs[struct.unpack_from(">I", data, pos)[0]], end
+    if kind == _EXT_MEMORYVIEW:
+        return memoryview(bytearray(data[pos:end])), end
+    if kind == _EXT_BIGINT:
+        return int(str(data[pos:end], "ascii")), end
+    raise ValueError(f"Unsupported extension type: {kind}")
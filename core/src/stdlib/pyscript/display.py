@@ -36,9 +36,11 @@ Heavily inspired by
 import base64
 import html
 import io
+import json
+import js
 from collections import OrderedDict
 from pyscript.context import current_target, document, window
-from pyscript.ffi import is_none
+from pyscript.ffi import create_proxy, is_none
 
 
 def _render_image(mime, value, meta):
@@ -181,30 +183,139 @@ def _get_content_and_mime(obj):
     return html.escape(output), "text/plain"
 
 
-def _write_to_dom(element, value, append):
+_renderer = None
+
+
+def _get_renderer():
     """
-    Given an `element` and a `value`, write formatted content to the referenced
-    DOM element. If `append` is True, content is added to the existing content;
-    otherwise, the existing content is replaced.
+    Return (creating it on first use) a JavaScript function that writes
+    already rendered content to an element.
+
+    The function is created in the main thread (through the proxied `window`
+    in workers), and takes the content as a JSON string, so each `display()`
+    call is a single, possibly cross thread, call. All values are collected
+    in one detached `DocumentFragment`, and the page is only changed once.
 
-    Creates a wrapper `div` when appending multiple items to preserve
-    structure.
+    Each value is still parsed on its own: HTML and JavaScript content via
+    `createContextualFragment`, so their scripts run, and anything else via
+    `innerHTML`, so it never runs scripts.
     """
-    html_content, mime_type = _get_content_and_mime(value)
-    if not html_content.strip():
-        return
-    if append:
-        container = document.createElement("div")
-        element.append(container)
-    else:
-        container = element
-    if mime_type in ("application/javascript", "text/html"):
-        container.append(document.createRange().createContextualFragment(html_content))
+    global _renderer
+    if _renderer is None:
+        _renderer = window.Function("""
+            return (element, append, json) => {
+                const range = document.createRange();
+                const output = document.createDocumentFragment();
+                for (const [fragment, content] of JSON.parse(json)) {
+                    const container = document.createElement("div");
+                    if (fragment)
+                        container.append(range.createContextualFragment(content));
+                    else container.innerHTML = content;
+                    if (append) output.append(container);
+                    else output.append(...container.childNodes);
+                }
+                if (append) element.append(output);
+                else element.replaceChildren(output);
+            };
+            """)()
+    return _renderer
+
+
+def _write_to_dom(element, values, append):
+    """
+    Given an `element` and some `values`, write their formatted content to the
+    referenced DOM element. If `append` is True, content is added to the
+    existing content; otherwise, the existing content is replaced.
+
+    Creates a wrapper `div` for each value when appending, to preserve
+    structure. When replacing, HTML and JavaScript content is added to the
+    content of the previous values, while any other content replaces it.
+    """
+    contents = []
+    for value in values:
+        html_content, mime_type = _get_content_and_mime(value)
+        if not html_content.strip():
+            continue
+        fragment = mime_type in ("application/javascript", "text/html")
+        if not (append or fragment):
+            contents = []
+        contents.append((fragment, html_content))
+    if contents or not append:
+        _get_renderer()(element, append, json.dumps(contents))
+
+
+# Coalesced updates waiting for the next frame, as target id: [element,
+# values replacing the content (or None), values appended to it].
+_pending = {}
+_scheduler = None
+
+
+def _write_pending(element, replace, appended):
+    """
+    Write a pending coalesced update to its `element`.
+    """
+    if replace is not None:
+        _write_to_dom(element, replace, False)
+    if appended:
+        _write_to_dom(element, appended, True)
+
+
+def _flush(*args):
+    """
+    Write all pending coalesced updates to the page.
+
+    Updates are taken one at a time, and a value that fails to render is
+    logged, so it never loses the pending updates of other targets.
+    """
+    while _pending:
+        target, update = _pending.popitem()
+        try:
+            _write_pending(*update)
+        except Exception as error:
+            window.console.error(f"Cannot display in {target}: {error}")
+
+
+def _flush_target(target):
+    """
+    Write the pending coalesced update of the `target`, if any, so content
+    displayed afterwards comes after it.
+    """
+    if target in _pending:
+        _write_pending(*_pending.pop(target))
+
+
+def _schedule_flush():
+    """
+    Flush pending updates on the next animation frame (or in 16ms, where
+    there are no animation frames).
+    """
+    global _scheduler
+    if _scheduler is None:
+        flush = create_proxy(_flush)
+        if hasattr(js, "requestAnimationFrame"):
+            _scheduler = lambda: js.requestAnimationFrame(flush)
+        else:
+            _scheduler = lambda: js.setTimeout(flush, 16)
+    _scheduler()
+
+
+def _coalesce(target, element, values, append):
+    """
+    Keep the `values` to display in the `element` of the `target` until the
+    next flush. Replacing the content discards any previous pending update,
+    while appended values are added to it.
+    """
+    if not _pending:
+        _schedule_flush()
+    if not append:
+        _pending[target] = [element, values, []]
+    elif target in _pending:
+        _pending[target][2].extend(values)
     else:
-        container.innerHTML = html_content
+        _pending[target] = [element, None, list(values)]
 
 
-def display(*values, target=None, append=True):
+def display(*values, target=None, append=True, coalesce=False):
     """
     Display Python objects in the web page.
 
@@ -215,6 +326,10 @@ def display(*values, target=None, append=True):
       can start with '#' (which will be stripped for compatibility).
     * `append`: If `True` (default), add content to existing output. If
       `False`, replace existing content before displaying.
+    * `coalesce`: If `True`, content is only displayed on the next animation
+      frame, and only the latest content replacing the output of a target is
+      ever rendered (values are converted to HTML at that point too). This
+      is useful for updates made many times per second, such as progress.
 
     When used in a worker, `display()` requires an explicit `target` parameter
     to identify where content will be displayed. If used on the main thread,
@@ -242,6 +357,11 @@ def display(*values, target=None, append=True):
 
     # Display multiple values in the default target.
     display("First", "Second", "Third")
+
+    # Only show the latest progress, once per frame.
+    for i in range(1000):
+        display(f"{i / 10}%", target="progress", append=False, coalesce=True)
+        await asyncio.sleep(0)
     ```
     """
     if isinstance(target, str):
@@ -255,9 +375,10 @@ def display(*values, target=None, append=True):
     # If possible, use a script tag's target attribute.
     if element.tagName == "SCRIPT" and hasattr(element, "target"):
         element = element.target
-    # Clear before displaying all values when not appending.
-    if not append:
-        element.replaceChildren()
-    # Add each value.
-    for value in values:
-        _write_to_dom(element, value, append)
+    if coalesce:
+        _coalesce(target, element, values, append)
+        return
+    # Content displayed earlier, but not yet written, goes first.
+    _flush_target(target)
+    # Add all values at once (clearing the element first when not appending).
+    _write_to_dom(element, values, append)
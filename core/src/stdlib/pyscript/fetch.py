@@ -17,12 +17,638 @@ else:
 
 # Pattern 2: Chain method calls directly on the promise.
 data = await fetch(url).json()
+
+# Pattern 3: Stream a large body chunk by chunk.
+async for chunk in fetch(url).iter_bytes(chunk_size=65536):
+    process(chunk)
 ```
+
+Use `fetch_many` to fetch lots of resources with bounded concurrency, and
+`download` to fetch large files straight into the virtual filesystem. Once
+enabled by `record_metrics`, every response records the `metrics` of its
+transfer, aggregated per origin by `stats`.
 """
 
+import asyncio
+import inspect
 import json
+import os
 import js
-from pyscript.util import as_bytearray
+from pyscript.ffi import create_proxy, is_none, to_js
+from pyscript.util import as_bytearray, as_js_buffer
+
+# Lazily created JavaScript factories of Cache API backed response caches,
+# streaming request bodies and byte counting response bodies.
+_response_cache_factory = None
+_stream_factory = None
+_counter_factory = None
+# Whether transfer metrics are recorded (see `record_metrics`), and their
+# aggregation per origin (see `stats`).
+_recording = False
+_stats = {}
+# Milliseconds between saves of the progress of a download.
+_DOWNLOAD_SAVE_INTERVAL = 500
+
+
+def _create_response_cache(name, max_bytes, ttl):
+    """
+    Return a JavaScript object whose `fetch(url, options)` method behaves
+    like the browser's `fetch` but answers GET requests from the named
+    [Cache API](https://developer.mozilla.org/en-US/docs/Web/API/Cache)
+    store when it can (see `ResponseCache`).
+
+    An index of every cached URL (its size in bytes, when it was stored and
+    last used, and the request headers its response varies on) is kept
+    alongside the responses in the same store, so least recently used
+    entries can be evicted without reading any bodies. The index is saved
+    straight away when entries are added or evicted, but only after a delay
+    when they are used, so cache hits don't rewrite it each time.
+    """
+    global _response_cache_factory
+    if _response_cache_factory is None:
+        _response_cache_factory = js.Function("""
+            const INDEX = "https://pyscript.invalid/@pyscript/fetch/index";
+            const SAVE_DELAY = 1000;
+            return (name, maxBytes, ttl) => {
+                const stats = {
+                    hits: 0,
+                    revalidated: 0,
+                    misses: 0,
+                    evictions: 0,
+                    entries: 0,
+                    bytes: 0,
+                };
+                const measure = (index) => {
+                    stats.entries = index.size;
+                    stats.bytes = 0;
+                    for (const entry of index.values()) stats.bytes += entry.size;
+                };
+                let ready = null;
+                const open = () =>
+                    ready ||
+                    (ready = (async () => {
+                        const cache = await caches.open(name);
+                        const stored = await cache.match(INDEX);
+                        const index = new Map(
+                            stored ? Object.entries(await stored.json()) : [],
+                        );
+                        measure(index);
+                        return { cache, index, pending: new Map(), timer: 0 };
+                    })());
+                const save = (state) => {
+                    const { cache, index } = state;
+                    clearTimeout(state.timer);
+                    state.timer = 0;
+                    measure(index);
+                    return cache.put(
+                        INDEX,
+                        new Response(JSON.stringify(Object.fromEntries(index))),
+                    );
+                };
+                // only the last use of entries changed, so save it later
+                const touch = (state) => {
+                    if (state.timer) return;
+                    state.timer = setTimeout(
+                        () => save(state).catch(console.warn),
+                        SAVE_DELAY,
+                    );
+                };
+                // the request headers the response varies on
+                const varies = (request, response) => {
+                    const vary = {};
+                    for (const name of (response.headers.get("Vary") || "").split(",")) {
+                        const header = name.trim().toLowerCase();
+                        if (header) vary[header] = request.headers.get(header);
+                    }
+                    return vary;
+                };
+                const matches = (request, entry) =>
+                    Object.entries(entry.vary || {}).every(
+                        ([header, value]) => request.headers.get(header) === value,
+                    );
+                const evict = async ({ cache, index }) => {
+                    let total = 0;
+                    for (const entry of index.values()) total += entry.size;
+                    if (!maxBytes || total <= maxBytes) return;
+                    const lru = [...index].sort((a, b) => a[1].used - b[1].used);
+                    for (const [key, entry] of lru) {
+                        if (total <= maxBytes) break;
+                        total -= entry.size;
+                        index.delete(key);
+                        stats.evictions++;
+                        await cache.delete(key);
+                    }
+                };
+                const store = async (state, request, key, response) => {
+                    const { status, statusText, headers } = response;
+                    const body = await response.blob();
+                    const now = Date.now();
+                    await state.cache.put(
+                        key,
+                        new Response(body, { status, statusText, headers }),
+                    );
+                    state.index.set(key, {
+                        size: body.size,
+                        stored: now,
+                        used: now,
+                        vary: varies(request, response),
+                    });
+                    await evict(state);
+                    await save(state);
+                };
+                const remember = (state, request, key, response) => {
+                    // Cache a copy in the background, the original streams on.
+                    // Responses varying on everything can't be cached.
+                    const vary = response.headers.get("Vary") || "";
+                    if (response.status === 200 && vary.trim() !== "*") {
+                        const pending = store(state, request, key, response.clone())
+                            .catch(console.warn)
+                            .finally(() => state.pending.delete(key));
+                        state.pending.set(key, pending);
+                    }
+                    return response;
+                };
+                const fresh = (entry, now) =>
+                    ttl != null && now - entry.stored < ttl * 1000;
+                return {
+                    stats,
+                    async fetch(url, options) {
+                        const request = new Request(url, options);
+                        if (request.method !== "GET" || typeof caches === "undefined")
+                            return fetch(request);
+                        const key = request.url;
+                        const state = await open();
+                        await state.pending.get(key);
+                        const entry = state.index.get(key);
+                        const cached =
+                            entry &&
+                            matches(request, entry) &&
+                            (await state.cache.match(key));
+                        if (!cached) {
+                            stats.misses++;
+                            return remember(state, request, key, await fetch(request));
+                        }
+                        const now = Date.now();
+                        entry.used = now;
+                        if (fresh(entry, now)) {
+                            stats.hits++;
+                            touch(state);
+                            return cached;
+                        }
+                        // Stale: ask the server if the cached copy still holds.
+                        const headers = new Headers(request.headers);
+                        const etag = cached.headers.get("ETag");
+                        const modified = cached.headers.get("Last-Modified");
+                        if (etag) headers.set("If-None-Match", etag);
+                        if (modified) headers.set("If-Modified-Since", modified);
+                        const response = await fetch(
+                            new Request(request, { headers }),
+                        );
+                        if (response.status === 304) {
+                            stats.revalidated++;
+                            entry.stored = now;
+                            touch(state);
+                            return cached;
+                        }
+                        stats.misses++;
+                        return remember(state, request, key, response);
+                    },
+                    async clear() {
+                        if (ready) clearTimeout((await ready).timer);
+                        ready = null;
+                        stats.entries = stats.bytes = 0;
+                        if (typeof caches !== "undefined") await caches.delete(name);
+                    },
+                };
+            };
+            """)()
+    return _response_cache_factory(name, max_bytes, ttl)
+
+
+class ResponseCache:
+    """
+    An opt-in, persistent cache of `fetch` responses, backed by the
+    browser's
+    [Cache API](https://developer.mozilla.org/en-US/docs/Web/API/Cache),
+    so cached responses survive page reloads.
+
+    Pass an instance as the `cache` option of `fetch`. Only successful
+    (`200`) responses to `GET` requests are cached. A cached response
+    younger than `ttl` seconds is returned without touching the network.
+    Otherwise (and always, if `ttl` is `None`) it is revalidated with a
+    conditional request, using its `ETag` and `Last-Modified` headers, and
+    only downloaded again if it has changed on the server. A response with
+    a `Vary` header is only used for requests with the same values of the
+    headers it varies on (otherwise, it is replaced), and responses with
+    `Vary: *` are never cached.
+
+    When the cached bodies exceed `max_bytes`, the least recently used
+    entries are evicted. Each instance counts its cache `hits` (served
+    without a request), `revalidated` responses (confirmed unchanged by
+    the server) and `misses` (downloaded), reported by `stats`.
+
+    ```python
+    from pyscript.fetch import fetch, ResponseCache
+
+
+    api_cache = ResponseCache("api", max_bytes=50_000_000, ttl=3600)
+
+    data = await fetch("https://api.example.com/data", cache=api_cache).json()
+    print(api_cache.stats)
+    ```
+
+    The Cache API is only available in secure contexts (`https://` or
+    `localhost`). Elsewhere, requests go straight to the network.
+    """
+
+    def __init__(self, name, max_bytes=None, ttl=None):
+        """
+        Create a cache with a unique `name`, optionally bounded to
+        `max_bytes` of response bodies and trusting cached responses without
+        revalidation for `ttl` seconds.
+        """
+        if not name:
+            raise ValueError("Cache name must be a non-empty string")
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._js_cache = _create_response_cache(
+            f"@pyscript/fetch/{name}", max_bytes, ttl
+        )
+
+    def __repr__(self):
+        return f"<ResponseCache {self.name}>"
+
+    @property
+    def stats(self):
+        """
+        A `dict` of this cache's `hits`, `revalidated` responses, `misses`
+        and `evictions`, plus the number of `entries` and `bytes` stored
+        (as of the last change to the cache).
+        """
+        stats = self._js_cache.stats
+        return {
+            "hits": stats.hits,
+            "revalidated": stats.revalidated,
+            "misses": stats.misses,
+            "evictions": stats.evictions,
+            "entries": stats.entries,
+            "bytes": stats.bytes,
+        }
+
+    async def clear(self):
+        """
+        Remove every cached response.
+        """
+        await self._js_cache.clear()
+
+
+def _count_body(response, on_chunk):
+    """
+    Return a copy of the JavaScript `response` whose body calls `on_chunk`
+    with the size in bytes of each chunk as it arrives from the network.
+    """
+    global _counter_factory
+    if _counter_factory is None:
+        _counter_factory = js.Function("""
+            return (response, onChunk) => {
+                const done = () => {
+                    if (typeof onChunk.destroy === "function") onChunk.destroy();
+                };
+                if (!response.body) {
+                    done();
+                    return response;
+                }
+                const counter = new TransformStream({
+                    transform(chunk, controller) {
+                        onChunk(chunk.byteLength);
+                        controller.enqueue(chunk);
+                    },
+                    flush: done,
+                });
+                const counted = new Response(
+                    response.body.pipeThrough(counter),
+                    response,
+                );
+                for (const key of ["url", "redirected", "type"])
+                    Object.defineProperty(counted, key, { value: response[key] });
+                return counted;
+            };
+            """)()
+    return _counter_factory(response, create_proxy(on_chunk))
+
+
+class _Metrics:
+    """
+    Records when a request started, when its response (headers) arrived,
+    when its body was completely read and when it was converted to Python,
+    as `performance.now()` milliseconds, along with the number of body
+    bytes read.
+
+    If given, `on_progress` is called with the number of bytes read so far
+    and the expected total (the `Content-Length`, or `None` if unknown) as
+    each chunk of the body arrives.
+    """
+
+    def __init__(self, url, on_progress=None, start=None):
+        self.url = url
+        self.start = js.performance.now() if start is None else start
+        self.first_byte = None
+        self.body_complete = None
+        self.converted = None
+        self.bytes = 0
+        self.total = None
+        self.counting = False
+        self._on_progress = on_progress
+        self._recorded = False
+
+    def response(self, response):
+        """
+        Note the arrival of the JavaScript `response`, returning the
+        response to read the body from.
+        """
+        self.first_byte = js.performance.now()
+        length = response.headers.get("Content-Length")
+        if not is_none(length):
+            self.total = int(length)
+        if self._on_progress:
+            self.counting = True
+            return _count_body(response, self.chunk)
+        return response
+
+    def chunk(self, size):
+        """
+        Count a chunk of `size` bytes of the body.
+        """
+        self.bytes += size
+        if self._on_progress:
+            self._on_progress(self.bytes, self.total)
+
+    def body(self, size=None):
+        """
+        Note the body has been completely read, being `size` bytes in size
+        (if not already counted chunk by chunk). If the size isn't known,
+        the `Content-Length` of the response is used instead.
+        """
+        self.body_complete = js.performance.now()
+        if self.counting:
+            return
+        if size is None:
+            size = self.total
+        if size is not None:
+            self.bytes = size
+
+    def done(self):
+        """
+        Note the body has been converted to Python, and add the metrics of
+        this request to those of its origin (while recording metrics).
+        """
+        self.converted = js.performance.now()
+        if self._recorded or not _recording:
+            return
+        self._recorded = True
+        href = js.URL.new(self.url, js.location.href)
+        origin = _stats.setdefault(
+            href.origin,
+            {
+                "requests": 0,
+                "bytes": 0,
+                "time_to_first_byte": 0,
+                "download": 0,
+                "conversion": 0,
+            },
+        )
+        origin["requests"] += 1
+        origin["bytes"] += self.bytes
+        origin["time_to_first_byte"] += self.first_byte - self.start
+        origin["download"] += self.body_complete - self.first_byte
+        origin["conversion"] += self.converted - self.body_complete
+
+    def timing(self):
+        """
+        Return the browser's network timings (in milliseconds) and sizes (in
+        bytes) of the request, from its
+        [PerformanceResourceTiming](https://developer.mozilla.org/en-US/docs/Web/API/PerformanceResourceTiming)
+        entry, or `None` if there isn't one (yet).
+
+        Cross-origin responses without a `Timing-Allow-Origin` header only
+        report zeros for the detailed timings and sizes.
+        """
+        href = js.URL.new(self.url, js.location.href).href
+        entries = js.performance.getEntriesByName(href, "resource")
+        if not entries.length:
+            return None
+        entry = entries.at(-1)
+        return {
+            "dns": entry.domainLookupEnd - entry.domainLookupStart,
+            "connect": entry.connectEnd - entry.connectStart,
+            "waiting": entry.responseStart - entry.requestStart,
+            "download": entry.responseEnd - entry.responseStart,
+            "transfer_size": entry.transferSize,
+            "encoded_body_size": entry.encodedBodySize,
+            "decoded_body_size": entry.decodedBodySize,
+        }
+
+    def as_dict(self):
+        return {
+            "url": self.url,
+            "start": self.start,
+            "first_byte": self.first_byte,
+            "body_complete": self.body_complete,
+            "converted": self.converted,
+            "bytes": self.bytes,
+            "total": self.total,
+            "timing": self.timing(),
+        }
+
+
+class _NoMetrics:
+    """
+    Stands in for the `_Metrics` of requests made while metrics are not
+    recorded (and without progress callbacks), so they cost nothing.
+    """
+
+    counting = False
+    bytes = 0
+
+    def response(self, response):
+        return response
+
+    def chunk(self, size):
+        pass
+
+    def body(self, size=None):
+        pass
+
+    def done(self):
+        pass
+
+    def as_dict(self):
+        return None
+
+
+_NO_METRICS = _NoMetrics()
+
+
+def _metrics_for(url, on_progress=None, start=None):
+    """
+    Return the `_Metrics` of a request for `url`, or `_NO_METRICS` if they
+    are neither recorded nor needed to report progress to `on_progress`.
+    """
+    if _recording or on_progress:
+        return _Metrics(url, on_progress, start)
+    return _NO_METRICS
+
+
+def record_metrics(enabled=True):
+    """
+    Start (or, if `enabled` is false, stop) recording the transfer metrics
+    of requests, available per request as `response.metrics` and per origin
+    via `stats`.
+
+    Recording is off by default, so requests don't pay for the timestamps
+    and bookkeeping unless they're used.
+
+    ```python
+    from pyscript.fetch import record_metrics
+
+
+    record_metrics()
+    ```
+    """
+    global _recording
+    _recording = enabled
+
+
+def stats():
+    """
+    Return the transfer metrics of the requests made so far, aggregated per
+    origin. Only requests made while recording metrics (see
+    `record_metrics`) and whose body has been read are included.
+
+    For each origin, the dict contains the number of `requests`, the total
+    number of body `bytes` read, and the average time (in milliseconds) from
+    the start of a request to the arrival of its response
+    (`time_to_first_byte`), to read its body (`download`), and to convert
+    the body to Python (`conversion`).
+
+    ```python
+    from pyscript.fetch import record_metrics, stats
+
+
+    record_metrics()
+    await fetch("https://example.com/data.json").json()
+    for origin, numbers in stats().items():
+        print(origin, numbers["requests"], numbers["time_to_first_byte"])
+    ```
+    """
+    result = {}
+    for origin, totals in _stats.items():
+        count = totals["requests"]
+        result[origin] = {
+            "requests": count,
+            "bytes": totals["bytes"],
+            "time_to_first_byte": totals["time_to_first_byte"] / count,
+            "download": totals["download"] / count,
+            "conversion": totals["conversion"] / count,
+        }
+    return result
+
+
+class _BodyIterator:
+    """
+    Asynchronously iterates over a response body via its `ReadableStream`
+    reader, so the whole body never needs to be held in memory at once.
+
+    The `response` is either a `_FetchResponse` or an async function
+    returning one (so iteration can start directly on the fetch promise).
+    Binary chunks are `bytearray` instances, re-sized to `chunk_size` bytes
+    if given (only the final chunk may be shorter). If an `encoding` is
+    given, chunks are instead decoded to `str` in JavaScript, correctly
+    handling characters split across network chunks.
+    """
+
+    def __init__(self, response, chunk_size=None, encoding=None):
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+        self._response = response
+        self._chunk_size = chunk_size
+        self._decoder = js.TextDecoder.new(encoding) if encoding else None
+        self._reader = None
+        self._metrics = None
+        self._buffer = bytearray()
+        self._offset = 0
+        self._done = False
+
+    def __aiter__(self):
+        return self
+
+    async def _read(self):
+        """
+        Read the next chunk (a JavaScript `Uint8Array`) from the body,
+        returning `None` once the body is exhausted.
+        """
+        if self._reader is None:
+            response = self._response
+            if not isinstance(response, _FetchResponse):
+                response = await response()
+            self._metrics = response._metrics
+            body = response._response.body
+            if is_none(body):
+                self._metrics.body(0)
+                self._metrics.done()
+                return None
+            self._reader = body.getReader()
+        result = await self._reader.read()
+        if result.done:
+            self._metrics.body(self._metrics.bytes)
+            self._metrics.done()
+            return None
+        value = result.value
+        if not self._metrics.counting:
+            self._metrics.chunk(value.byteLength)
+        return value
+
+    async def __anext__(self):
+        if self._decoder:
+            return await self._next_text()
+        if self._chunk_size is None:
+            value = None if self._done else await self._read()
+            if value is None:
+                self._done = True
+                raise StopAsyncIteration
+            return as_bytearray(value)
+        size = self._chunk_size
+        buffer = self._buffer
+        while not self._done and len(buffer) - self._offset < size:
+            value = await self._read()
+            if value is None:
+                self._done = True
+            else:
+                if self._offset:
+                    # Only the (shorter than chunk_size) remainder is copied.
+                    buffer = buffer[self._offset :]
+                    self._offset = 0
+                buffer.extend(as_bytearray(value))
+        self._buffer = buffer
+        start = self._offset
+        if start == len(buffer):
+            raise StopAsyncIteration
+        self._offset = min(start + size, len(buffer))
+        return buffer[start : self._offset]
+
+    async def _next_text(self):
+        while not self._done:
+            value = await self._read()
+            if value is None:
+                self._done = True
+                # Flush any incomplete character left in the decoder.
+                text = self._decoder.decode()
+            else:
+                text = self._decoder.decode(value, to_js({"stream": True}))
+            if text:
+                return text
+        raise StopAsyncIteration
 
 
 class _FetchResponse:
@@ -31,10 +657,33 @@ class _FetchResponse:
 
     This wrapper ensures that data returned from fetch is, if possible, in
     native Python types rather than JavaScript types.
+
+    The `metrics` (a `_Metrics` instance, or `_NO_METRICS`) of the request
+    are completed as the body is read.
     """
 
-    def __init__(self, response):
-        self._response = response
+    def __init__(self, response, metrics=None):
+        if metrics is None:
+            metrics = _metrics_for(response.url)
+        self._metrics = metrics
+        self._response = metrics.response(response)
+
+    @property
+    def metrics(self):
+        """
+        A dict of the transfer metrics of this request: the `url`, the
+        `performance.now()` timestamps (in milliseconds) of its `start`,
+        the arrival of its response (`first_byte`), when the body was
+        completely read (`body_complete`) and converted to Python
+        (`converted`), the number of body `bytes` read, the expected
+        `total` (from `Content-Length`, or `None`) and the browser's
+        network `timing` details (see `PerformanceResourceTiming`), if any.
+        Timestamps are `None` until reached.
+
+        This is `None` unless metrics are recorded (see `record_metrics`),
+        or the request has an `on_progress` callback.
+        """
+        return self._metrics.as_dict()
 
     def __getattr__(self, attr):
         """
@@ -50,11 +699,15 @@ class _FetchResponse:
         the raw binary data.
         """
         buffer = await self._response.arrayBuffer()
+        self._metrics.body(buffer.byteLength)
         if hasattr(buffer, "to_py"):
             # Pyodide conversion.
-            return buffer.to_py()
-        # MicroPython conversion.
-        return memoryview(as_bytearray(buffer))
+            result = buffer.to_py()
+        else:
+            # MicroPython conversion.
+            result = memoryview(as_bytearray(buffer))
+        self._metrics.done()
+        return result
 
     async def blob(self):
         """
@@ -62,7 +715,10 @@ class _FetchResponse:
 
         Returns the raw JS Blob for use with other JS APIs.
         """
-        return await self._response.blob()
+        blob = await self._response.blob()
+        self._metrics.body(blob.size)
+        self._metrics.done()
+        return blob
 
     async def bytearray(self):
         """
@@ -71,7 +727,10 @@ class _FetchResponse:
         Returns a mutable bytearray containing the response data.
         """
         buffer = await self._response.arrayBuffer()
-        return as_bytearray(buffer)
+        self._metrics.body(buffer.byteLength)
+        result = as_bytearray(buffer)
+        self._metrics.done()
+        return result
 
     async def json(self):
         """
@@ -79,13 +738,46 @@ class _FetchResponse:
 
         Returns native Python dicts, lists, strings, numbers, etc.
         """
-        return json.loads(await self.text())
+        result = json.loads(await self._text())
+        self._metrics.done()
+        return result
 
     async def text(self):
         """
         Get response body as a text string.
         """
-        return await self._response.text()
+        result = await self._text()
+        self._metrics.done()
+        return result
+
+    async def _text(self):
+        text = await self._response.text()
+        self._metrics.body()
+        return text
+
+    def iter_bytes(self, chunk_size=None):
+        """
+        Asynchronously iterate over the response body as `bytearray` chunks,
+        as they arrive from the network, without buffering the whole body.
+
+        If `chunk_size` is given, chunks are re-sized to that many bytes
+        (only the final chunk may be shorter).
+
+        ```python
+        response = await fetch(url)
+        with open("/data/large.bin", "wb") as f:
+            async for chunk in response.iter_bytes(chunk_size=1024 * 1024):
+                f.write(chunk)
+        ```
+        """
+        return _BodyIterator(self, chunk_size)
+
+    def iter_text(self, encoding="utf-8"):
+        """
+        Asynchronously iterate over the response body as `str` chunks,
+        decoded with the given `encoding`, as they arrive from the network.
+        """
+        return _BodyIterator(self, encoding=encoding)
 
 
 class _FetchPromise:
@@ -109,13 +801,15 @@ class _FetchPromise:
         promise.bytearray = self.bytearray
         promise.json = self.json
         promise.text = self.text
+        promise.iter_bytes = self.iter_bytes
+        promise.iter_text = self.iter_text
 
     @staticmethod
-    def setup(promise, response):
+    def setup(promise, response, metrics=None):
         """
         Store the resolved response on the promise for later access.
         """
-        promise._response = _FetchResponse(response)
+        promise._response = _FetchResponse(response, metrics)
         return promise._response
 
     async def _get_response(self):
@@ -146,6 +840,581 @@ class _FetchPromise:
         response = await self._get_response()
         return await response.text()
 
+    def iter_bytes(self, chunk_size=None):
+        return _BodyIterator(self._get_response, chunk_size)
+
+    def iter_text(self, encoding="utf-8"):
+        return _BodyIterator(self._get_response, encoding=encoding)
+
+
+def _stream_body(iterator):
+    """
+    Return a JavaScript `ReadableStream` pulling its chunks from the Python
+    (async or plain) `iterator` of `bytes`-like or `str` chunks.
+
+    The proxy of the function returning the next chunk is destroyed once
+    the stream is closed, cancelled or errored.
+    """
+    global _stream_factory
+    if _stream_factory is None:
+        _stream_factory = js.Function("""
+            return (next) => {
+                const destroy = () => {
+                    if (typeof next.destroy === "function") next.destroy();
+                };
+                return new ReadableStream({
+                    async pull(controller) {
+                        let chunk;
+                        try {
+                            chunk = await next();
+                        } catch (error) {
+                            destroy();
+                            throw error;
+                        }
+                        if (chunk == null) {
+                            controller.close();
+                            destroy();
+                        } else controller.enqueue(chunk);
+                    },
+                    cancel: destroy,
+                });
+            };
+            """)()
+    is_async = hasattr(iterator, "__aiter__")
+    if is_async:
+        iterator = iterator.__aiter__()
+
+    async def next_chunk():
+        try:
+            chunk = await iterator.__anext__() if is_async else next(iterator)
+        except (StopAsyncIteration, StopIteration):
+            return None
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        return as_js_buffer(chunk)
+
+    return _stream_factory(create_proxy(next_chunk))
+
+
+def _convert_body(body):
+    """
+    Convert a request `body` to JavaScript. Returns a tuple containing the
+    converted body and a flag indicating if it is a stream.
+    """
+    if isinstance(body, str):
+        return body, False
+    try:
+        # bytes, bytearray, memoryview, array.array and other buffers.
+        return as_js_buffer(body), False
+    except TypeError:
+        pass
+    if hasattr(body, "getReader"):
+        # A JavaScript ReadableStream (which Pyodide also makes iterable in
+        # Python) is passed as it is.
+        return body, True
+    if hasattr(body, "__aiter__") or inspect.isgenerator(body):
+        return _stream_body(body), True
+    if isinstance(body, (dict, list)):
+        return to_js(body), False
+    # JavaScript objects (Blob, FormData, ReadableStream etc.) as they are.
+    return body, False
+
+
+def _prepare(options):
+    """
+    Given the Python `options` of a request, return the JavaScript function
+    to fetch it with and the options converted to a JavaScript object.
+
+    Options are converted directly (rather than via JSON), so that request
+    bodies can be binary data or streams.
+    """
+    options = dict(options)
+    # Progress is reported by the response (see `_Metrics`).
+    options.pop("on_progress", None)
+    # A ResponseCache replaces the browser's fetch for this request.
+    fetcher = js.fetch
+    if isinstance(options.get("cache"), ResponseCache):
+        fetcher = options.pop("cache")._js_cache.fetch
+    body = options.pop("body", None)
+    js_options = to_js(options)
+    if not is_none(body):
+        js_body, streaming = _convert_body(body)
+        js_options.body = js_body
+        if streaming:
+            # Required by browsers for streaming request bodies.
+            js_options.duplex = "half"
+    return fetcher, js_options
+
+
+def _canonical(value):
+    """
+    Return `value` with the items of every `dict` sorted by key, as lists,
+    so equal options give the same JSON whatever their order (MicroPython's
+    `json.dumps` has no `sort_keys`).
+    """
+    if isinstance(value, dict):
+        return [[key, _canonical(value[key])] for key in sorted(value)]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def _request_key(url, options):
+    """
+    Return a hashable key identifying the request for `url` with `options`.
+
+    Only `GET` and `HEAD` requests, which have no side effects, can have
+    the same key: any other request gets a unique one.
+    """
+    if str(options.get("method", "GET")).upper() not in ("GET", "HEAD"):
+        return object()
+    plain = {}
+    cache = None
+    for name, value in options.items():
+        if isinstance(value, ResponseCache):
+            cache = value.name
+        elif name != "on_progress":
+            plain[name] = value
+    try:
+        return (url, json.dumps(_canonical(plain)), cache)
+    except TypeError:
+        # Binary or streamed bodies: never considered duplicates.
+        return object()
+
+
+class _FetchMany:
+    """
+    Fetches a batch of `requests` (`(url, options)` pairs) with at most
+    `concurrency` of them in flight at once.
+
+    Duplicate `GET` and `HEAD` requests (same URL and options) are only
+    fetched once: every duplicate gets its own clone of the response, so
+    each body can be read independently.
+
+    The batch is either awaited as a whole via `gather()`, or iterated
+    asynchronously to get `(url, response)` pairs in completion order. The
+    requests not complete yet are cancelled by `aclose()`, also called when
+    leaving an `async with` block, and when an iterator over the batch is
+    finalized (see `_FetchManyIterator`).
+    """
+
+    def __init__(self, requests, concurrency):
+        if concurrency < 1:
+            raise ValueError("concurrency must be a positive integer.")
+        self._concurrency = concurrency
+        self._requests = requests
+        # Unique requests, and the indexes of the requests they satisfy.
+        self._unique = []
+        self._targets = []
+        seen = {}
+        for index, (url, options) in enumerate(requests):
+            key = _request_key(url, options)
+            if key not in seen:
+                seen[key] = len(self._unique)
+                self._unique.append((url, options))
+                self._targets.append([])
+            self._targets[seen[key]].append(index)
+        self._next = 0
+        self._results = [None] * len(requests)
+        self._completed = []
+        self._yielded = 0
+        self._event = asyncio.Event()
+        self._started = False
+        self._tasks = []
+
+    def _start(self):
+        if not self._started:
+            self._started = True
+            for _ in range(min(self._concurrency, len(self._unique))):
+                self._tasks.append(asyncio.create_task(self._worker()))
+
+    def _cancel(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def _worker(self):
+        while self._next < len(self._unique):
+            position = self._next
+            self._next += 1
+            url, options = self._unique[position]
+            start = js.performance.now() if _recording else None
+            try:
+                fetcher, js_options = _prepare(options)
+                response = await fetcher(url, js_options)
+            except Exception as error:
+                response = error
+            self._deliver(position, response, start)
+
+    def _deliver(self, position, response, start):
+        targets = self._targets[position]
+        last = len(targets) - 1
+        for i, index in enumerate(targets):
+            if isinstance(response, Exception):
+                result = response
+            else:
+                url, options = self._requests[index]
+                metrics = _metrics_for(url, options.get("on_progress"), start)
+                # Clones must be taken before the original body is read.
+                source = response.clone() if i < last else response
+                result = _FetchResponse(source, metrics)
+            self._results[index] = result
+            self._completed.append(index)
+        self._event.set()
+
+    async def _wait(self):
+        self._event.clear()
+        await self._event.wait()
+
+    async def gather(self):
+        """
+        Wait for every request, returning the responses in request order.
+        The first error, if any, is raised instead.
+        """
+        self._start()
+        try:
+            while len(self._completed) < len(self._requests):
+                await self._wait()
+        finally:
+            self._cancel()
+        for result in self._results:
+            if isinstance(result, Exception):
+                raise result
+        return self._results
+
+    async def aclose(self):
+        """
+        Stop fetching: requests that are not complete yet are cancelled.
+        """
+        self._cancel()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    def __aiter__(self):
+        return _FetchManyIterator(self)
+
+    async def _next_result(self):
+        if self._yielded == len(self._requests):
+            raise StopAsyncIteration
+        self._start()
+        while len(self._completed) == self._yielded:
+            await self._wait()
+        index = self._completed[self._yielded]
+        self._yielded += 1
+        result = self._results[index]
+        if isinstance(result, Exception):
+            raise result
+        return self._requests[index][0], result
+
+
+class _FetchManyIterator:
+    """
+    Iterates asynchronously over the responses of a `_FetchMany` `batch`.
+
+    The worker tasks only reference the batch, so this iterator is
+    finalized as soon as iteration is abandoned (for example, after a
+    `break` out of an `async for` loop), cancelling the requests that are
+    not complete yet. Pyodide finalizes it straight away, MicroPython on its
+    next garbage collection.
+    """
+
+    def __init__(self, batch):
+        self._batch = batch
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self._batch._next_result()
+
+    def __del__(self):
+        self._batch._cancel()
+
+
+def fetch_many(urls, concurrency=8, as_completed=False, **options):
+    """
+    Fetch many resources concurrently, with at most `concurrency` requests
+    in flight at any one time, so the browser's connection pool isn't
+    flooded.
+
+    Each item of `urls` is either a URL, fetched with the shared `options`
+    (as for `fetch`), or a `(url, options)` tuple with its own options.
+    Duplicate `GET` and `HEAD` requests (same URL and options) are only
+    sent once, while other requests, which may have side effects, are always
+    sent.
+
+    By default, awaiting the result returns a `list` of responses in the
+    same order as `urls` (raising the first error, if any). If
+    `as_completed` is true, the result is instead an asynchronous iterator
+    of `(url, response)` pairs, in the order the responses arrive. The
+    remaining requests are cancelled if iteration stops early, as soon as
+    the iterator is garbage collected. Use it with `async with` (or call its
+    `aclose()` method) to cancel them at a known point instead.
+
+    The responses have the same methods (`json()`, `text()`,
+    `bytearray()`, `iter_bytes()` etc.) as those returned by `fetch`.
+
+    ```python
+    from pyscript.fetch import fetch_many
+
+
+    urls = [f"https://api.example.com/items/{i}" for i in range(500)]
+
+    # All responses, in order.
+    responses = await fetch_many(urls, concurrency=8)
+    items = [await response.json() for response in responses]
+
+    # Process responses as soon as each one arrives.
+    async for url, response in fetch_many(urls, as_completed=True):
+        print(url, response.status)
+
+    # Stop at the first missing item, cancelling the other requests.
+    async with fetch_many(urls, as_completed=True) as responses:
+        async for url, response in responses:
+            if response.status == 404:
+                break
+    ```
+    """
+    requests = []
+    for item in urls:
+        if isinstance(item, str):
+            requests.append((item, options))
+        else:
+            url, item_options = item
+            merged = dict(options)
+            merged.update(item_options)
+            requests.append((url, merged))
+    batch = _FetchMany(requests, concurrency)
+    if as_completed:
+        return batch
+    return batch.gather()
+
+
+class _Download:
+    """
+    Downloads `url` into the file at `path`, as `parts` HTTP `Range`
+    requests running in parallel, each writing its segment straight into
+    the (pre-sized) file as chunks of up to `chunk_size` bytes arrive.
+
+    Progress is recorded in a JSON file alongside the download (`path` +
+    `".download"`), at most every `_DOWNLOAD_SAVE_INTERVAL` milliseconds and
+    whenever a part stops, so an interrupted download resumes where each
+    part left off. The file is removed once complete.
+    """
+
+    def __init__(self, url, path, parts, chunk_size, on_progress, options):
+        if parts < 1:
+            raise ValueError("parts must be a positive integer.")
+        self.url = url
+        self.path = path
+        self.parts = parts
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.options = options
+        self.state_path = path + ".download"
+        self.state = None
+        self.saved_at = 0
+        self.done = 0
+        self.total = None
+
+    def _headers(self, **extra):
+        headers = dict(self.options.get("headers") or {})
+        headers.update(extra)
+        return headers
+
+    async def _fetch(self, **options):
+        request = dict(self.options)
+        request.update(options)
+        metrics = _metrics_for(self.url)
+        fetcher, js_options = _prepare(request)
+        return _FetchResponse(await fetcher(self.url, js_options), metrics)
+
+    def _header(self, response, name):
+        value = response.headers.get(name)
+        return None if is_none(value) else value
+
+    def _progress(self, size):
+        self.done += size
+        if self.on_progress:
+            self.on_progress(self.done, self.total)
+
+    def _load_state(self, size, validator):
+        """
+        Return the saved state of a previous attempt at this download, if it
+        is for the same (unchanged) resource.
+
+        Without a `validator` (an `ETag` or `Last-Modified` header), a
+        changed resource of the same size can't be told apart, so the
+        download always restarts from zero.
+        """
+        if not validator:
+            return None
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+            with open(self.path, "rb") as f:
+                f.seek(0, 2)
+                if f.tell() != size:
+                    return None
+        except OSError:
+            return None
+        if (state["url"], state["size"], state["validator"]) == (
+            self.url,
+            size,
+            validator,
+        ):
+            return state
+        return None
+
+    def _save_state(self):
+        with open(self.state_path, "w") as f:
+            json.dump(self.state, f)
+        self.saved_at = js.performance.now()
+
+    def _remove_state(self):
+        try:
+            os.remove(self.state_path)
+        except OSError:
+            pass
+
+    async def run(self):
+        head = await self._fetch(method="HEAD")
+        size = int(self._header(head, "Content-Length") or 0)
+        ranges = self._header(head, "Accept-Ranges") == "bytes"
+        if not (head.ok and ranges and size):
+            return await self._download_whole()
+        validator = self._header(head, "ETag") or self._header(head, "Last-Modified")
+        self.total = size
+        self.state = self._load_state(size, validator)
+        if self.state is None:
+            # Pre-size the file, so every part can write at its own offset.
+            with open(self.path, "wb") as f:
+                f.seek(size - 1)
+                f.write(b"\0")
+            step = -(-size // self.parts)
+            self.state = {
+                "url": self.url,
+                "size": size,
+                "validator": validator,
+                # [first byte, last byte, bytes written] for each part.
+                "parts": [
+                    [start, min(start + step, size) - 1, 0]
+                    for start in range(0, size, step)
+                ],
+            }
+            self._save_state()
+        self._progress(sum(part[2] for part in self.state["parts"]))
+        tasks = [
+            asyncio.create_task(self._download_part(part))
+            for part in self.state["parts"]
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the other parts too, letting them save their progress.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        self._remove_state()
+        return size
+
+    async def _download_part(self, part):
+        start, end, written = part
+        if start + written > end:
+            return
+        headers = self._headers(Range=f"bytes={start + written}-{end}")
+        validator = self.state["validator"]
+        if validator:
+            # The server sends the whole (changed) resource if this is stale.
+            headers["If-Range"] = validator
+        response = await self._fetch(method="GET", headers=headers)
+        if response.status != 206:
+            raise RuntimeError(
+                f"Range request for {self.url} failed ({response.status}), "
+                "the resource may have changed: delete "
+                f"{self.state_path} to restart the download."
+            )
+        try:
+            with open(self.path, "r+b") as f:
+                f.seek(start + written)
+                async for chunk in response.iter_bytes(self.chunk_size):
+                    f.write(chunk)
+                    f.flush()
+                    part[2] += len(chunk)
+                    now = js.performance.now()
+                    if now - self.saved_at >= _DOWNLOAD_SAVE_INTERVAL:
+                        self._save_state()
+                    self._progress(len(chunk))
+        finally:
+            self._save_state()
+
+    async def _download_whole(self):
+        """
+        Stream the whole resource into the file (for servers without support
+        for range requests, or not reporting the size of the resource).
+        """
+        response = await self._fetch(method="GET")
+        if not response.ok:
+            raise RuntimeError(f"Download of {self.url} failed ({response.status}).")
+        # Any earlier attempt can't be resumed.
+        self._remove_state()
+        length = self._header(response, "Content-Length")
+        self.total = int(length) if length else None
+        with open(self.path, "wb") as f:
+            async for chunk in response.iter_bytes(self.chunk_size):
+                f.write(chunk)
+                self._progress(len(chunk))
+        return self.done
+
+
+async def download(url, path, parts=4, chunk_size=1048576, on_progress=None, **options):
+    """
+    Download the resource at `url` into the (virtual filesystem) file at
+    `path`, returning its size in bytes.
+
+    The download is split into `parts` segments fetched in parallel via
+    HTTP `Range` requests. Each segment is written straight into its place
+    in the file as chunks of up to `chunk_size` bytes arrive, so the
+    resource is never held in memory as a whole.
+
+    If the download is interrupted (and the file, along with the
+    `path + ".download"` progress file next to it, is still there) calling
+    `download` again resumes it, provided the server identifies the version
+    of the resource (via an `ETag` or `Last-Modified` header) and it hasn't
+    changed. Otherwise, the download restarts from zero. The `on_progress` callback, if given, is called with the
+    number of bytes downloaded so far and the total size of the download
+    (`None` if unknown) after every chunk.
+
+    Servers that don't support range requests, or don't report the size of
+    the resource, are downloaded as a single stream. The `options` are
+    fetch options (such as `headers`), as for `fetch`.
+
+    ```python
+    from pyscript.fetch import download
+
+
+    def report(done, total):
+        if total:
+            print(f"{done * 100 // total}%")
+        else:
+            print(f"{done} bytes")
+
+    size = await download(
+        "https://example.com/dataset.bin",
+        "/data/dataset.bin",
+        parts=4,
+        on_progress=report,
+    )
+    ```
+    """
+    job = _Download(url, path, parts, chunk_size, on_progress, options)
+    return await job.run()
+
 
 def fetch(url, **options):
     """
@@ -161,7 +1430,14 @@ def fetch(url, **options):
 
     - `method`: HTTP method (e.g., `"GET"`, `"POST"`, `"PUT"` etc.)
     - `headers`: Dict of request headers.
-    - `body`: Request body (string, dict for JSON, etc.)
+    - `body`: Request body: a string, binary data (`bytes`, `bytearray`,
+      `memoryview` or other buffer), a JavaScript object such as `Blob` or
+      `FormData`, or an (async) iterator of chunks to stream the upload.
+
+    The `cache` option may also be a `ResponseCache` instance, to answer the
+    request from a persistent response cache when possible. An `on_progress`
+    function, if given, is called with the number of bytes received so far
+    and the expected total (or `None` if unknown) as the body arrives.
 
     The function returns a promise that resolves to a Response-like object
     with Pythonic methods to extract data:
@@ -171,12 +1447,15 @@ def fetch(url, **options):
     - `await response.bytearray()` to get raw data as a bytearray.
     - `await response.arrayBuffer()` to get raw data as a memoryview or bytes.
     - `await response.blob()` to get the raw JS Blob object.
+    - `async for chunk in response.iter_bytes()` to stream raw data.
+    - `async for text in response.iter_text()` to stream text data.
 
     It's also possible to chain these methods directly on the fetch promise:
     `data = await fetch(url).json()`
 
     The returned response object also exposes standard properties like
-    `ok`, `status`, and `statusText` for checking response status.
+    `ok`, `status`, and `statusText` for checking response status, and the
+    transfer `metrics` of the request (see `record_metrics` and `stats`).
 
     ```python
     # Simple GET request.
@@ -195,6 +1474,16 @@ def fetch(url, **options):
     )
     result = await response.json()
 
+    # POST binary data.
+    response = await fetch(url, method="POST", body=bytes([1, 2, 3]))
+
+    # Stream an upload from an async iterator (or generator) of chunks.
+    response = await fetch(url, method="POST", body=read_chunks())
+
+    # Persistently cache responses.
+    api_cache = ResponseCache("api", ttl=3600)
+    data = await fetch("https://api.example.com/data", cache=api_cache).json()
+
     # Check response status codes.
     response = await fetch("https://api.example.com/data")
     if response.ok:
@@ -206,13 +1495,13 @@ def fetch(url, **options):
         print(f"Error: {response.status} {response.statusText}")
     ```
     """
-    # Convert Python dict to JavaScript object.
-    js_options = js.JSON.parse(json.dumps(options))
+    metrics = _metrics_for(url, options.pop("on_progress", None))
+    fetcher, js_options = _prepare(options)
 
     # Setup response handler to wrap the result.
     def on_response(response, *_):
-        return _FetchPromise.setup(promise, response)
+        return _FetchPromise.setup(promise, response, metrics)
 
-    promise = js.fetch(url, js_options).then(on_response)
+    promise = fetcher(url, js_options).then(on_response)
     _FetchPromise(promise)
     return promise
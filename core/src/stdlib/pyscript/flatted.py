@@ -2,7 +2,9 @@
 This module is a Python implementation of the
 [Flatted JavaScript library](https://www.npmjs.com/package/flatted), which
 provides a light and fast way to serialize and deserialize JSON structures
-that contain circular references.
+that contain circular references. It's maintained as part of PyScript
+(rather than copied from the `flatted` package), and reads and writes the
+same format as the JavaScript library.
 
 Standard JSON cannot handle circular references - attempting to serialize an
 object that references itself will cause an error. Flatted solves this by
@@ -34,115 +36,67 @@ assert restored["self"] is restored  # Circular reference preserved!
 
 import json as _json
 
+# Options making json.dumps output match JavaScript's JSON.stringify.
+_COMPACT = {"separators": (",", ":")}
+try:
+    _json.dumps("", ensure_ascii=False)
+    _COMPACT["ensure_ascii"] = False
+except TypeError:
+    # MicroPython, which never escapes non-ASCII characters anyway.
+    pass
 
-class _Known:
-    def __init__(self):
-        self.key = []
-        self.value = []
-
-
-class _String:
-    def __init__(self, value):
-        self.value = value
-
-
-def _array_keys(value):
-    keys = []
-    i = 0
-    for _ in value:
-        keys.append(i)
-        i += 1
-    return keys
-
-
-def _object_keys(value):
-    keys = []
-    for key in value:
-        keys.append(key)
-    return keys
-
-
-def _is_array(value):
-    return isinstance(value, (list, tuple))
-
-
-def _is_object(value):
-    return isinstance(value, dict)
-
-
-def _is_string(value):
-    return isinstance(value, str)
-
-
-def _index(known, input, value):
-    input.append(value)
-    index = str(len(input) - 1)
-    known.key.append(value)
-    known.value.append(index)
-    return index
-
-
-def _loop(keys, input, known, output):
-    for key in keys:
-        value = output[key]
-        if isinstance(value, _String):
-            _ref(key, input[int(value.value)], input, known, output)
-
-    return output
-
-
-def _ref(key, value, input, known, output):
-    if _is_array(value) and value not in known:
-        known.append(value)
-        value = _loop(_array_keys(value), input, known, value)
-    elif _is_object(value) and value not in known:
-        known.append(value)
-        value = _loop(_object_keys(value), input, known, value)
-
-    output[key] = value
-
-
-def _relate(known, input, value):
-    if _is_string(value) or _is_array(value) or _is_object(value):
-        try:
-            return known.value[known.key.index(value)]
-        except:
-            return _index(known, input, value)
 
+def _relate(value, input, strings, containers):
+    """
+    Return the (string) index in `input` of a string, list or dict `value`,
+    adding it to `input` if not there yet, or any other `value` as it is.
+    Strings are found by value, lists and dicts by identity.
+    """
+    if isinstance(value, str):
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = str(len(input))
+            input.append(value)
+        return index
+    if isinstance(value, (list, tuple, dict)):
+        key = id(value)
+        index = containers.get(key)
+        if index is None:
+            index = containers[key] = str(len(input))
+            input.append(value)
+        return index
     return value
 
 
-def _transform(known, input, value):
-    if _is_array(value):
-        output = []
-        for val in value:
-            output.append(_relate(known, input, val))
-        return output
-
-    if _is_object(value):
-        obj = {}
-        for key in value:
-            obj[key] = _relate(known, input, value[key])
-        return obj
-
+def _transform(value, input, strings, containers):
+    if isinstance(value, dict):
+        return {
+            key: _relate(item, input, strings, containers)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_relate(item, input, strings, containers) for item in value]
     return value
 
 
-def _wrap(value):
-    if _is_string(value):
-        return _String(value)
-
-    if _is_array(value):
-        i = 0
-        for val in value:
-            value[i] = _wrap(val)
-            i += 1
-
-    elif _is_object(value):
-        for key in value:
-            value[key] = _wrap(value[key])
-
-    return value
+def _flatten(value):
+    """
+    Yield, in order, the entries of the flat array representing `value`:
+    the value itself, then each distinct string, list and dict within it,
+    where strings, lists and dicts are replaced by the index of their own
+    entry. Each value is looked up in constant time, via a dict of strings
+    and a dict of the `id()` of lists and dicts, so this takes linear time.
+    """
+    input = []
+    strings = {}
+    containers = {}
+    _relate(value, input, strings, containers)
+    if not input:
+        input.append(value)
+    i = 0
+    while i < len(input):
+        yield _transform(input[i], input, strings, containers)
+        i += 1
 
 
 def parse(value, *args, **kwargs):
@@ -165,28 +119,23 @@ def parse(value, *args, **kwargs):
     # Circular references are preserved.
     assert obj["self"] is obj
     ```
-    """
-    json = _json.loads(value, *args, **kwargs)
-    wrapped = []
-    for value in json:
-        wrapped.append(_wrap(value))
-
-    input = []
-    for value in wrapped:
-        if isinstance(value, _String):
-            input.append(value.value)
-        else:
-            input.append(value)
-
-    value = input[0]
-
-    if _is_array(value):
-        return _loop(_array_keys(value), input, [value], value)
 
-    if _is_object(value):
-        return _loop(_object_keys(value), input, [value], value)
-
-    return value
+    Each entry of the flat array is only visited once, without recursion
+    (so graphs of any depth can be parsed), and references are resolved
+    by index, in place.
+    """
+    entries = _json.loads(value, *args, **kwargs)
+    for entry in entries:
+        # Within lists and dicts, every string is the index of an entry.
+        if isinstance(entry, list):
+            for i, item in enumerate(entry):
+                if isinstance(item, str):
+                    entry[i] = entries[int(item)]
+        elif isinstance(entry, dict):
+            for key, item in entry.items():
+                if isinstance(item, str):
+                    entry[key] = entries[int(item)]
+    return entries[0]
 
 
 def stringify(value, *args, **kwargs):
@@ -214,12 +163,73 @@ def stringify(value, *args, **kwargs):
     # Can optionally pretty-print via JSON indentation etc.
     pretty = flatted.stringify(parent, indent=2)
     ```
+
+    By default, the result is exactly what the JavaScript library produces
+    for the same structure. As there, equal strings are stored once, while
+    lists and dicts are only shared when they're the same object.
     """
-    known = _Known()
-    input = []
-    output = []
-    i = int(_index(known, input, value))
-    while i < len(input):
-        output.append(_transform(known, input, input[i]))
-        i += 1
-    return _json.dumps(output, *args, **kwargs)
+    options = {} if args or "indent" in kwargs else dict(_COMPACT)
+    options.update(kwargs)
+    return _json.dumps(list(_flatten(value)), *args, **options)
+
+
+def iter_stringify(value, chunk_size=65536):
+    """
+    Serialize a Python object to Flatted JSON, as a generator of strings.
+
+    Joined together, the strings are the result of `stringify(value)`, but
+    entries are serialized one at a time, so the whole result never needs
+    to be held in memory. Every string, except the last, is exactly
+    `chunk_size` characters long.
+
+    ```python
+    from pyscript import flatted
+
+
+    for chunk in flatted.iter_stringify(big_graph, chunk_size=1024):
+        send(chunk)
+    ```
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    parts = []
+    size = 0
+    separator = "["
+    for entry in _flatten(value):
+        text = _json.dumps(entry, **_COMPACT)
+        parts.append(separator)
+        parts.append(text)
+        size += len(text) + 1
+        separator = ","
+        if size >= chunk_size:
+            text = "".join(parts)
+            end = size - size % chunk_size
+            for start in range(0, end, chunk_size):
+                yield text[start : start + chunk_size]
+            parts = [text[end:]]
+            size -= end
+    parts.append("]")
+    text = "".join(parts)
+    for start in range(0, len(text), chunk_size):
+        yield text[start : start + chunk_size]
+
+
+def dump(value, fp, chunk_size=65536):
+    """
+    Serialize a Python object as Flatted JSON to `fp`, a file-like object
+    with a `write` method.
+
+    The result is written in strings of `chunk_size` characters, as
+    produced by iter_stringify(), so large structures can be saved without
+    first creating the whole result in memory.
+
+    ```python
+    from pyscript import flatted
+
+
+    with open("graph.json", "w") as fp:
+        flatted.dump(graph, fp)
+    ```
+    """
+    for chunk in iter_stringify(value, chunk_size):
+        fp.write(chunk)
@@ -13,6 +13,15 @@ What this module provides:
 - A `dict`-like API (get, set, delete, iterate).
 - Automatic serialization of common Python types.
 - Background persistence with optional explicit `sync()`.
+- Batched writes, committed atomically in a single transaction.
+- Ordered key-range scans, and secondary indexes on fields of values.
+- A size-bounded cache mode, with expiry (`CacheStorage`).
+- Transparent compression of large values.
+- Lazy decoding of values on first access, for large stores.
+- Optionally, changes shared with other tabs and workers, applied as they
+  happen.
+- Reporting of the size of each store, and of the origin's quota (`usage()`),
+  and a request to keep the stored data (`persist()`).
 - Support for custom `Storage` subclasses.
 
 ```python
@@ -35,9 +44,11 @@ await my_data.sync()
 theme = my_data.get("theme", "light")
 ```
 
-Common types are automatically serialized: `bool`, `int`, `float`, `str`, `None`,
-`list`, `dict`, `tuple`. Binary data (`bytearray`, `memoryview`) can be stored as
-single values but not nested in structures.
+Common types are automatically serialized, with a compact binary encoding
+(see `pyscript.codec`): `bool`, `int`, `float`, `str`, `None`, `list`, `dict`,
+`tuple`, and binary data (`bytearray`, `memoryview`), also nested in structures.
+Binary data stored as a single value is kept natively by IndexedDB (as an
+`ArrayBuffer` or `Uint8Array`), without any serialization.
 
 Tuples are deserialized as lists due to IndexedDB limitations.
 
@@ -48,42 +59,688 @@ Tuples are deserialized as lists due to IndexedDB limitations.
     reached in typical usage.
 """
 
+import asyncio
+import js
+import time
 from polyscript import storage as _polyscript_storage
+from pyscript.codec import decode as _decode
+from pyscript.codec import encode as _encode
 from pyscript.flatted import parse as _parse
-from pyscript.flatted import stringify as _stringify
-from pyscript.ffi import is_none
+from pyscript.ffi import create_proxy, is_none, to_js
+from pyscript.util import as_bytearray, as_js_buffer, is_awaitable
+
+try:
+    import zlib as _zlib
+except ImportError:
+    _zlib = None
+try:
+    # MicroPython.
+    import deflate as _deflate
+    import io as _io
+except ImportError:
+    _deflate = None
+# Without a zlib or deflate module, compressed records are decompressed in
+# JavaScript, as they're loaded or received (see `_get_records`).
+_DECOMPRESS_IN_PYTHON = _zlib is not None or _deflate is not None
+
+
+# Marks a value not yet decoded from its IndexedDB representation.
+_NOT_DECODED = object()
+# Lazily created JavaScript helpers for direct IndexedDB access.
+_idb = None
+# The prefix of the name of every store opened by `storage()`, and the
+# stores opened here (for `usage()`, where databases can't be listed).
+_STORE_PREFIX = "@pyscript/"
+_opened = []
+# The prefix of the store holding a CacheStorage's bookkeeping (outside the
+# namespace of storages, so it never shows up as one of their keys).
+_CACHE_INDEX = "@pyscript-cache/"
+# How long (in seconds) a CacheStorage waits to save its bookkeeping.
+_CACHE_INDEX_DELAY = 1
+# Supported compression formats, and their zlib window bits.
+_COMPRESSION_FORMATS = {"gzip": 31, "deflate": 15, "deflate-raw": -15}
+# Lazily created JavaScript helpers to inspect and compress records.
+_records = None
+# The channel of each store with open storages (see `_Channel`).
+_channels = {}
+
+
+def _get_records():
+    """
+    Return a JavaScript object to inspect and compress records.
+
+    Its `kind` method returns the kind of a `record`: `"bytearray"` (an
+    `ArrayBuffer`), `"memoryview"` (a `Uint8Array`), `"packed"` (a
+    `{packed}` object, with data encoded by `pyscript.codec`),
+    `"compressed"` or `"text"` (a Flatted string, written by older
+    versions). Its `size` method returns the size of a record in bytes (`0`
+    for no record).
+
+    Its `compress` method returns a promise of the `records` of `keys`,
+    with those bigger than `threshold` bytes compressed by a
+    `CompressionStream` of the given `format` (if that makes them smaller).
+    If `replace` is true, compressed records also replace the originals in
+    the store's mirror, unless changed in the meantime.
+    Compressed records are `{compressed, type, data}` objects, with the
+    `compressed` format, the kind of the original record as `type` and the
+    compressed `data` (a `Uint8Array`).
+
+    Where Python can't decompress records, they're decompressed by a
+    `DecompressionStream` instead: `decompress` returns a promise resolved
+    once the compressed records in the mirror of a `store` are replaced by
+    decompressed ones, and `receiver` returns a channel "message" handler
+    calling `handler` with each message (in order) once the compressed
+    records of its change are decompressed.
+    """
+    global _records
+    if _records is None:
+        _records = js.Function("""
+            const { get, set, entries } = Map.prototype;
+            const kind = (record) => {
+                if (typeof record === "string") return "text";
+                if (record instanceof ArrayBuffer) return "bytearray";
+                if (ArrayBuffer.isView(record)) return "memoryview";
+                return "packed" in record ? "packed" : "compressed";
+            };
+            const size = (record) => {
+                if (record == null) return 0;
+                switch (kind(record)) {
+                    case "text": return record.length;
+                    case "packed": return record.packed.byteLength;
+                    case "compressed": return record.data.byteLength;
+                    default: return record.byteLength;
+                }
+            };
+            const compress = async (record, format) => {
+                const type = kind(record);
+                const blob = new Blob([type === "packed" ? record.packed : record]);
+                const stream = blob.stream().pipeThrough(new CompressionStream(format));
+                const data = new Uint8Array(await new Response(stream).arrayBuffer());
+                return data.byteLength < blob.size
+                    ? { compressed: format, type, data }
+                    : record;
+            };
+            const decompressRecord = async (record) => {
+                if (record == null || kind(record) !== "compressed") return record;
+                const { compressed, type, data } = record;
+                const stream = new Blob([data])
+                    .stream()
+                    .pipeThrough(new DecompressionStream(compressed));
+                const buffer = await new Response(stream).arrayBuffer();
+                if (type === "text") return new TextDecoder().decode(buffer);
+                if (type === "packed") return { packed: new Uint8Array(buffer) };
+                return type === "memoryview" ? new Uint8Array(buffer) : buffer;
+            };
+            return {
+                kind,
+                size,
+                compress(store, keys, records, format, threshold, replace) {
+                    const compressed = async (record, i) => {
+                        if (record == null || size(record) <= threshold) return record;
+                        // Stored as it is if it can't be compressed.
+                        const result = await compress(record, format).catch(() => record);
+                        if (replace && result !== record && get.call(store, keys[i]) === record)
+                            set.call(store, keys[i], result);
+                        return result;
+                    };
+                    return Promise.all(records.map(compressed));
+                },
+                decompress(store) {
+                    const pending = [];
+                    for (const [key, record] of entries.call(store)) {
+                        if (kind(record) !== "compressed") continue;
+                        pending.push(
+                            decompressRecord(record).then((result) => {
+                                if (get.call(store, key) === record)
+                                    set.call(store, key, result);
+                            }),
+                        );
+                    }
+                    return Promise.all(pending);
+                },
+                receiver(handler) {
+                    let receiving = Promise.resolve();
+                    return ({ data }) => {
+                        receiving = receiving.then(async () => {
+                            data.values = await Promise.all(data.values.map(decompressRecord));
+                            handler({ data });
+                        });
+                    };
+                },
+            };
+            """)()
+    return _records
+
+
+def _decompress(data, compression):
+    """
+    Return the (`bytes`-like) `data` decompressed from the given
+    `compression` format (as used by the browser's `CompressionStream`).
+
+    Only used if `_DECOMPRESS_IN_PYTHON`: otherwise records are never left
+    compressed in memory.
+    """
+    wbits = _COMPRESSION_FORMATS[compression]
+    if _zlib:
+        return _zlib.decompress(data, wbits)
+    if _deflate is None:
+        raise RuntimeError("No zlib or deflate module to decompress values.")
+    if wbits > 15:
+        wbits = _deflate.GZIP
+    elif wbits > 0:
+        wbits = _deflate.ZLIB
+    else:
+        wbits = _deflate.RAW
+    return _deflate.DeflateIO(_io.BytesIO(data), wbits).read()
+
+
+def _now():
+    """
+    Return the current time, in milliseconds, comparable across tabs and
+    workers (to order changes made in each).
+    """
+    return js.performance.timeOrigin + js.performance.now()
+
+
+def _get_idb():
+    """
+    Return a JavaScript object to directly access the IndexedDB database
+    behind a store: to write batches of changes in a single transaction,
+    and to query ranges of keys.
+
+    The stores are `IDBMapSync` instances (from `@webreflection/idb-map`):
+    `Map`s mirroring an IndexedDB database named `"IDBMap/"` followed by
+    the store name, with a single object store of out-of-line keys (an
+    error is thrown for a database with any other layout). The package has
+    no way to write many changes in one transaction, so the mirror is
+    updated immediately via `Map.prototype` (bypassing the store's own
+    per-change transactions), while `write` commits changes (`null` values
+    are deletions), as captured when they were made, once the store's own
+    queue of changes (such as its initial load) is written, and returns
+    them. The `values` may be a promise (of records being compressed).
+
+    Every write of a storage, batched or not, goes through `write`: writes
+    to the same database are queued, and committed in the order they were
+    made, so the last change made to a key is always the one stored. Each
+    database is opened once, and its connection kept (until the database
+    is deleted or upgraded elsewhere).
+
+    The `keys` method returns, in order, the keys from `lower` (inclusive,
+    or exclusive if `after`) to `upper` (exclusive), either of which may be
+    `null`, up to `limit` keys (if not `0`), in `reverse` order if
+    requested.
+
+    The `names` method returns the names of the stores with a database in
+    this origin, whose name starts with `prefix` (or `null`, if the browser
+    can't list databases). The `usage` method returns the number of
+    records of a store, and their total size in bytes (as measured by
+    `size`), in a single pass of a cursor over its database. Reads wait for
+    queued writes.
+    """
+    global _idb
+    if _idb is None:
+        _idb = js.Function("""
+            const { set, delete: remove, clear } = Map.prototype;
+            const queues = new Map();
+            const connections = new Map();
+            const open = (name) => {
+                let connection = connections.get(name);
+                if (!connection) {
+                    connection = new Promise((resolve, reject) => {
+                        const request = indexedDB.open(`IDBMap/${name}`);
+                        request.onsuccess = () => {
+                            const db = request.result;
+                            // make way for anything deleting or upgrading it
+                            db.onversionchange = db.onclose = () => {
+                                if (connections.get(name) === connection)
+                                    connections.delete(name);
+                                db.close();
+                            };
+                            resolve(db);
+                        };
+                        request.onerror = () => {
+                            connections.delete(name);
+                            reject(request.error);
+                        };
+                    });
+                    connections.set(name, connection);
+                }
+                return connection;
+            };
+            // Each database has a single object store, whatever its name.
+            const objectStore = (db, mode) => {
+                const names = db.objectStoreNames;
+                if (names.length !== 1)
+                    throw new Error(
+                        `Unexpected layout of the IndexedDB database ${db.name}: ` +
+                        `expected a single object store, found ${names.length}.`
+                    );
+                return db.transaction(names[0], mode).objectStore(names[0]);
+            };
+            const done = (request) => new Promise((resolve, reject) => {
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => reject(request.error);
+            });
+            const bound = (lower, upper, after) => {
+                if (lower == null)
+                    return upper == null ? null : IDBKeyRange.upperBound(upper, true);
+                if (upper == null) return IDBKeyRange.lowerBound(lower, after);
+                return IDBKeyRange.bound(lower, upper, after, true);
+            };
+            const queue = (name, write) => {
+                const previous = queues.get(name) || Promise.resolve();
+                const next = previous.catch(() => {}).then(write);
+                queues.set(name, next);
+                return next;
+            };
+            const read = async (name, query) => {
+                await (queues.get(name) || Promise.resolve()).catch(() => {});
+                return query(objectStore(await open(name), "readonly"));
+            };
+            const commit = async (name, keys, values, cleared) => {
+                const store = objectStore(await open(name), "readwrite");
+                const { transaction } = store;
+                if (cleared) store.clear();
+                for (let i = 0; i < keys.length; i++) {
+                    if (values[i] == null) store.delete(keys[i]);
+                    else store.put(values[i], keys[i]);
+                }
+                await new Promise((resolve, reject) => {
+                    transaction.oncomplete = resolve;
+                    transaction.onerror = transaction.onabort = () =>
+                        reject(transaction.error);
+                });
+            };
+            return {
+                mirror(store, key, value) {
+                    if (value == null) remove.call(store, key);
+                    else set.call(store, key, value);
+                },
+                clear(store) {
+                    clear.call(store);
+                },
+                write(name, store, keys, values, cleared) {
+                    return queue(name, async () => {
+                        await store.sync();
+                        const records = await values;
+                        await commit(name, keys, records, cleared);
+                        return records;
+                    });
+                },
+                async names(prefix) {
+                    if (!indexedDB.databases) return null;
+                    const names = [];
+                    for (const { name } of await indexedDB.databases()) {
+                        if (name.startsWith(`IDBMap/${prefix}`))
+                            names.push(name.slice("IDBMap/".length));
+                    }
+                    return names;
+                },
+                usage(name, size) {
+                    return read(name, (store) => new Promise((resolve, reject) => {
+                        let count = 0;
+                        let bytes = 0;
+                        const request = store.openCursor();
+                        request.onsuccess = () => {
+                            const cursor = request.result;
+                            if (!cursor) resolve([count, bytes]);
+                            else {
+                                count++;
+                                bytes += size(cursor.value);
+                                cursor.continue();
+                            }
+                        };
+                        request.onerror = () => reject(request.error);
+                    }));
+                },
+                keys(name, lower, upper, limit, reverse, after) {
+                    return read(name, async (store) => {
+                        const range = bound(lower, upper, after);
+                        if (!reverse)
+                            return done(store.getAllKeys(range, limit || undefined));
+                        const keys = [];
+                        const request = store.openKeyCursor(range, "prev");
+                        await new Promise((resolve, reject) => {
+                            request.onsuccess = () => {
+                                const cursor = request.result;
+                                if (!cursor || (limit && keys.length === limit))
+                                    resolve();
+                                else {
+                                    keys.push(cursor.key);
+                                    cursor.continue();
+                                }
+                            };
+                            request.onerror = () => reject(request.error);
+                        });
+                        return keys;
+                    });
+                },
+            };
+            """)()
+    return _idb
+
+
+def _index_key(value):
+    """
+    Return the sort key of a `value` in a secondary index, ordering numbers
+    before strings (as IndexedDB does), or `None` if it can't be indexed.
+    """
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    return None
+
+
+def _bound_key(name, bound):
+    """
+    Return the sort key of the `name`d `bound` of a range (see `_index_key`),
+    or `None` for no bound. Raise a TypeError if it can't bound a range.
+    """
+    if bound is None:
+        return None
+    sort_key = _index_key(bound)
+    if sort_key is None:
+        raise TypeError(f"{name} must be a number or a string.")
+    return sort_key
+
+
+def _in_range(key, start, stop):
+    """
+    Return `True` if the `key` lies from the sort key `start` (inclusive)
+    to `stop` (exclusive), either of which may be `None`.
+    """
+    sort_key = _index_key(key)
+    if sort_key is None:
+        return False
+    return (start is None or sort_key >= start) and (stop is None or sort_key < stop)
+
+
+def _bisect(entries, bound, right=False):
+    """
+    Return the position of the sort key `bound` in the sorted `entries`
+    (`(rank, value, key)` tuples, compared by their first two items):
+    before (or, if `right`, after) any entries with an equal sort key.
+    """
+    low, high = 0, len(entries)
+    while low < high:
+        middle = (low + high) // 2
+        entry = entries[middle][:2]
+        if entry < bound or (right and entry == bound):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+class _Index:
+    """
+    A secondary index of a storage: its keys, sorted by the `field` of
+    their (`dict`) values, for lookups in logarithmic time.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        # Sorted (rank, value, key) tuples, and the entry of each key.
+        self.entries = []
+        self.keys = {}
+
+    def entry(self, key, value):
+        """
+        Return the entry of `key` for its `value`, or `None` if it isn't
+        indexed.
+        """
+        if not isinstance(value, dict):
+            return None
+        sort_key = _index_key(value.get(self.field))
+        if sort_key is None:
+            return None
+        return sort_key + (key,)
+
+    def build(self, entries):
+        """
+        Replace the index with the (unsorted) `entries`, sorting them once.
+        """
+        entries.sort()
+        self.entries = entries
+        self.keys = {entry[2]: entry for entry in entries}
+
+    def add(self, key, value):
+        self.remove(key)
+        entry = self.entry(key, value)
+        if entry is None:
+            return
+        sort_key = entry[:2]
+        entries = self.entries
+        low, high = _bisect(entries, sort_key), _bisect(entries, sort_key, True)
+        # Entries with equal values are ordered by key.
+        while low < high and entries[low] < entry:
+            low += 1
+        entries.insert(low, entry)
+        self.keys[key] = entry
+
+    def remove(self, key):
+        entry = self.keys.pop(key, None)
+        if entry is None:
+            return
+        entries = self.entries
+        position = _bisect(entries, entry[:2])
+        while entries[position] != entry:
+            position += 1
+        del entries[position]
+
+    def clear(self):
+        self.entries = []
+        self.keys = {}
+
+    def find(self, value, start, stop):
+        """
+        Return the keys whose field equals `value` (if not `None`), or else
+        lies between `start` (inclusive) and `stop` (exclusive).
+        """
+        entries = self.entries
+        if value is not None:
+            sort_key = _index_key(value)
+            if sort_key is None:
+                return []
+            low = _bisect(entries, sort_key)
+            high = _bisect(entries, sort_key, True)
+        else:
+            start = _bound_key("start", start)
+            stop = _bound_key("stop", stop)
+            low = 0 if start is None else _bisect(entries, start)
+            high = len(entries) if stop is None else _bisect(entries, stop)
+        return [entry[2] for entry in entries[low:high]]
+
+
+class _Channel:
+    """
+    The `BroadcastChannel` of a store, shared by all its shared storages
+    opened here (until closed), to share their changes with each other, and
+    with other tabs and workers.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.storages = []
+        self.on_message = create_proxy(self.receive)
+        self.channel = js.BroadcastChannel.new(name)
+        if _DECOMPRESS_IN_PYTHON:
+            self.channel.onmessage = self.on_message
+        else:
+            self.channel.onmessage = _get_records().receiver(self.on_message)
+
+    def receive(self, event):
+        change = event.data
+        for storage in list(self.storages):
+            storage._receive(change)
+
+    def post(self, sender, change):
+        self.channel.postMessage(change)
+        # The channel doesn't get its own messages.
+        for storage in list(self.storages):
+            if storage is not sender:
+                storage._receive(change)
+
+    def close(self):
+        self.channel.close()
+        if hasattr(self.on_message, "destroy"):
+            self.on_message.destroy()
+
+
+class _Batch:
+    """
+    An asynchronous context manager collecting the changes to a `storage`
+    made within it, to be written in a single transaction on exit.
+    """
+
+    def __init__(self, storage):
+        self._storage = storage
+
+    async def __aenter__(self):
+        self._storage._begin()
+        return self._storage
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # Changes are written even on error, so the stored data matches
+        # what's in memory.
+        await self._storage._end()
+        return False
+
+
+def _storage_manager():
+    """
+    Return the browser's `StorageManager`, or `None` if it's not available
+    (such as outside of a secure context).
+    """
+    navigator = getattr(js, "navigator", None)
+    manager = None if is_none(navigator) else getattr(navigator, "storage", None)
+    return None if is_none(manager) else manager
+
+
+async def usage():
+    """
+    Return a report of the data stored by this origin: a dict with the
+    number of `"entries"` (records) and their total size in `"bytes"` for
+    each (named) store under `"stores"`, and the browser's estimate of the
+    `"usage"` and `"quota"` (in bytes) of the whole origin, which also
+    includes other data (both `None` if not available). The `"persisted"`
+    flag is true if the browser won't evict the stored data (see
+    `persist`).
+
+    The sizes of stores are those of the stored (encoded, and maybe
+    compressed) values, worked out when asked for, in a single pass over
+    the records of each store (so this takes longer for bigger stores, and
+    nothing is counted as values are written). Changes not yet written
+    (see `Storage.sync`) aren't counted. Stores are found by listing the
+    origin's IndexedDB databases: where the browser can't, only the stores
+    opened here are reported.
+
+    ```python
+    from pyscript.storage import usage
+
+
+    report = await usage()
+    for name, store in report["stores"].items():
+        print(name, store["entries"], store["bytes"])
+    print(report["usage"], "of", report["quota"])
+    ```
+    """
+    idb = _get_idb()
+    names = await idb.names(_STORE_PREFIX)
+    names = _opened if is_none(names) else list(names)
+    stores = {}
+    for name in names:
+        counted = await idb.usage(name, _get_records().size)
+        stores[name[len(_STORE_PREFIX) :]] = {
+            "entries": counted[0],
+            "bytes": counted[1],
+        }
+    result = {"stores": stores, "usage": None, "quota": None, "persisted": False}
+    manager = _storage_manager()
+    if manager is not None:
+        estimate = await manager.estimate()
+        result["usage"] = estimate.usage
+        result["quota"] = estimate.quota
+        result["persisted"] = bool(await manager.persisted())
+    return result
+
+
+async def persist():
+    """
+    Ask the browser to persist the data stored by this origin, so it isn't
+    evicted under storage pressure, returning `True` if it will be.
+
+    Browsers may grant this automatically (for example, to sites that are
+    bookmarked or installed), or prompt the user. It's only available on
+    the main thread (otherwise `False` is returned).
+    """
+    manager = _storage_manager()
+    if manager is None or not hasattr(manager, "persist"):
+        return False
+    return bool(await manager.persist())
 
 
 def _convert_to_idb(value):
     """
     Convert a Python `value` to an IndexedDB-compatible format.
 
-    Values are serialized using Flatted (for circular reference support)
-    with type information to enable proper deserialization. It returns a
-    JSON string representing the serialized value.
+    Values are encoded with `pyscript.codec` (a compact binary format, with
+    support for circular references and nested binary data), and stored as
+    a `{packed}` object holding the encoded bytes. Top level binary data is
+    instead returned as a JavaScript `ArrayBuffer` (for a `bytearray`) or
+    `Uint8Array` (for a `memoryview`), which IndexedDB stores natively.
 
     Will raise a TypeError if the value type is not supported.
     """
-    if is_none(value):
-        return _stringify(["null", 0])
-    if isinstance(value, (bool, float, int, str, list, dict, tuple)):
-        return _stringify(["generic", value])
+    return _encode_record(value)[0]
+
+
+def _encode_record(value):
+    """
+    Return the IndexedDB record of a Python `value` (see `_convert_to_idb`),
+    and its size in bytes.
+    """
     if isinstance(value, bytearray):
-        return _stringify(["bytearray", list(value)])
+        return as_js_buffer(value).buffer, len(value)
     if isinstance(value, memoryview):
-        return _stringify(["memoryview", list(value)])
-    raise TypeError(f"Cannot serialize type {type(value).__name__} for storage.")
+        record = as_js_buffer(value)
+        return record, record.byteLength
+    if is_none(value):
+        value = None
+    data = _encode(value)
+    return to_js({"packed": as_js_buffer(data)}), len(data)
 
 
 def _convert_from_idb(value):
     """
     Convert an IndexedDB `value` back to its Python representation.
 
-    Uses type information stored during serialization to reconstruct the
-    original Python type.
+    Binary records are copied straight into a `bytearray` (or a `memoryview`
+    of one, for a `Uint8Array`), and packed records are decoded with
+    `pyscript.codec`. Compressed records are decompressed first. Records
+    written by older versions, as Flatted strings with type information
+    (including binary data stored as a list of integers), are still
+    understood, and are replaced by packed records when next written.
     """
-    kind, data = _parse(value)
+    kind = _get_records().kind(value)
+    if kind == "compressed":
+        data = bytearray(_decompress(as_bytearray(value.data), value.compressed))
+        kind = value.type
+        if kind == "text":
+            value = data.decode("utf-8")
+    else:
+        data = None
+    if kind == "bytearray":
+        return data if data is not None else as_bytearray(value)
+    if kind == "memoryview":
+        return memoryview(data if data is not None else as_bytearray(value))
+    if kind == "packed":
+        return _decode(data if data is not None else as_bytearray(value.packed))
 
+    kind, data = _parse(value)
     if kind == "null":
         return None
     if kind == "generic":
@@ -139,17 +796,566 @@ class Storage(dict):
     my_store = await storage("app-data", storage_class=LoggingStorage)
     my_store["test"] = 123  # Logs to console.
     ```
+
+    Many changes are written faster, and atomically, as a batch. Changes
+    made within `async with storage.batch():` (or via `update_many`) are
+    written in a single IndexedDB transaction when the block ends. With a
+    `debounce` delay (in seconds), every change is batched: changes are
+    written together `debounce` seconds after the first one, with repeated
+    changes to the same key only written once (`sync()` writes them
+    immediately).
+
+    Values whose stored form is bigger than `threshold` bytes can be
+    `compress`-ed (`"gzip"`, `"deflate"` or `"deflate-raw"`), and are only
+    decompressed when read. Changes to such a storage are always written
+    as batches (straight away, without a `debounce` delay), compressed in
+    the background as part of their batch. Interpreters without a `zlib`
+    (or `deflate`) module instead decompress every record in JavaScript
+    when the storage is opened, so they're read as any other record.
+
+    A `lazy` storage only loads the keys when opened, and decodes each
+    value the first time it's accessed. If `max_decoded` is given, at most
+    (roughly) that many decoded values are kept in memory: the least
+    recently used are dropped, to be decoded again when next accessed (so
+    in-place changes to a value, that were never assigned back to its key,
+    are lost).
+
+    Storages opened with `shared=True` (or an `on_change` hook) share
+    their changes with the other shared storages of the same store (in
+    other tabs, workers, or opened again), and apply theirs as they happen,
+    via a `BroadcastChannel`: the last change made to a key wins. To react
+    to them, set `on_change` to a (sync or async) function called as
+    `on_change(action, key, value)`, where `action` is `"set"`, `"delete"`
+    (with a `None` value) or `"clear"` (with `None` key and value).
+
+    ```python
+    def changed(action, key, value):
+        if key == "theme":
+            apply_theme(value)
+
+    prefs = await storage("preferences", on_change=changed)
+    ```
+
+    Shared storages use a single channel per store, and stay registered
+    with it until `close()`-d: close a shared storage once done with it (or
+    use it as a context manager), so it stops applying changes made
+    elsewhere, and can be garbage collected. Other storages cost nothing
+    to share changes, and needn't be closed.
+
+    ```python
+    with await storage("preferences", shared=True) as prefs:
+        prefs["color"] = "blue"
+    ```
     """
 
-    def __init__(self, store):
+    # The name of the underlying IndexedDB store (set by `storage()`),
+    # needed to write batches of changes, and to share changes.
+    _name = None
+    # Called with the changes made elsewhere (see above).
+    on_change = None
+
+    def __init__(
+        self,
+        store,
+        lazy=False,
+        max_decoded=None,
+        debounce=None,
+        compress=None,
+        threshold=4096,
+    ):
         """
         Create a Storage instance wrapping an IndexedDB `store` (a JS
-        proxy).
+        proxy), optionally decoding values `lazy`-ly, keeping at most
+        `max_decoded` of them in memory, batching changes written within
+        `debounce` seconds of each other, and compressing values bigger than
+        `threshold` bytes with the `compress` format.
         """
-        super().__init__(
-            {key: _convert_from_idb(value) for key, value in store.entries()}
-        )
+        if max_decoded is not None and max_decoded < 1:
+            raise ValueError("max_decoded must be a positive integer.")
+        if debounce is not None and debounce < 0:
+            raise ValueError("debounce must not be negative.")
+        if compress is not None and compress not in _COMPRESSION_FORMATS:
+            raise ValueError(f"Unsupported compression format: {compress}")
+        self._compress = compress
+        self._threshold = threshold
+        lazy = lazy or max_decoded is not None
+        if lazy:
+            super().__init__(dict.fromkeys(store.keys(), _NOT_DECODED))
+        else:
+            super().__init__(
+                {key: _convert_from_idb(value) for key, value in store.entries()}
+            )
         self._store = store
+        self._lazy = lazy
+        self._max_decoded = max_decoded
+        # When each decoded value was last used, for LRU eviction.
+        self._used = {}
+        self._clock = 0
+        # Changes not yet written (encoded values, or None for deletions),
+        # while batching.
+        self._debounce = debounce
+        self._batches = 0
+        self._pending = {}
+        self._cleared = False
+        self._flush_task = None
+        self._indexes = {}
+        # When each key was last changed, and the storage last cleared, so
+        # older changes made elsewhere are ignored.
+        self._changed_at = {}
+        self._cleared_at = 0
+        self._channel = None
+        # The last write made outside of batches, until synced.
+        self._writing = None
+
+    def _batching(self):
+        # Compression happens when a batch is written.
+        return self._batches or self._debounce is not None or self._compress
+
+    def _write(self, key, value, size=None):
+        """
+        Write the encoded `value` of `key` (of `size` bytes, if known), or
+        delete `key` if `value` is `None`, straight away or as part of the
+        current batch.
+        """
+        if self._channel is not None:
+            self._changed_at[key] = _now()
+        if not self._batching():
+            self._commit([key], [value])
+            self._broadcast([key], [value])
+        else:
+            _get_idb().mirror(self._store, key, value)
+            self._pending[key] = value
+            if not self._batches and self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_later())
+
+    def _commit(self, keys, values, cleared=False):
+        """
+        Write changes made outside of batches: the encoded `values` of
+        `keys` (`None` for deletions), after clearing the store if
+        `cleared`. They're queued with the batches of the same store, so
+        all changes are written in the order they were made.
+        """
+        store = self._store
+        if self._name is None:
+            # Not opened via storage(), so there are no batches either.
+            if cleared:
+                store.clear()
+            for key, value in zip(keys, values):
+                if value is None:
+                    store.delete(key)
+                else:
+                    store.set(key, value)
+            return
+        idb = _get_idb()
+        if cleared:
+            idb.clear(store)
+        for key, value in zip(keys, values):
+            idb.mirror(store, key, value)
+        self._writing = idb.write(
+            self._name, store, to_js(keys), to_js(values), cleared
+        )
+
+    async def _flush_later(self):
+        await asyncio.sleep(self._debounce or 0)
+        self._flush_task = None
+        await self._flush()
+
+    async def _flush(self):
+        """
+        Write all pending changes in a single transaction.
+        """
+        if not (self._pending or self._cleared):
+            return
+        if self._name is None:
+            raise RuntimeError("Batches need a storage opened via storage().")
+        keys = list(self._pending)
+        js_keys = to_js(keys)
+        values = to_js([self._pending[key] for key in keys])
+        cleared = self._cleared
+        self._pending = {}
+        self._cleared = False
+        if self._compress:
+            values = _get_records().compress(
+                self._store,
+                js_keys,
+                values,
+                self._compress,
+                self._threshold,
+                # Kept decompressed in memory if Python can't decompress it.
+                _DECOMPRESS_IN_PYTHON,
+            )
+        values = await _get_idb().write(
+            self._name, self._store, js_keys, values, cleared
+        )
+        self._broadcast(keys, values, cleared)
+
+    def _listen(self):
+        """
+        Start applying the changes made to the same store elsewhere, shared
+        via the store's channel.
+        """
+        if self._name is None or not hasattr(js, "BroadcastChannel"):
+            return
+        channel = _channels.get(self._name)
+        if channel is None:
+            channel = _channels[self._name] = _Channel(self._name)
+        channel.storages.append(self)
+        self._channel = channel
+
+    def close(self):
+        """
+        Stop applying the changes made to the same store elsewhere, closing
+        the store's channel if no other storage uses it.
+        """
+        channel = self._channel
+        if channel is None:
+            return
+        self._channel = None
+        # By identity, as storages with the same items are equal.
+        channel.storages = [other for other in channel.storages if other is not self]
+        if not channel.storages:
+            del _channels[channel.name]
+            channel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _broadcast(self, keys, values, cleared=False):
+        """
+        Share changes (encoded `values` of `keys`, `None` for deletions, all
+        after clearing the store if `cleared`) with other tabs and workers.
+        """
+        if self._channel is None:
+            return
+        change = {"time": _now(), "keys": keys, "values": values, "cleared": cleared}
+        self._channel.post(self, to_js(change))
+
+    def _receive(self, change):
+        """
+        Apply a `change` (to some keys, maybe after clearing the store) made
+        elsewhere, as shared via the store's channel.
+
+        Changes older than the last change made here to the same key (or to
+        the whole storage, for a clear) are ignored, as are changes to keys
+        still waiting to be written here (which will win, being written
+        later).
+        """
+        when = change.time
+        if self._cleared or when <= self._cleared_at:
+            return
+        if change.cleared:
+            self._cleared_at = when
+            changed_at = self._changed_at
+            # Including records not in the dict (such as expired entries).
+            for key in list(self._store.keys()):
+                if key not in self._pending and changed_at.get(key, 0) < when:
+                    self._apply(key, None)
+            self._changed_at = {key: at for key, at in changed_at.items() if at > when}
+            self._notify("clear", None, None)
+        for key, record in zip(change.keys, change.values):
+            if key in self._pending or self._changed_at.get(key, 0) >= when:
+                continue
+            self._changed_at[key] = when
+            if is_none(record):
+                present = super().__contains__(key)
+                self._apply(key, None)
+                if present:
+                    self._notify("delete", key, None)
+            else:
+                self._notify("set", key, self._apply(key, record))
+
+    def _apply(self, key, record):
+        """
+        Apply a change made elsewhere to `key`: its new encoded `record`, or
+        its deletion if `record` is `None`. Return the new value (only
+        decoded if needed, by a lazy storage).
+        """
+        self._mirror(key, record)
+        self._used.pop(key, None)
+        for index in self._indexes.values():
+            index.remove(key)
+        if record is None:
+            if super().__contains__(key):
+                super().__delitem__(key)
+            return None
+        if self._lazy and not self._indexes and self.on_change is None:
+            super().__setitem__(key, _NOT_DECODED)
+            return _NOT_DECODED
+        value = _convert_from_idb(record)
+        super().__setitem__(key, value)
+        for index in self._indexes.values():
+            index.add(key, value)
+        if self._max_decoded is not None:
+            self._touch(key)
+        return value
+
+    def _mirror(self, key, record):
+        """
+        Update the store's mirror with a change made (and written) elsewhere.
+        """
+        _get_idb().mirror(self._store, key, record)
+
+    def _notify(self, action, key, value):
+        """
+        Call the `on_change` hook, if any, with a change made elsewhere.
+        """
+        on_change = self.on_change
+        if on_change is None:
+            return
+        if is_awaitable(on_change):
+            asyncio.create_task(on_change(action, key, value))
+        else:
+            on_change(action, key, value)
+
+    def _begin(self):
+        self._batches += 1
+
+    async def _end(self):
+        self._batches -= 1
+        if not self._batches:
+            await self._flush()
+
+    def batch(self):
+        """
+        Return an asynchronous context manager, within which all changes to
+        the storage are collected, to be written in a single (atomic)
+        IndexedDB transaction at the end of the block.
+
+        ```python
+        store = await storage("imports")
+        async with store.batch():
+            for record in records:
+                store[record["id"]] = record
+        ```
+        """
+        return _Batch(self)
+
+    async def scan(self, prefix=None, start=None, stop=None, limit=None, reverse=False):
+        """
+        Return a list of the `(key, value)` pairs of the keys starting with
+        `prefix`, or from `start` (inclusive) to `stop` (exclusive), in key
+        order (or `reverse` order), up to `limit` pairs.
+
+        The range of keys is found by IndexedDB, so only the matching values
+        are decoded (by a `lazy` storage). Changes not written yet (within a
+        `batch`, or debounced) are included, without writing them.
+
+        ```python
+        users = await store.scan(prefix="user:", limit=100)
+        latest = await store.scan(start="log:", stop="log;", limit=10, reverse=True)
+        ```
+        """
+        if self._name is None:
+            raise RuntimeError("Scans need a storage opened via storage().")
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be a positive integer.")
+        if prefix:
+            # Keys starting with prefix sort before prefix with its last
+            # character incremented.
+            after = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            start = prefix if start is None else max(start, prefix)
+            stop = after if stop is None else min(stop, after)
+        low, high = _bound_key("start", start), _bound_key("stop", stop)
+        if low is not None and high is not None and low >= high:
+            return []
+        pending = self._pending
+        added = [
+            key
+            for key, value in pending.items()
+            if value is not None and _in_range(key, low, high)
+        ]
+        # The keys are looked up once queued writes are committed.
+        await self._store.sync()
+        find_keys = _get_idb().keys
+        keys = []
+        exclusive = False
+        # A cleared storage's records in IndexedDB are all gone once written.
+        while not self._cleared:
+            count = 0 if limit is None else limit - len(keys)
+            page = list(
+                await find_keys(self._name, start, stop, count, reverse, exclusive)
+            )
+            for key in page:
+                # Pending changes are merged below, and expired entries of a
+                # cache aren't in the storage any more.
+                if key not in pending and key in self:
+                    keys.append(key)
+            if not count or len(page) < count:
+                break
+            # Some keys were skipped: look further.
+            if reverse:
+                stop = page[-1]
+            else:
+                start, exclusive = page[-1], True
+        if added:
+            keys = sorted(keys + added, key=_index_key, reverse=reverse)
+        if limit is not None:
+            keys = keys[:limit]
+        return [(key, self[key]) for key in keys]
+
+    def create_index(self, name, field):
+        """
+        Create a secondary index called `name`, ordering keys by the `field`
+        of their values, to look them up via `find` in logarithmic time.
+
+        Only `dict` values with a number or string `field` are indexed.
+        Indexes are kept in memory, and updated as values change: create
+        them again (typically straight after opening the storage) in each
+        session.
+
+        Creating an index reads every value once, and sorts the entries in
+        O(n log n) time. The values of a `lazy` storage are decoded one at a
+        time for this, without being kept in memory.
+
+        ```python
+        events = await storage("events")
+        events.create_index("by_ts", "ts")
+        recent = events.find("by_ts", start=time.time() - 3600)
+        ```
+        """
+        index = _Index(field)
+        entries = []
+        for key in self:
+            value = super().__getitem__(key)
+            if value is _NOT_DECODED:
+                value = _convert_from_idb(self._store.get(key))
+            entry = index.entry(key, value)
+            if entry is not None:
+                entries.append(entry)
+        index.build(entries)
+        self._indexes[name] = index
+
+    def drop_index(self, name):
+        """
+        Remove the secondary index called `name`.
+        """
+        del self._indexes[name]
+
+    def find(self, index, value=None, start=None, stop=None, limit=None, reverse=False):
+        """
+        Return a list of the `(key, value)` pairs whose field, in the named
+        secondary `index` (see `create_index`), equals `value`, or else lies
+        from `start` (inclusive) to `stop` (exclusive). Pairs are ordered by
+        the field (then key), or in `reverse`, up to `limit` pairs.
+        """
+        if index not in self._indexes:
+            raise KeyError(f"No index called {index!r}.")
+        keys = self._indexes[index].find(value, start, stop)
+        if reverse:
+            keys.reverse()
+        if limit is not None:
+            keys = keys[:limit]
+        return [(key, self[key]) for key in keys]
+
+    async def update_many(self, mapping):
+        """
+        Update the storage with the items of `mapping`, written in a single
+        (atomic) IndexedDB transaction.
+        """
+        async with self.batch():
+            for key, value in mapping.items():
+                self[key] = value
+
+    def _touch(self, key):
+        """
+        Mark the decoded value of `key` as the most recently used, evicting
+        the least recently used values if there are too many.
+        """
+        self._clock += 1
+        self._used[key] = self._clock
+        if len(self._used) > self._max_decoded:
+            # Evict in bulk (down to three quarters of the limit), so the
+            # cost of sorting is shared by many accesses.
+            keep = self._max_decoded * 3 // 4
+            by_age = sorted(self._used, key=self._used.get)
+            for old in by_age[: len(by_age) - keep]:
+                del self._used[old]
+                super().__setitem__(old, _NOT_DECODED)
+
+    def __getitem__(self, key):
+        """
+        Get the value of `key`, decoding it first if needed.
+        """
+        value = super().__getitem__(key)
+        if value is _NOT_DECODED:
+            value = _convert_from_idb(self._store.get(key))
+            super().__setitem__(key, value)
+        if self._max_decoded is not None:
+            self._touch(key)
+        return value
+
+    def __iter__(self):
+        # Not inherited, so dict(storage) copies via keys() and __getitem__.
+        return iter(super().keys())
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def __eq__(self, other):
+        if isinstance(other, Storage):
+            other = other.copy()
+        return self.copy() == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def get(self, key, default=None):
+        """
+        Get the value of `key`, or `default` if it's not in storage.
+        """
+        if key in self:
+            return self[key]
+        return default
+
+    def values(self):
+        if not self._lazy:
+            return super().values()
+        return [self[key] for key in self]
+
+    def items(self):
+        if not self._lazy:
+            return super().items()
+        return [(key, self[key]) for key in self]
+
+    def copy(self):
+        """
+        Return a plain `dict` of the (decoded) items in storage.
+        """
+        return dict(self.items())
+
+    def pop(self, key, *default):
+        """
+        Remove `key` from storage, returning its value (or `default` if given
+        and the `key` isn't in storage).
+        """
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        """
+        Remove an item from storage, returning its `(key, value)` pair.
+        """
+        for key in self:
+            return key, self.pop(key)
+        raise KeyError("popitem(): storage is empty")
+
+    def setdefault(self, key, default=None):
+        """
+        Return the value of `key`, first setting it to `default` if it isn't
+        in storage.
+        """
+        if key not in self:
+            self[key] = default
+        return self[key]
 
     def __delitem__(self, key):
         """
@@ -158,8 +1364,11 @@ class Storage(dict):
         The deletion is queued for persistence. Use `sync()` to ensure
         immediate completion.
         """
-        self._store.delete(key)
+        self._write(key, None)
         super().__delitem__(key)
+        self._used.pop(key, None)
+        for index in self._indexes.values():
+            index.remove(key)
 
     def __setitem__(self, key, value):
         """
@@ -169,8 +1378,12 @@ class Storage(dict):
         immediate completion. The `value` must be a supported type for
         serialization.
         """
-        self._store.set(key, _convert_to_idb(value))
+        self._write(key, *_encode_record(value))
         super().__setitem__(key, value)
+        for index in self._indexes.values():
+            index.add(key, value)
+        if self._max_decoded is not None:
+            self._touch(key)
 
     def clear(self):
         """
@@ -179,8 +1392,20 @@ class Storage(dict):
         The `clear()` operation is queued for persistence. Use `sync()` to ensure
         immediate completion.
         """
-        self._store.clear()
+        if self._channel is not None:
+            self._cleared_at = _now()
+            self._changed_at = {}
+        if self._batching():
+            _get_idb().clear(self._store)
+            self._pending.clear()
+            self._cleared = True
+        else:
+            self._commit([], [], True)
+            self._broadcast([], [], True)
         super().clear()
+        self._used.clear()
+        for index in self._indexes.values():
+            index.clear()
 
     async def sync(self):
         """
@@ -199,16 +1424,264 @@ class Storage(dict):
         ```
 
         This is a blocking operation that waits for IndexedDB to complete
-        the write.
+        the write (including any pending batched, or compressed, changes).
         """
+        await self._flush()
         await self._store.sync()
+        writing, self._writing = self._writing, None
+        if writing is not None:
+            await writing
+
+
+def _record_size(record):
+    """
+    Return the (approximate) size in bytes of an encoded `record`, without
+    decoding it.
+    """
+    return _get_records().size(record)
 
 
-async def storage(name="", storage_class=Storage):
+class CacheStorage(Storage):
+    """
+    A `Storage` for use as a persistent cache: bounded to `max_bytes` (if
+    given) by evicting the least recently used entries, and with entries
+    expiring `ttl` seconds (if given) after they were stored.
+
+    The size (of the stored, encoded, value), the time it was stored and
+    the time it was last used are tracked for every key, so eviction and
+    expiry never need to decode any values. They're saved in a store of
+    their own, shortly after changing (only for the keys that changed).
+    Expired entries are removed when opened, or when next accessed.
+
+    ```python
+    from pyscript import storage
+
+
+    api_cache = await storage("api-cache", max_bytes=50_000_000, ttl=3600)
+    if url not in api_cache:
+        api_cache[url] = await fetch(url).json()
+    data = api_cache[url]
+    ```
+    """
+
+    def __init__(self, store, max_bytes=None, ttl=None, index=None, **options):
+        """
+        Create a CacheStorage instance wrapping an IndexedDB `store` (a JS
+        proxy), holding up to `max_bytes` of entries that expire after
+        `ttl` seconds, with the bookkeeping of each entry saved in the
+        `index` store (if given, by `storage()`). Other `options` are as for
+        `Storage`.
+        """
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be a positive integer.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be a positive number.")
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        # Each key's [size, stored, used], and the total size.
+        self._meta = {}
+        self._bytes = 0
+        # The keys whose bookkeeping wasn't saved yet, and if it was cleared.
+        self._index = index
+        self._dirty = set()
+        self._index_cleared = False
+        self._save_task = None
+        self._saving = None
+        super().__init__(store, **options)
+        now = time.time()
+        for key in super().keys():
+            saved = None if index is None else index.get(key)
+            if is_none(saved):
+                meta = [_record_size(store.get(key)), now, now]
+                self._changed(key)
+            else:
+                meta = list(saved)
+            self._meta[key] = meta
+            self._bytes += meta[0]
+        if index is not None:
+            for key in index.keys():
+                if key not in self._meta:
+                    self._changed(key)
+        self._expire()
+        self._evict()
+
+    def _write(self, key, value, size=None):
+        if value is not None and size is None:
+            size = _record_size(value)
+        super()._write(key, value, size)
+        old = self._meta.pop(key, None)
+        if old:
+            self._bytes -= old[0]
+        if value is not None:
+            now = time.time()
+            self._meta[key] = [size, now, now]
+            self._bytes += size
+        self._changed(key)
+
+    def _apply(self, key, record):
+        # Each storage keeps (and saves) its own bookkeeping of the entries.
+        old = self._meta.pop(key, None)
+        if old:
+            self._bytes -= old[0]
+        if record is not None:
+            now = time.time()
+            size = _record_size(record)
+            self._meta[key] = [size, now, now]
+            self._bytes += size
+        return super()._apply(key, record)
+
+    def _changed(self, key=None):
+        """
+        Schedule saving the bookkeeping of `key` (if given).
+        """
+        if self._index is None:
+            return
+        if key is not None:
+            self._dirty.add(key)
+        if self._save_task is None:
+            self._save_task = asyncio.create_task(self._save_later())
+
+    async def _save_later(self):
+        await asyncio.sleep(_CACHE_INDEX_DELAY)
+        self._save_task = None
+        self._save()
+
+    def _save(self):
+        """
+        Write the bookkeeping of the keys that changed, in a single
+        transaction.
+        """
+        if self._save_task is not None:
+            self._save_task.cancel()
+            self._save_task = None
+        if self._name is None or not (self._dirty or self._index_cleared):
+            return
+        keys = list(self._dirty)
+        values = [self._meta.get(key) for key in keys]
+        cleared = self._index_cleared
+        self._dirty = set()
+        self._index_cleared = False
+        self._saving = _get_idb().write(
+            _CACHE_INDEX + self._name, self._index, to_js(keys), to_js(values), cleared
+        )
+
+    def _expired(self, meta, now):
+        return self._ttl is not None and now - meta[1] > self._ttl
+
+    def _expire(self):
+        """
+        Remove all the expired entries.
+        """
+        if self._ttl is None:
+            return
+        now = time.time()
+        expired = [key for key, meta in self._meta.items() if self._expired(meta, now)]
+        for key in expired:
+            del self[key]
+
+    def _evict(self):
+        """
+        Remove the least recently used entries while over budget (down to
+        nine tenths of it, so the cost of sorting is shared by many writes).
+        """
+        if self._max_bytes is None or self._bytes <= self._max_bytes:
+            return
+        target = self._max_bytes * 9 // 10
+        for key in sorted(self._meta, key=lambda key: self._meta[key][2]):
+            if self._bytes <= target:
+                break
+            del self[key]
+
+    def __contains__(self, key):
+        meta = self._meta.get(key)
+        if meta is not None and self._expired(meta, time.time()):
+            del self[key]
+            return False
+        return super().__contains__(key)
+
+    def __getitem__(self, key):
+        meta = self._meta.get(key)
+        if meta is not None:
+            now = time.time()
+            if self._expired(meta, now):
+                del self[key]
+                raise KeyError(key)
+            meta[2] = now
+            self._changed(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._evict()
+
+    def __iter__(self):
+        self._expire()
+        return iter(list(super().keys()))
+
+    def values(self):
+        self._expire()
+        return super().values()
+
+    def items(self):
+        self._expire()
+        return super().items()
+
+    def clear(self):
+        super().clear()
+        self._meta.clear()
+        self._bytes = 0
+        self._dirty = set()
+        self._index_cleared = self._index is not None
+        self._changed()
+
+    @property
+    def size(self):
+        """
+        The total size, in bytes, of the stored (encoded) entries.
+        """
+        return self._bytes
+
+    async def sync(self):
+        self._save()
+        if self._saving is not None:
+            await self._saving
+        await super().sync()
+
+
+async def storage(
+    name="",
+    storage_class=Storage,
+    lazy=False,
+    max_decoded=None,
+    debounce=None,
+    max_bytes=None,
+    ttl=None,
+    compress=None,
+    threshold=4096,
+    shared=False,
+    on_change=None,
+):
     """
     Open or create persistent storage with a unique `name` and optional
     `storage_class` (used to extend the default `Storage` based behavior).
 
+    Large stores open faster as `lazy` storage, only decoding values when
+    first accessed, optionally keeping no more than `max_decoded` of them
+    in memory. Changes made within `debounce` seconds of each other are
+    written together, in a single transaction (see `Storage`).
+
+    Given `max_bytes` and/or a `ttl` (in seconds), the storage is a
+    `CacheStorage`, holding at most `max_bytes` of entries (evicting the
+    least recently used) that expire `ttl` seconds after being stored.
+
+    Values bigger than `threshold` bytes (when stored) are compressed in the
+    `compress` format (`"gzip"`, `"deflate"` or `"deflate-raw"`), if given.
+
+    If `shared` (or given an `on_change` hook), changes are shared with the
+    other shared storages of the same store, in other tabs and workers too,
+    and theirs are applied as they happen, calling
+    `on_change(action, key, value)` if given (see `Storage`).
+
     Each storage is isolated by name within the current origin (domain).
     If the storage doesn't exist, it will be created. If it does exist,
     its current contents will be loaded.
@@ -238,6 +1711,18 @@ async def storage(name="", storage_class=Storage):
             super().__setitem__(key, value)
 
     validated = await storage("validated-data", ValidatingStorage)
+
+    # Lazily decoded, with up to 1000 values in memory.
+    cache = await storage("big-cache", lazy=True, max_decoded=1000)
+
+    # A persistent cache of up to 50MB of entries, expiring after an hour.
+    api_cache = await storage("api-cache", max_bytes=50_000_000, ttl=3600)
+
+    # Compress values bigger than 4KiB.
+    results = await storage("query-results", compress="gzip", threshold=4096)
+
+    # React to changes made in other tabs.
+    shared = await storage("shared", on_change=lambda *change: print(change))
     ```
 
     Storage names are automatically prefixed with `"@pyscript/"` to
@@ -246,5 +1731,33 @@ async def storage(name="", storage_class=Storage):
     if not name:
         raise ValueError("Storage name must be a non-empty string")
 
-    underlying_store = await _polyscript_storage(f"@pyscript/{name}")
-    return storage_class(underlying_store)
+    store_name = _STORE_PREFIX + name
+    underlying_store = await _polyscript_storage(store_name)
+    if not _DECOMPRESS_IN_PYTHON:
+        await _get_records().decompress(underlying_store)
+    options = {}
+    if lazy or max_decoded is not None:
+        options["lazy"] = True
+        options["max_decoded"] = max_decoded
+    if debounce is not None:
+        options["debounce"] = debounce
+    if compress is not None:
+        options["compress"] = compress
+        options["threshold"] = threshold
+    if max_bytes is not None or ttl is not None:
+        if storage_class is Storage:
+            storage_class = CacheStorage
+        elif not issubclass(storage_class, CacheStorage):
+            raise TypeError("A cache needs a CacheStorage based storage_class.")
+        options["max_bytes"] = max_bytes
+        options["ttl"] = ttl
+        options["index"] = await _polyscript_storage(_CACHE_INDEX + store_name)
+    result = storage_class(underlying_store, **options)
+    result._name = store_name
+    if store_name not in _opened:
+        _opened.append(store_name)
+    if on_change is not None:
+        result.on_change = on_change
+    if shared or on_change is not None:
+        result._listen()
+    return result
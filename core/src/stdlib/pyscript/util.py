@@ -5,6 +5,8 @@ between Pyodide and MicroPython, feature detection, and common type
 conversions:
 
 - `as_bytearray`: Convert JavaScript `ArrayBuffer` to Python `bytearray`.
+- `as_js_buffer`: Convert Python bytes-like objects to a JavaScript
+  `Uint8Array`.
 - `NotSupported`: Placeholder for unavailable features in specific contexts.
 - `is_awaitable`: Detect `async` functions across Python implementations.
 
@@ -14,14 +16,119 @@ for use in application code when needed.
 
 import js
 import inspect
+import sys
+
+# The interpreter, as some conversions depend on the FFI it provides.
+_IS_MICROPYTHON = sys.implementation.name == "micropython"
+
+try:
+    from binascii import hexlify as _hexlify
+    from binascii import unhexlify as _unhexlify
+except ImportError:
+    _hexlify = None
+    _unhexlify = None
+
+
+# Lazily created JavaScript helpers to move bytes across the FFI as a single
+# hex string on interpreters without direct access to the JS buffer memory.
+_hex_codec = None
+
+
+def _get_hex_codec():
+    """
+    Return (creating it on first use) a JavaScript object with `toHex` and
+    `fromHex` functions, preferring the native `Uint8Array` implementations
+    where the browser provides them.
+    """
+    global _hex_codec
+    if _hex_codec is None:
+        _hex_codec = js.Function("""
+            const native = typeof Uint8Array.fromHex === "function";
+            const hex = [];
+            for (let i = 0; i < 256; i++)
+                hex.push(i.toString(16).padStart(2, "0"));
+            const nibble = (code) => (code & 0xf) + (code > 57 ? 9 : 0);
+            return {
+                toHex(ui8a) {
+                    if (native) return ui8a.toHex();
+                    const out = [];
+                    for (let i = 0; i < ui8a.length; i += 0x8000) {
+                        let chunk = "";
+                        const end = Math.min(i + 0x8000, ui8a.length);
+                        for (let j = i; j < end; j++) chunk += hex[ui8a[j]];
+                        out.push(chunk);
+                    }
+                    return out.join("");
+                },
+                fromHex(str) {
+                    if (native) return Uint8Array.fromHex(str);
+                    const ui8a = new Uint8Array(str.length >> 1);
+                    for (let i = 0, j = 0; i < ui8a.length; i++, j += 2)
+                        ui8a[i] =
+                            (nibble(str.charCodeAt(j)) << 4) |
+                            nibble(str.charCodeAt(j + 1));
+                    return ui8a;
+                },
+            };
+            """)()
+    return _hex_codec
+
+
+def _as_byte_view(obj):
+    """
+    Return a flat, one byte per item, `memoryview` of any object exposing the
+    buffer protocol (`bytes`, `bytearray`, `memoryview`, `array.array`,
+    NumPy arrays etc). No data is copied unless the buffer is not contiguous.
+    """
+    view = memoryview(obj)
+    try:
+        return view.cast("B")
+    except AttributeError:
+        # MicroPython has no memoryview.cast.
+        if getattr(view, "itemsize", 1) != 1:
+            view = memoryview(bytes(view))
+        return view
+    except TypeError:
+        # Non-contiguous buffers (e.g. strided NumPy slices) need a copy.
+        return memoryview(view.tobytes())
+
+
+def _byte_slice(obj, offset=0, length=None):
+    """
+    Return a flat `memoryview` of the `length` bytes of `obj` starting at
+    byte `offset` (to the end if `length` is `None`), without copying.
+    """
+    view = _as_byte_view(obj)
+    if offset or length is not None:
+        end = len(view) if length is None else offset + length
+        if offset < 0 or end > len(view) or end < offset:
+            raise ValueError(
+                f"Invalid offset ({offset}) or length ({length}) for a buffer "
+                f"of {len(view)} bytes."
+            )
+        view = view[offset:end]
+    return view
 
 
 def as_bytearray(buffer):
     """
     Given a JavaScript `ArrayBuffer`, convert it to a Python `bytearray` in a
     MicroPython friendly manner.
+
+    The bytes are copied in bulk rather than via one FFI lookup per byte:
+    Pyodide copies straight out of the JavaScript buffer via `assign_to`,
+    while MicroPython receives the data as a single hex encoded string that
+    is decoded in C by `binascii`.
     """
     ui8a = js.Uint8Array.new(buffer)
+    if not _IS_MICROPYTHON:
+        # Pyodide - a single memory copy into the new bytearray.
+        ba = bytearray(ui8a.length)
+        ui8a.assign_to(ba)
+        return ba
+    if _unhexlify:
+        # MicroPython - one string crossing the FFI.
+        return bytearray(_unhexlify(_get_hex_codec().toHex(ui8a)))
     size = ui8a.length
     ba = bytearray(size)
     for i in range(size):
@@ -29,6 +136,43 @@ def as_bytearray(buffer):
     return ba
 
 
+def as_js_buffer(obj, offset=0, length=None):
+    """
+    Given a Python bytes-like `obj` (anything exposing the buffer protocol,
+    such as `bytes`, `bytearray`, `memoryview` or `array.array`), return a
+    JavaScript `Uint8Array` containing a copy of its bytes.
+
+    Optionally, only the `length` bytes starting at byte `offset` are
+    copied. The slicing itself doesn't copy any data.
+
+    This is the counterpart of `as_bytearray` and, likewise, copies the data
+    in bulk rather than assigning one byte at a time across the FFI.
+
+    ```python
+    import js
+    from pyscript.util import as_js_buffer
+
+
+    blob = js.Blob.new([as_js_buffer(b"Hello, world!")])
+    header = as_js_buffer(packet, 0, 16)
+    ```
+    """
+    view = _byte_slice(obj, offset, length)
+    if not _IS_MICROPYTHON:
+        # Pyodide - a single memory copy into the JavaScript buffer.
+        ui8a = js.Uint8Array.new(len(view))
+        ui8a.assign(view)
+        return ui8a
+    if _hexlify:
+        # MicroPython - one string crossing the FFI.
+        return _get_hex_codec().fromHex(_hexlify(view).decode())
+    data = bytes(view)
+    ui8a = js.Uint8Array.new(len(data))
+    for i, byte_value in enumerate(data):
+        ui8a[i] = byte_value
+    return ui8a
+
+
 class NotSupported:
     """
     Small helper that raises exceptions if you try to get/set any attribute on
@@ -7,8 +7,14 @@ Use this for real-time applications:
 
 - Pythonic interface to browser WebSockets.
 - Automatic handling of async event handlers.
+- Receiving messages via `await ws.recv()` or `async for message in ws`,
+  backed by a bounded queue.
+- Send side flow control via `await ws.drain()`.
+- Optional batched delivery of high-rate messages, once per animation frame
+  or time interval.
 - Support for receiving text (`str`) and binary (`memoryview`) data.
-- Support for sending text (`str`) and binary (`bytes` and `bytearray`) data.
+- Support for sending text (`str`) and binary (`bytes`, `bytearray`,
+  `memoryview`, `array.array` or any other buffer protocol) data.
 - Compatible with Pyodide and MicroPython.
 - Works in webworker contexts.
 - Naming deliberately follows the JavaScript WebSocket API closely for
@@ -37,14 +43,237 @@ ws.onopen = on_open
 ws.onmessage = on_message
 ws.onclose = on_close
 ```
+
+Alternatively, consume messages as an asynchronous stream:
+
+```python
+ws = WebSocket(url="ws://localhost:8080/", max_queue=256, overflow="drop-oldest")
+async for message in ws:
+    print(f"Received: {message}")
+```
 """
 
 import js
 from pyscript.ffi import create_proxy
-from pyscript.util import as_bytearray, is_awaitable
+from pyscript.util import as_bytearray, as_js_buffer, is_awaitable, _byte_slice
+
+try:
+    # Pyodide can expose a Python buffer to JavaScript without copying it.
+    from pyodide.ffi import create_proxy as _create_buffer_proxy
+except ImportError:
+    _create_buffer_proxy = None
+
+
+# Ways of handling messages arriving when the receive queue is full.
+_OVERFLOW_POLICIES = ("grow", "drop-oldest", "drop-newest")
+
+# Marks the data of a WebSocketEvent that hasn't been converted yet.
+_UNCONVERTED = object()
+
+# Lazily created JavaScript factories of receive queues and batchers, and
+# the JavaScript function waiting for the send buffer to drain.
+_receive_queue_factory = None
+_batcher_factory = None
+_drainer = None
+
+
+def _create_receive_queue(js_websocket, max_queue, overflow):
+    """
+    Attach a JavaScript-side receive queue to the `js_websocket`, holding at
+    most `max_queue` messages and applying the `overflow` policy when full.
+
+    Messages are buffered in JavaScript so Python code only runs when it
+    asks for the next message via the queue's `next()` method, which returns
+    a promise resolving to an iterator-like `{done, value}` result. While an
+    `onmessage` handler is set, messages are only queued for a pending
+    `next()`, as the handler receives them anyway.
+    """
+    global _receive_queue_factory
+    if _receive_queue_factory is None:
+        _receive_queue_factory = js.Function("""
+            return (ws, max, overflow) => {
+                const queue = [];
+                const waiting = [];
+                let closed = ws.readyState === WebSocket.CLOSED;
+                const settle = () => {
+                    while (waiting.length && (queue.length || closed)) {
+                        waiting.shift()(
+                            queue.length
+                                ? { done: false, value: queue.shift() }
+                                : { done: true, value: null },
+                        );
+                    }
+                };
+                ws.addEventListener("message", ({ data }) => {
+                    if (waiting.length) {
+                        waiting.shift()({ done: false, value: data });
+                        return;
+                    }
+                    if (ws.onmessage) return;
+                    if (overflow !== "grow" && max > 0 && queue.length >= max) {
+                        if (overflow === "drop-newest") return;
+                        if (overflow === "drop-oldest") queue.shift();
+                    }
+                    queue.push(data);
+                });
+                ws.addEventListener("close", () => {
+                    closed = true;
+                    settle();
+                });
+                return {
+                    get size() {
+                        return queue.length;
+                    },
+                    next() {
+                        return new Promise((resolve) => {
+                            waiting.push(resolve);
+                            settle();
+                        });
+                    },
+                };
+            };
+            """)()
+    return _receive_queue_factory(js_websocket, max_queue, overflow)
+
+
+def _get_drainer():
+    """
+    Return (creating it on first use) a JavaScript function returning a
+    promise that resolves to `true` once the `bufferedAmount` of a WebSocket
+    is at or below a number of bytes, or to `false` if the connection closes
+    first.
+
+    Browsers have no event signalling the send buffer has been flushed, so
+    the amount is checked in JavaScript, without waking up Python until the
+    promise resolves.
+    """
+    global _drainer
+    if _drainer is None:
+        _drainer = js.Function("""
+            return (ws, mark) =>
+                new Promise((resolve) => {
+                    let timer = 0;
+                    const done = (drained) => {
+                        clearTimeout(timer);
+                        ws.removeEventListener("close", closed);
+                        resolve(drained);
+                    };
+                    const closed = () => done(ws.bufferedAmount <= mark);
+                    const check = () => {
+                        if (ws.bufferedAmount <= mark) done(true);
+                        else if (ws.readyState >= WebSocket.CLOSING) done(false);
+                        else timer = setTimeout(check, 10);
+                    };
+                    ws.addEventListener("close", closed);
+                    check();
+                });
+            """)()
+    return _drainer
+
+
+def _create_batcher(js_websocket, handler, batch):
+    """
+    Return a JavaScript "message" event handler for the `js_websocket` that
+    collects the data of incoming messages and calls the `handler` (a proxy)
+    with a JavaScript array of them once per animation frame, if `batch` is
+    `"frame"`, or once every `batch` milliseconds.
+
+    Any pending messages are delivered when the connection closes, before
+    the `onclose` handler is called.
+    """
+    global _batcher_factory
+    if _batcher_factory is None:
+        _batcher_factory = js.Function("""
+            return (ws, handler, batch) => {
+                let pending = [];
+                let scheduled = false;
+                const flush = () => {
+                    scheduled = false;
+                    if (!pending.length) return;
+                    const payloads = pending;
+                    pending = [];
+                    handler(payloads);
+                };
+                const schedule =
+                    batch === "frame" && typeof requestAnimationFrame === "function"
+                        ? () => requestAnimationFrame(flush)
+                        : () => setTimeout(flush, batch === "frame" ? 16 : batch);
+                const onmessage = ({ data }) => {
+                    pending.push(data);
+                    if (!scheduled) {
+                        scheduled = true;
+                        schedule();
+                    }
+                };
+                // capturing listeners run first, so pending messages are
+                // delivered before any onclose handler is called
+                const onclose = () => {
+                    if (ws.onmessage === onmessage) flush();
+                };
+                ws.addEventListener("close", onclose, { capture: true });
+                return onmessage;
+            };
+            """)()
+    return _batcher_factory(js_websocket, handler, batch)
+
+
+def _convert_batch(payloads):
+    """
+    Convert a JavaScript array of message `payloads` into a Python `list` of
+    `str` (text) and `memoryview` (binary) values.
+    """
+    if hasattr(payloads, "to_py"):
+        # Pyodide - convert the array in one go (but not its items).
+        payloads = payloads.to_py(depth=1)
+    return [_convert_data(value) for value in payloads]
+
+
+def _convert_message(event):
+    """
+    Convert the data of a JavaScript message `event`, skipping the
+    `WebSocketEvent` wrapper.
+    """
+    return _convert_data(event.data)
+
+
+def _convert_data(value):
+    """
+    Convert message data from JavaScript: text stays a `str` while binary
+    data (a JavaScript `ArrayBuffer`) becomes a Python `memoryview`.
+    """
+    if isinstance(value, str):
+        return value
+    if hasattr(value, "to_py"):
+        # Pyodide - convert JavaScript typed array to Python.
+        return value.to_py()
+    # MicroPython - manually convert JS ArrayBuffer.
+    return memoryview(as_bytearray(value))
 
 
-def _attach_event_handler(websocket, handler_name, handler_function):
+def _send_buffer(js_websocket, view):
+    """
+    Send the flat bytes `memoryview` through the `js_websocket`.
+
+    The browser copies the data of `send` synchronously, so in Pyodide a
+    transient `Uint8Array` view of the Python buffer (in the WebAssembly
+    heap) is handed over without any intermediate copy. Elsewhere the bytes
+    are copied, in bulk, into a new JavaScript `Uint8Array`.
+    """
+    if _create_buffer_proxy is None:
+        js_websocket.send(as_js_buffer(view))
+        return
+    proxy = _create_buffer_proxy(view)
+    buffer = proxy.getBuffer("u8")
+    try:
+        js_websocket.send(buffer.data)
+    finally:
+        buffer.release()
+        proxy.destroy()
+
+
+def _attach_event_handler(
+    websocket, handler_name, handler_function, batch=None, raw=False
+):
     """
     Given a `websocket`, and `handler_name`, attach the `handler_function`
     to the `WebSocket` instance, handling both synchronous and asynchronous
@@ -52,17 +281,28 @@ def _attach_event_handler(websocket, handler_name, handler_function):
 
     Creates a JavaScript proxy for the handler and wraps async handlers
     appropriately. Handles the `WebSocketEvent` wrapping for all handlers.
+
+    If `batch` is given, an "onmessage" handler is instead called with a
+    `list` of message payloads, collected in JavaScript and delivered once
+    per batch (see `WebSocket`). Otherwise, if `raw` is true, an "onmessage"
+    handler is called with the message payload rather than an event.
     """
+    if handler_name == "onmessage" and batch is not None:
+        convert = _convert_batch
+    elif handler_name == "onmessage" and raw:
+        convert = _convert_message
+    else:
+        convert = WebSocketEvent
     if is_awaitable(handler_function):
 
         async def async_wrapper(event):
-            await handler_function(WebSocketEvent(event))
+            await handler_function(convert(event))
 
         wrapped_handler = create_proxy(async_wrapper)
     else:
-        wrapped_handler = create_proxy(
-            lambda event: handler_function(WebSocketEvent(event))
-        )
+        wrapped_handler = create_proxy(lambda event: handler_function(convert(event)))
+    if convert is _convert_batch:
+        wrapped_handler = _create_batcher(websocket, wrapped_handler, batch)
     # Note: Direct assignment (websocket[handler_name]) fails in Pyodide.
     setattr(websocket, handler_name, wrapped_handler)
 
@@ -74,7 +314,8 @@ class WebSocketEvent:
 
     This class wraps browser WebSocket events and provides convenient access
     to event properties. It handles the conversion of binary data from
-    JavaScript typed arrays to Python bytes-like objects.
+    JavaScript typed arrays to Python bytes-like objects, converting the data
+    only once however many times it is accessed.
 
     The most commonly used property is `event.data`, which contains the
     message data for "message" events.
@@ -90,29 +331,31 @@ class WebSocketEvent:
     ```
     """
 
+    __slots__ = ("_event", "_data")
+
     def __init__(self, event):
         """
         Create a WebSocketEvent wrapper from an underlying JavaScript
         `event`.
         """
         self._event = event
+        self._data = _UNCONVERTED
+
+    @property
+    def data(self):
+        """
+        The message data, converted from JavaScript on first access only:
+        a `str` for text, or a `memoryview` for binary data.
+        """
+        if self._data is _UNCONVERTED:
+            self._data = _convert_data(self._event.data)
+        return self._data
 
     def __getattr__(self, attr):
         """
         Get an attribute `attr` from the underlying event object.
-
-        Handles special conversion of binary data from JavaScript typed
-        arrays to Python `memoryview` objects.
         """
-        value = getattr(self._event, attr)
-        if attr == "data" and not isinstance(value, str):
-            if hasattr(value, "to_py"):
-                # Pyodide - convert JavaScript typed array to Python.
-                return value.to_py()
-            else:
-                # MicroPython - manually convert JS ArrayBuffer.
-                return memoryview(as_bytearray(value))
-        return value
+        return getattr(self._event, attr)
 
 
 class WebSocket:
@@ -165,6 +408,35 @@ class WebSocket:
     ws.send(data)
     ```
 
+    Receiving messages as an asynchronous stream, with flow control when
+    sending:
+
+    ```python
+    ws = WebSocket(url="ws://example.com/")
+
+    greeting = await ws.recv()
+    async for message in ws:
+        ws.send(process(message))
+        # Wait for the browser to flush its send buffer.
+        await ws.drain()
+    ```
+
+    High-rate feeds can be delivered in batches, so the `onmessage` handler
+    is called once per animation frame with a `list` of message payloads
+    (`str` or `memoryview`), rather than once per message:
+
+    ```python
+    def handle_ticks(payloads):
+        for payload in payloads:
+            update(payload)
+
+    ws = WebSocket(
+        url="wss://feed.example.com/",
+        batch="frame",
+        onmessage=handle_ticks
+    )
+    ```
+
     Read more about Python's
     [`memoryview` here](https://docs.python.org/3/library/stdtypes.html#memoryview).
     """
@@ -175,13 +447,46 @@ class WebSocket:
     CLOSING = 2
     CLOSED = 3
 
-    def __init__(self, url, protocols=None, **handlers):
+    def __init__(
+        self,
+        url,
+        protocols=None,
+        max_queue=1024,
+        overflow="drop-oldest",
+        high_water_mark=65536,
+        batch=None,
+        raw=False,
+        **handlers,
+    ):
         """
         Create a new WebSocket connection from the given `url` (`ws://` or
         `wss://`). Optionally specify `protocols` (a string or a list of
         protocol strings) and event handlers (`onopen`, `onmessage`, etc.) as
         keyword arguments.
 
+        Messages received while there is no `onmessage` handler are kept in
+        a queue, for `recv()` and `async for`. The `overflow` policy decides
+        what happens once it holds `max_queue` messages (`0` for no limit):
+        `"drop-oldest"` (the default) discards the oldest queued message, and
+        `"drop-newest"` discards the incoming message. With `"grow"`, nothing
+        is dropped and `max_queue` is not enforced: browsers cannot pause an
+        incoming WebSocket stream, so the queue keeps growing until messages
+        are read.
+
+        The `high_water_mark` is the default number of buffered outgoing
+        bytes `drain()` waits for the connection to fall below.
+
+        If `batch` is `"frame"`, incoming messages are collected in
+        JavaScript and the `onmessage` handler is called once per animation
+        frame with a `list` of their payloads (`str` or `memoryview`). If
+        `batch` is a number, the handler is called at most once every
+        `batch` milliseconds instead. Either way, the cost of calling into
+        Python is paid once per batch rather than once per message.
+
+        If `raw` is true, the `onmessage` handler is called with each
+        message's payload (`str` or `memoryview`) instead of a
+        `WebSocketEvent`, avoiding the wrapper altogether.
+
         These arguments and naming conventions mirror those of the
         [underlying JavaScript WebSocket API](https://developer.mozilla.org/en-US/docs/Web/API/WebSocket)
         for familiarity.
@@ -205,8 +510,39 @@ class WebSocket:
             onopen=lambda e: print("Connected"),
             onmessage=lambda e: print(e.data)
         )
+
+        # With a receive queue keeping every message until it is read.
+        ws = WebSocket(
+            url="ws://localhost:8080/",
+            overflow="grow"
+        )
+
+        # With message payloads, rather than events, passed to onmessage.
+        ws = WebSocket(
+            url="ws://localhost:8080/",
+            raw=True,
+            onmessage=lambda payload: print(payload)
+        )
+
+        # With message payloads delivered in batches every 100ms.
+        ws = WebSocket(
+            url="ws://localhost:8080/",
+            batch=100,
+            onmessage=lambda payloads: print(len(payloads))
+        )
         ```
         """
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Invalid overflow policy {overflow!r}, expected one of: "
+                f"{', '.join(_OVERFLOW_POLICIES)}."
+            )
+        if batch is not None and batch != "frame":
+            if isinstance(batch, str) or not batch > 0:
+                raise ValueError(
+                    f"Invalid batch {batch!r}, expected 'frame' or a positive "
+                    "number of milliseconds."
+                )
         # Create underlying JavaScript WebSocket.
         if protocols:
             js_websocket = js.WebSocket.new(url, protocols)
@@ -217,6 +553,12 @@ class WebSocket:
         # Store the underlying WebSocket.
         # Use object.__setattr__ to bypass our custom __setattr__.
         object.__setattr__(self, "_js_websocket", js_websocket)
+        # Queue messages from the start, so none are missed by recv().
+        queue = _create_receive_queue(js_websocket, max_queue, overflow)
+        object.__setattr__(self, "_queue", queue)
+        object.__setattr__(self, "_high_water_mark", high_water_mark)
+        object.__setattr__(self, "_batch", batch)
+        object.__setattr__(self, "_raw", raw)
         # Attach any event handlers passed as keyword arguments.
         for handler_name, handler in handlers.items():
             setattr(self, handler_name, handler)
@@ -239,16 +581,27 @@ class WebSocket:
         underlying WebSocket directly.
         """
         if attr in ["onclose", "onerror", "onmessage", "onopen"]:
-            _attach_event_handler(self._js_websocket, attr, value)
+            _attach_event_handler(
+                self._js_websocket, attr, value, self._batch, self._raw
+            )
         else:
             setattr(self._js_websocket, attr, value)
 
-    def send(self, data):
+    def send(self, data, offset=0, length=None):
         """
         Send `data` through the WebSocket.
 
-        Accepts both text (`str`) and binary data (`bytes`, `bytearray`, etc.).
-        Binary data is automatically converted to a JavaScript `Uint8Array`.
+        Accepts both text (`str`) and binary data: `bytes`, `bytearray`,
+        `memoryview`, `array.array` or anything else supporting the buffer
+        protocol (e.g. NumPy arrays), as well as a `list` of byte values.
+        Binary data is handed to JavaScript in bulk, without copying it byte
+        by byte. JavaScript binary objects (`ArrayBuffer`, typed arrays,
+        `Blob`) are sent as they are. Any other data raises a `TypeError`.
+
+        For binary data, the optional `offset` and `length` select a slice of
+        `data` to send, without creating an intermediate copy. They are
+        measured in bytes, except for JavaScript typed arrays where they are
+        measured in elements.
 
         ```python
         # Send text.
@@ -257,6 +610,10 @@ class WebSocket:
         # Send binary.
         ws.send(bytes([1, 2, 3, 4]))
         ws.send(bytearray([5, 6, 7, 8]))
+        ws.send(array.array("f", [0.1, 0.2]))
+
+        # Send 512 bytes from the middle of a larger buffer.
+        ws.send(frame, offset=1024, length=512)
         ```
 
         !!! warning
@@ -265,11 +622,90 @@ class WebSocket:
         """
         if isinstance(data, str):
             self._js_websocket.send(data)
-        else:
-            buffer = js.Uint8Array.new(len(data))
-            for index, byte_value in enumerate(data):
-                buffer[index] = byte_value
-            self._js_websocket.send(buffer)
+            return
+        if isinstance(data, (list, tuple)):
+            # A sequence of byte values.
+            data = bytes(data)
+        try:
+            view = _byte_slice(data, offset, length)
+        except TypeError:
+            # Not a Python buffer, so it must be a JavaScript binary object:
+            # an ArrayBuffer, typed array or DataView, or a Blob.
+            if not (hasattr(data, "byteLength") or hasattr(data, "arrayBuffer")):
+                raise TypeError(
+                    f"Cannot send {type(data).__name__!r} data, expected str, "
+                    "a bytes-like object or a JavaScript binary object."
+                )
+            if offset or length is not None:
+                bounds = (offset,) if length is None else (offset, offset + length)
+                if hasattr(data, "subarray"):
+                    # Typed arrays: a view of the same memory.
+                    data = data.subarray(*bounds)
+                else:
+                    data = data.slice(*bounds)
+            self._js_websocket.send(data)
+            return
+        _send_buffer(self._js_websocket, view)
+
+    async def recv(self):
+        """
+        Wait for, and return, the next message received by the WebSocket:
+        a `str` for text messages, or a `memoryview` for binary messages.
+
+        Messages received while there is no `onmessage` handler are queued
+        (see the `max_queue` and `overflow` arguments when creating the
+        WebSocket) until `recv()` asks for them. A `RuntimeError` is raised
+        if the connection is closed and no more messages are queued.
+
+        ```python
+        ws = WebSocket(url="ws://localhost:8080/")
+        message = await ws.recv()
+        ```
+        """
+        result = await self._queue.next()
+        if result.done:
+            raise RuntimeError("WebSocket is closed.")
+        return _convert_data(result.value)
+
+    def __aiter__(self):
+        """
+        Iterate asynchronously over received messages via `async for`.
+        """
+        return self
+
+    async def __anext__(self):
+        """
+        Return the next message, stopping iteration when the connection is
+        closed and the receive queue is empty.
+        """
+        result = await self._queue.next()
+        if result.done:
+            raise StopAsyncIteration
+        return _convert_data(result.value)
+
+    async def drain(self, high_water_mark=None):
+        """
+        Wait until the amount of data queued by `send()` but not yet
+        transmitted (the WebSocket's `bufferedAmount`) is at or below
+        `high_water_mark` bytes (by default, the value given when creating
+        the WebSocket).
+
+        Call this after sending to stop a fast producer from piling up data
+        in the browser's memory. A `RuntimeError` is raised if the connection
+        closes while data is still buffered.
+
+        ```python
+        for chunk in chunks:
+            ws.send(chunk)
+            await ws.drain()
+        ```
+        """
+        if high_water_mark is None:
+            high_water_mark = self._high_water_mark
+        if self._js_websocket.bufferedAmount <= high_water_mark:
+            return
+        if not await _get_drainer()(self._js_websocket, high_water_mark):
+            raise RuntimeError("WebSocket closed before draining.")
 
     def close(self, code=None, reason=None):
         """
@@ -1,70 +1,152 @@
 import IDBMapSync from "@webreflection/idb-map/sync";
-import { parse, stringify } from "flatted";
+import { parse } from "flatted";
+import { decode, encode } from "./codec.js";
 
 const { isView } = ArrayBuffer;
 
 const to_idb = (value) => {
-    if (value == null) return stringify(["null", 0]);
-    /* eslint-disable no-fallthrough */
-    switch (typeof value) {
-        case "object": {
-            if (isView(value)) return stringify(["memoryview", [...value]]);
-            if (value instanceof ArrayBuffer)
-                return stringify(["bytearray", [...new Uint8Array(value)]]);
-        }
-        case "string":
-        case "number":
-        case "boolean":
-            return stringify(["generic", value]);
-        default:
-            throw new TypeError(`Unexpected value: ${String(value)}`);
+    // binary data is stored natively (and copied, as writes are queued)
+    if (isView(value)) {
+        const { buffer, byteOffset, byteLength } = value;
+        const end = byteOffset + byteLength;
+        return new Uint8Array(buffer.slice(byteOffset, end));
     }
+    if (value instanceof ArrayBuffer) return value.slice(0);
+    return { packed: encode(value) };
+};
+
+// large records may have been compressed (see pyscript.storage)
+const decompress = async ({ compressed, type, data }) => {
+    const stream = new Blob([data])
+        .stream()
+        .pipeThrough(new DecompressionStream(compressed));
+    const buffer = await new Response(stream).arrayBuffer();
+    if (type === "text") return new TextDecoder().decode(buffer);
+    if (type === "packed") return { packed: new Uint8Array(buffer) };
+    return type === "memoryview" ? new Uint8Array(buffer) : buffer;
 };
 
-const from_idb = (value) => {
+const from_idb = async (value) => {
+    if (isView(value) || value instanceof ArrayBuffer) return value;
+    if (typeof value === "object" && "compressed" in value) {
+        value = await decompress(value);
+        if (isView(value) || value instanceof ArrayBuffer) return value;
+    }
+    if (typeof value === "object") return decode(value.packed);
+    // records written by older versions, as flatted strings
     const [kind, result] = parse(value);
     if (kind === "null") return null;
     if (kind === "generic") return result;
-    if (kind === "bytearray") return new Uint8Array(value).buffer;
-    if (kind === "memoryview") return new Uint8Array(value);
+    // binary data stored as a list of bytes by older versions
+    if (kind === "bytearray") return new Uint8Array(result).buffer;
+    if (kind === "memoryview") return new Uint8Array(result);
     return value;
 };
 
 // this export simulate pyscript.storage exposed in the Python world
-export const storage = async (name) => {
+export const storage = async (name, { shared = false } = {}) => {
     if (!name) throw new SyntaxError("The storage name must be defined");
 
     const store = new IDBMapSync(`@pyscript/${name}`);
     const map = new Map();
     await store.sync();
-    for (const [k, v] of store.entries()) map.set(k, from_idb(v));
+    for (const [k, v] of store.entries()) map.set(k, await from_idb(v));
+
+    // changes are shared with other tabs and workers only if asked to
+    // (see pyscript.storage)
+    const { set, delete: remove } = Map.prototype;
+    const now = () => performance.timeOrigin + performance.now();
+    const changedAt = new Map();
+    let clearedAt = 0;
+    let applying = Promise.resolve();
+
+    const channel = shared ? new BroadcastChannel(`@pyscript/${name}`) : null;
+    const post = (keys, values, cleared) => {
+        if (channel)
+            channel.postMessage({ time: now(), keys, values, cleared });
+    };
+    // the last change made to a key wins
+    const apply = (time, keys, values, cleared) => {
+        if (time <= clearedAt) return;
+        if (cleared) {
+            clearedAt = time;
+            for (const key of [...map.keys()]) {
+                if ((changedAt.get(key) || 0) < time) {
+                    map.delete(key);
+                    remove.call(store, key);
+                }
+            }
+        }
+        for (let i = 0; i < keys.length; i++) {
+            const key = keys[i];
+            if ((changedAt.get(key) || 0) >= time) continue;
+            changedAt.set(key, time);
+            if (values[i] == null) {
+                map.delete(key);
+                remove.call(store, key);
+            } else {
+                map.set(key, values[i].value);
+                set.call(store, key, values[i].record);
+            }
+        }
+    };
+    const receive = ({ data: { time, keys, values, cleared } }) => {
+        applying = applying.then(async () => {
+            const decoded = [];
+            for (const record of values) {
+                decoded.push(
+                    record == null
+                        ? null
+                        : { record, value: await from_idb(record) },
+                );
+            }
+            apply(time, keys, decoded, cleared);
+        });
+    };
+
+    if (channel) channel.onmessage = receive;
 
     const clear = () => {
+        if (channel) {
+            clearedAt = now();
+            changedAt.clear();
+        }
         map.clear();
         store.clear();
+        post([], [], true);
     };
 
     const sync = async () => {
         await store.sync();
     };
 
+    const close = () => {
+        if (channel) channel.close();
+    };
+
     return new Proxy(map, {
         ownKeys: (map) => [...map.keys()],
         has: (map, name) => map.has(name),
         get: (map, name) => {
             if (name === "clear") return clear;
             if (name === "sync") return sync;
+            if (name === "close") return close;
             return map.get(name);
         },
         set: (map, name, value) => {
+            const record = to_idb(value);
+            if (channel) changedAt.set(name, now());
             map.set(name, value);
-            store.set(name, to_idb(value));
+            store.set(name, record);
+            post([name], [record], false);
             return true;
         },
         deleteProperty: (map, name) => {
             if (map.has(name)) {
+                if (channel) changedAt.set(name, now());
                 map.delete(name);
                 store.delete(name);
+                post([name], [null], false);
             }
             return true;
         },
@@ -0,0 +1,32 @@
+# Per-MB cost of moving bytes across the FFI with pyscript.util.
+import js
+from pyscript import config, display
+from pyscript.util import as_bytearray, as_js_buffer
+
+SIZES = (1, 4, 16)
+MB = 1024 * 1024
+
+
+def per_element(buffer):
+    # The previous implementation, kept here as the baseline.
+    ui8a = js.Uint8Array.new(buffer)
+    ba = bytearray(ui8a.length)
+    for i in range(ui8a.length):
+        ba[i] = ui8a[i]
+    return ba
+
+
+def bench(label, fn, arg, mb):
+    start = js.performance.now()
+    fn(arg)
+    end = js.performance.now()
+    display(f"{config['type']} {label} {mb} MB: {(end - start) / mb:.1f} ms/MB")
+
+
+for mb in SIZES:
+    data = bytes(range(256)) * (mb * MB // 256)
+    ui8a = as_js_buffer(data)
+    bench("as_js_buffer", as_js_buffer, data, mb)
+    bench("as_bytearray", as_bytearray, ui8a.buffer, mb)
+    if mb == 1:
+        bench("per-element baseline", per_element, ui8a.buffer, mb)
@@ -0,0 +1,34 @@
+# Time of display() calls with many values, on the main thread and in a
+# worker (where every DOM operation is a call to the main thread).
+import js
+from pyscript import HTML, RUNNING_IN_WORKER, config, display
+
+SIZES = (10, 100, 1_000, 10_000)
+
+name = f"{config['type']}-{'worker' if RUNNING_IN_WORKER else 'main'}"
+
+
+def bench(label, values):
+    # Clear the output first, so each run starts from an empty element.
+    display(target=f"{name}-output", append=False)
+    start = js.performance.now()
+    display(*values, target=f"{name}-output")
+    elapsed = js.performance.now() - start
+    result = f"{name} {label} {len(values)} values: {elapsed:.1f} ms"
+    display(result, target=name)
+
+
+def progress(coalesce):
+    # Many replacing updates, as a progress loop would make.
+    start = js.performance.now()
+    for i in range(1_000):
+        display(f"{i}", target=f"{name}-output", append=False, coalesce=coalesce)
+    elapsed = js.performance.now() - start
+    display(f"{name} progress coalesce={coalesce}: {elapsed:.1f} ms", target=name)
+
+
+for size in SIZES:
+    bench("text", [f"item {i}" for i in range(size)])
+    bench("html", [HTML(f"<b>item {i}</b>") for i in range(size)])
+progress(False)
+progress(True)
@@ -0,0 +1,38 @@
+# Scaling of pyscript.flatted with the number of nodes in a graph (the
+# time per 1,000 nodes should stay flat).
+import js
+from pyscript import config, display
+from pyscript.flatted import iter_stringify, parse, stringify
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def graph(size):
+    # Each node refers to a shared parent, and to one of a few names.
+    nodes = []
+    for i in range(size):
+        parent = nodes[i // 2] if i else None
+        nodes.append({"id": i, "name": f"node{i % 100}", "parent": parent})
+    return nodes
+
+
+def bench(label, fn, arg, size):
+    start = js.performance.now()
+    result = fn(arg)
+    elapsed = js.performance.now() - start
+    per_k = elapsed * 1000 / size
+    name = f"{config['type']} {label} {size} nodes"
+    display(f"{name}: {elapsed:.1f} ms ({per_k:.2f} ms/1k)")
+    return result
+
+
+def chunked(nodes):
+    # Serialize without holding the whole result, as flatted.dump does.
+    return sum(len(chunk) for chunk in iter_stringify(nodes))
+
+
+for size in SIZES:
+    nodes = graph(size)
+    text = bench("stringify", stringify, nodes, size)
+    bench("iter_stringify", chunked, nodes, size)
+    bench("parse", parse, text, size)
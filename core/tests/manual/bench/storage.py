@@ -0,0 +1,35 @@
+# Encoding speed and stored size of pyscript.codec, against the Flatted
+# strings stored by previous versions of pyscript.storage.
+import js
+from pyscript import codec, config, display
+from pyscript.flatted import parse, stringify
+
+ROWS = (10, 100, 1000)
+
+
+def sample(rows):
+    return {
+        "name": "benchmark",
+        "scores": [i * 0.5 for i in range(rows)],
+        "rows": [
+            {"id": i, "label": f"row {i}", "done": i % 2 == 0} for i in range(rows)
+        ],
+    }
+
+
+def bench(label, fn, arg, rows):
+    start = js.performance.now()
+    result = fn(arg)
+    end = js.performance.now()
+    display(f"{config['type']} {label} {rows} rows: {end - start:.1f} ms")
+    return result
+
+
+for rows in ROWS:
+    value = sample(rows)
+    text = bench("flatted stringify", stringify, ["generic", value], rows)
+    bench("flatted parse", parse, text, rows)
+    data = bench("codec encode", codec.encode, value, rows)
+    bench("codec decode", codec.decode, data, rows)
+    size = len(text.encode("utf-8"))
+    display(f"{config['type']} size {rows} rows: {size} vs {len(data)} bytes")
@@ -0,0 +1,58 @@
+# Messages per second delivered to Python WebSocket message handlers.
+# No server is needed: message events are dispatched straight to the handler.
+import js
+from pyscript import WebSocket, config, display
+from pyscript.ffi import create_proxy, to_js
+from pyscript.util import as_bytearray
+
+COUNT = 20000
+
+
+class EventBefore:
+    # The previous WebSocketEvent, converting data on every access.
+    def __init__(self, event):
+        self._event = event
+
+    def __getattr__(self, attr):
+        value = getattr(self._event, attr)
+        if attr == "data" and not isinstance(value, str):
+            if hasattr(value, "to_py"):
+                return value.to_py()
+            return memoryview(as_bytearray(value))
+        return value
+
+
+def before(event):
+    wrapped = EventBefore(event)
+    return wrapped.data, wrapped.data
+
+
+def after(event):
+    return event.data, event.data
+
+
+def after_raw(payload):
+    return payload
+
+
+def bench(label, data, handler, **options):
+    ws = WebSocket(url="ws://localhost:1/", **options)
+    ws.onerror = lambda event: None
+    if handler is before:
+        ws._js_websocket.onmessage = create_proxy(before)
+    else:
+        ws.onmessage = handler
+    event = js.MessageEvent.new("message", to_js({"data": data}))
+    onmessage = ws._js_websocket.onmessage
+    start = js.performance.now()
+    for _ in range(COUNT):
+        onmessage(event)
+    elapsed = js.performance.now() - start
+    display(f"{config['type']} {label}: {COUNT * 1000 / elapsed:.0f} messages/s")
+
+
+for kind, data in (("text", "x" * 64), ("binary", js.ArrayBuffer.new(1024))):
+    display(f"{config['type']} {kind} payloads")
+    bench("before", data, before)
+    bench("after", data, after)
+    bench("after raw", data, after_raw, raw=True)
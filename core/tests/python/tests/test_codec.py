@@ -0,0 +1,131 @@
+"""
+Tests for the pyscript.codec module.
+"""
+
+from pyscript import codec
+
+
+def test_codec_roundtrip():
+    """
+    Supported values should be decoded as they were encoded.
+    """
+    values = [
+        None,
+        True,
+        False,
+        0,
+        -1,
+        -33,
+        127,
+        128,
+        70000,
+        -70000,
+        2**40,
+        -(2**40),
+        0.5,
+        -1.25e100,
+        "",
+        "hello",
+        "é" * 100,
+        "x" * 70000,
+        [],
+        [1, [2, [3]]],
+        list(range(100)),
+        {},
+        {"a": 1, "b": {"c": None}},
+        {str(i): i for i in range(100)},
+        bytearray(b"\x00\x01\xff"),
+    ]
+    for value in values:
+        assert codec.decode(codec.encode(value)) == value, value
+
+
+def test_codec_encode_version():
+    """
+    Encoded data should start with the encoding version.
+    """
+    data = codec.encode(1)
+    assert isinstance(data, bytearray)
+    assert data[0] == codec.VERSION
+    assert len(data) == 2
+
+
+def test_codec_converted_types():
+    """
+    Tuples should be decoded as lists, and bytes as bytearray.
+    """
+    assert codec.decode(codec.encode((1, 2))) == [1, 2]
+    result = codec.decode(codec.encode(b"abc"))
+    assert isinstance(result, bytearray)
+    assert result == b"abc"
+
+
+def test_codec_nested_binary():
+    """
+    Binary data should be supported within structures.
+    """
+    value = {"data": bytearray(b"abc"), "view": memoryview(b"xyz")}
+    result = codec.decode(codec.encode(value))
+    assert result["data"] == b"abc"
+    assert isinstance(result["view"], memoryview)
+    assert result["view"] == memoryview(b"xyz")
+
+
+def test_codec_length_headers():
+    """
+    Arrays and maps should use the smallest header for their length.
+    """
+    assert codec.encode(list(range(15)))[1] == 0x9F
+    assert codec.encode(list(range(16)))[1] == 0xDC
+    assert codec.encode([0] * 0xFFFF)[1] == 0xDC
+    assert codec.encode([0] * 0x10000)[1] == 0xDD
+    assert codec.encode({str(i): i for i in range(16)})[1] == 0xDE
+    for value in (list(range(300)), {str(i): i for i in range(300)}):
+        assert codec.decode(codec.encode(value)) == value
+
+
+def test_codec_big_int():
+    """
+    Integers too big for 64 bits should be supported.
+    """
+    for value in (2**64 - 1, 2**64, 2**100, -(2**63), -(2**63) - 1, -(2**100)):
+        assert codec.decode(codec.encode(value)) == value
+
+
+def test_codec_references():
+    """
+    Shared and circular references should be preserved.
+    """
+    shared = {"name": "shared"}
+    value = {"first": shared, "second": shared, "list": [shared]}
+    value["self"] = value
+    result = codec.decode(codec.encode(value))
+    assert result["first"] is result["second"]
+    assert result["list"][0] is result["first"]
+    assert result["self"] is result
+    # References are only used when needed.
+    assert len(codec.encode([[1], [1]])) == len(codec.encode([1, 1])) + 2
+
+
+def test_codec_unsupported_type():
+    """
+    Encoding unsupported types should raise a TypeError.
+    """
+    try:
+        codec.encode({"a": object()})
+        assert False, "Expected TypeError"
+    except TypeError:
+        pass
+
+
+def test_codec_unsupported_version():
+    """
+    Decoding data with an unknown version should raise a ValueError.
+    """
+    data = codec.encode("hello")
+    data[0] = codec.VERSION + 1
+    try:
+        codec.decode(data)
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
@@ -175,6 +175,72 @@ async def test_display_multiple_values():
     assert container.innerText == "hello\nworld", container.innerText
 
 
+async def test_display_many_values():
+    """
+    Many values in the same call should each get their own container, in
+    order, whatever their content.
+    """
+    values = []
+    for i in range(500):
+        values.append(HTML(f"<b>{i}</b>") if i % 2 else f"<{i}>")
+    display(*values)
+    container = await get_display_container()
+    assert len(container.children) == 500
+    assert container.children[0].innerHTML == "&lt;0&gt;"
+    assert container.children[1].innerHTML == "<b>1</b>"
+    assert container.children[499].innerHTML == "<b>499</b>"
+
+
+async def test_display_coalesce():
+    """
+    Coalesced content should only be displayed on the next frame, and only
+    the latest content replacing the output should be rendered.
+    """
+    container = await get_display_container()
+    for i in range(100):
+        display(f"step {i}", append=False, coalesce=True)
+    assert container.innerText == ""
+    await asyncio.sleep(0.1)
+    container = await get_display_container()
+    assert container.innerText == "step 99"
+    display("first", coalesce=True)
+    display("second", coalesce=True)
+    await asyncio.sleep(0.1)
+    container = await get_display_container()
+    assert container.innerText == "step 99\nfirst\nsecond", container.innerText
+
+
+async def test_display_coalesce_order():
+    """
+    Coalesced content should be displayed before any later content that is
+    not coalesced.
+    """
+    display("first", append=False, coalesce=True)
+    display("second")
+    container = await get_display_container()
+    assert container.innerText == "first\nsecond", container.innerText
+    await asyncio.sleep(0.1)
+    container = await get_display_container()
+    assert container.innerText == "first\nsecond", container.innerText
+
+
+async def test_display_coalesce_failure():
+    """
+    A coalesced value that fails to render should not lose the pending
+    content of other targets.
+    """
+
+    class Broken:
+        def _repr_html_(self):
+            raise ValueError("broken")
+
+    display(Broken(), target="test-element-container", coalesce=True)
+    display("fine", append=False, coalesce=True)
+    await asyncio.sleep(0.1)
+    container = await get_display_container()
+    assert container.innerText == "fine", container.innerText
+
+
 async def test_display_multiple_append_false():
     display("hello", "world", append=False)
     container = await get_display_container()
@@ -3,7 +3,16 @@ Tests for the fetch function and response handling.
 """
 
 import json
+import os
+import upytest
 from pyscript import fetch
+from pyscript.fetch import (
+    ResponseCache,
+    download,
+    fetch_many,
+    record_metrics,
+    stats,
+)
 
 
 async def test_fetch_json():
@@ -305,3 +314,354 @@ async def test_fetch_options_passed_correctly():
     assert response.ok
     # The request succeeded, confirming options were passed correctly.
     assert response.status == 201
+
+
+async def test_fetch_iter_bytes():
+    """
+    The response body should be available as a stream of byte chunks.
+    """
+    response = await fetch("https://jsonplaceholder.typicode.com/todos/1")
+    assert response.ok
+    data = bytearray()
+    async for chunk in response.iter_bytes():
+        assert isinstance(chunk, bytearray)
+        data.extend(chunk)
+    assert b"delectus aut autem" in data
+
+
+async def test_fetch_iter_bytes_chunk_size():
+    """
+    Streamed byte chunks should be re-sized to the requested chunk size.
+    """
+    expected = await fetch("https://jsonplaceholder.typicode.com/todos/1").bytearray()
+    chunks = []
+    async for chunk in fetch("https://jsonplaceholder.typicode.com/todos/1").iter_bytes(
+        chunk_size=10
+    ):
+        chunks.append(chunk)
+    assert all(len(chunk) == 10 for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= 10
+    assert b"".join(chunks) == expected
+
+
+async def test_fetch_iter_text_direct():
+    """
+    The response body should be available as a stream of text chunks,
+    chained directly on the fetch promise.
+    """
+    text = ""
+    async for chunk in fetch("https://jsonplaceholder.typicode.com/todos/1").iter_text():
+        assert isinstance(chunk, str)
+        text += chunk
+    assert "delectus aut autem" in text
+
+
+async def test_fetch_response_cache():
+    """
+    A ResponseCache should answer repeated GET requests from the cache,
+    counting hits and misses.
+    """
+    cache = ResponseCache("test_fetch_response_cache", ttl=3600)
+    await cache.clear()
+    url = "https://jsonplaceholder.typicode.com/todos/1"
+    first = await fetch(url, cache=cache).json()
+    second = await fetch(url, cache=cache).json()
+    assert first == second
+    stats = cache.stats
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["entries"] == 1
+    assert stats["bytes"] > 0
+    await cache.clear()
+
+
+async def test_fetch_response_cache_eviction():
+    """
+    A ResponseCache should evict the least recently used responses when
+    over its size budget.
+    """
+    cache = ResponseCache("test_fetch_response_cache_eviction", max_bytes=1)
+    await cache.clear()
+    url = "https://jsonplaceholder.typicode.com/todos/1"
+    for _ in range(3):
+        # Each response is bigger than the budget, so is evicted once stored.
+        await fetch(url, cache=cache).text()
+    assert cache.stats["misses"] == 3
+    assert cache.stats["evictions"] >= 2
+    assert cache.stats["hits"] == 0
+    await cache.clear()
+
+
+def test_fetch_response_cache_name():
+    """
+    A ResponseCache must have a name.
+    """
+    with upytest.raises(ValueError):
+        ResponseCache("")
+
+
+async def test_fetch_many_in_order():
+    """
+    The fetch_many function should return responses in request order,
+    with duplicate requests each getting a readable response.
+    """
+    urls = [f"https://jsonplaceholder.typicode.com/todos/{i}" for i in (3, 1, 2, 1)]
+    responses = await fetch_many(urls, concurrency=2)
+    assert len(responses) == 4
+    data = [await response.json() for response in responses]
+    assert [item["id"] for item in data] == [3, 1, 2, 1]
+
+
+async def test_fetch_many_as_completed():
+    """
+    The fetch_many function should yield (url, response) pairs as they
+    complete when as_completed is true.
+    """
+    urls = [f"https://jsonplaceholder.typicode.com/todos/{i}" for i in range(1, 6)]
+    seen = []
+    async for url, response in fetch_many(urls, concurrency=3, as_completed=True):
+        assert response.ok
+        data = await response.json()
+        assert url.endswith(f"/{data['id']}")
+        seen.append(url)
+    assert sorted(seen) == sorted(urls)
+
+
+def test_fetch_many_duplicates():
+    """
+    Only GET and HEAD requests with the same URL and options, in any order,
+    should be sent once.
+    """
+    from pyscript.fetch import _request_key
+
+    url = "https://jsonplaceholder.typicode.com/posts"
+    first = {"headers": {"Accept": "application/json", "X-Test": "1"}}
+    second = {"headers": {"X-Test": "1", "Accept": "application/json"}}
+    assert _request_key(url, first) == _request_key(url, second)
+    head = {"method": "HEAD"}
+    assert _request_key(url, head) == _request_key(url, {"method": "head"})
+    post = {"method": "POST", "body": "{}"}
+    assert _request_key(url, post) != _request_key(url, post)
+
+
+async def test_fetch_many_close_early():
+    """
+    Leaving an async with block should cancel the requests not complete
+    yet.
+    """
+    urls = [f"https://jsonplaceholder.typicode.com/todos/{i}" for i in range(1, 11)]
+    async with fetch_many(urls, concurrency=2, as_completed=True) as responses:
+        async for url, response in responses:
+            assert response.ok
+            break
+    assert not responses._tasks
+
+
+@upytest.skip(
+    "MicroPython only finalizes objects on garbage collection.",
+    skip_when=upytest.is_micropython,
+)
+async def test_fetch_many_break_early():
+    """
+    Breaking out of an async for loop should cancel the requests not
+    complete yet, without an async with block.
+    """
+    urls = [f"https://jsonplaceholder.typicode.com/todos/{i}" for i in range(1, 11)]
+    responses = fetch_many(urls, concurrency=2, as_completed=True)
+    async for url, response in responses:
+        assert response.ok
+        break
+    assert not responses._tasks
+
+
+def test_fetch_many_invalid_concurrency():
+    """
+    The fetch_many function needs at least one request in flight.
+    """
+    with upytest.raises(ValueError):
+        fetch_many(["https://jsonplaceholder.typicode.com/todos/1"], concurrency=0)
+
+
+async def test_fetch_with_binary_body():
+    """
+    The fetch function should send bytes-like bodies as binary data.
+    """
+    for body in (b"binary", bytearray(b"binary"), memoryview(b"binary")):
+        response = await fetch(
+            "https://jsonplaceholder.typicode.com/posts",
+            method="POST",
+            headers={"Content-Type": "application/octet-stream"},
+            body=body,
+        )
+        assert response.ok
+        assert response.status == 201
+
+
+def test_fetch_javascript_stream_body():
+    """
+    A JavaScript ReadableStream body should be passed to fetch as it is,
+    rather than pulled through Python.
+    """
+    import js
+    from pyscript.fetch import _convert_body
+
+    stream = js.ReadableStream.new()
+    body, streaming = _convert_body(stream)
+    assert streaming
+    assert body is stream
+
+
+async def test_fetch_options_without_json_round_trip():
+    """
+    Nested options, such as headers, should be converted to JavaScript
+    directly.
+    """
+    response = await fetch(
+        "https://jsonplaceholder.typicode.com/todos/1",
+        method="GET",
+        headers={"Accept": "application/json"},
+        cache="no-store",
+    )
+    assert response.ok
+    data = await response.json()
+    assert data["id"] == 1
+
+
+def same_origin(path):
+    """
+    Return the absolute URL of a `path` relative to the test page, which the
+    test server serves with support for range requests.
+    """
+    import js
+    from pyscript import window
+
+    return js.URL.new(path, window.location.href).href
+
+
+def remove_files(*paths):
+    """
+    Remove the files at `paths`, ignoring any that don't exist.
+    """
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+async def test_download():
+    """
+    The download function should fetch the resource as parallel range
+    requests, writing it into a file and reporting progress along the way.
+    """
+    url = same_origin("./tests/test_display.py")
+    expected = await fetch(url).bytearray()
+    progress = []
+    try:
+        size = await download(
+            url,
+            "test_download.py",
+            4,
+            1024,
+            lambda done, total: progress.append((done, total)),
+        )
+        assert size == len(expected)
+        with open("test_download.py", "rb") as f:
+            assert f.read() == expected
+        assert progress[-1] == (size, size)
+        # The progress file is removed once the download is complete.
+        with upytest.raises(OSError):
+            os.stat("test_download.py.download")
+    finally:
+        remove_files("test_download.py", "test_download.py.download")
+
+
+async def test_download_resume():
+    """
+    An interrupted download should resume where its parts left off.
+    """
+    url = same_origin("./tests/test_display.py")
+    expected = await fetch(url).bytearray()
+
+    def interrupt(done, total):
+        if done:
+            raise RuntimeError("Interrupted.")
+
+    try:
+        with upytest.raises(RuntimeError):
+            await download(url, "test_resume.py", 2, 1024, interrupt)
+        # The progress was saved.
+        with open("test_resume.py.download") as f:
+            assert json.load(f)["size"] == len(expected)
+        progress = []
+        size = await download(
+            url, "test_resume.py", 2, 1024, lambda done, total: progress.append(done)
+        )
+        assert size == len(expected)
+        # The download started with the bytes written before.
+        assert progress[0] > 0
+        with open("test_resume.py", "rb") as f:
+            assert f.read() == expected
+    finally:
+        remove_files("test_resume.py", "test_resume.py.download")
+
+
+async def test_download_invalid_parts():
+    """
+    The download function needs at least one part.
+    """
+    with upytest.raises(ValueError):
+        await download("https://jsonplaceholder.typicode.com/todos/1", "test_download_x", parts=0)
+
+
+async def test_fetch_metrics():
+    """
+    A response should record the timestamps and byte count of its transfer
+    while metrics are recorded, and nothing otherwise.
+    """
+    response = await fetch("https://jsonplaceholder.typicode.com/todos/1")
+    assert response.metrics is None
+    record_metrics()
+    try:
+        response = await fetch("https://jsonplaceholder.typicode.com/todos/1")
+    finally:
+        record_metrics(False)
+    metrics = response.metrics
+    assert metrics["first_byte"] >= metrics["start"]
+    assert metrics["body_complete"] is None
+    data = await response.bytearray()
+    metrics = response.metrics
+    assert metrics["body_complete"] >= metrics["first_byte"]
+    assert metrics["converted"] >= metrics["body_complete"]
+    assert metrics["bytes"] == len(data)
+
+
+async def test_fetch_on_progress():
+    """
+    The on_progress callback should be called as the body arrives, with
+    the number of bytes received so far.
+    """
+    progress = []
+    response = await fetch(
+        "https://jsonplaceholder.typicode.com/todos/1",
+        on_progress=lambda done, total: progress.append(done),
+    )
+    text = await response.text()
+    assert progress
+    assert progress[-1] == len(text.encode("utf-8"))
+    assert response.metrics["bytes"] == progress[-1]
+
+
+async def test_fetch_stats():
+    """
+    The stats function should aggregate transfer metrics per origin.
+    """
+    record_metrics()
+    try:
+        await fetch("https://jsonplaceholder.typicode.com/todos/2").json()
+    finally:
+        record_metrics(False)
+    numbers = stats()["https://jsonplaceholder.typicode.com"]
+    assert numbers["requests"] >= 1
+    assert numbers["time_to_first_byte"] >= 0
+    assert numbers["download"] >= 0
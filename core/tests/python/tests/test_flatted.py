@@ -0,0 +1,185 @@
+"""
+Tests for the pyscript.flatted module.
+
+The expected strings were produced by the JavaScript flatted library, from
+the same structures.
+"""
+
+import io
+
+import upytest
+from pyscript import flatted
+
+
+def tree():
+    parent = {"name": "parent", "children": []}
+    parent["children"].append({"name": "child", "parent": parent})
+    parent["children"].append({"name": "child"})
+    return parent
+
+
+def circular():
+    value = {"a": "a"}
+    value["self"] = value
+    value["list"] = [value, "a", "0"]
+    return value
+
+
+def test_stringify_primitives():
+    """
+    Top level primitives should be stringified as a single entry.
+    """
+    assert flatted.stringify(1) == "[1]"
+    assert flatted.stringify("hello") == '["hello"]'
+    assert flatted.stringify([None, True, False, 0, -2, 1.5]) == (
+        "[[null,true,false,0,-2,1.5]]"
+    )
+
+
+def test_stringify_matches_javascript():
+    """
+    The output should be byte for byte what the JavaScript library
+    produces.
+    """
+    assert flatted.stringify(tree()) == (
+        '[{"name":"1","children":"2"},"parent",["3","4"],'
+        '{"name":"5","parent":"0"},{"name":"5"},"child"]'
+    )
+    assert flatted.stringify(circular()) == (
+        '[{"a":"1","self":"0","list":"2"},"a",["0","1","3"],"0"]'
+    )
+    assert flatted.stringify(["a", "b", "a", 'é\n"ü" \x01', ""]) == (
+        '[["1","2","1","3","4"],"a","b","é\\n\\"ü\\" \\u0001",""]'
+    )
+
+
+def test_stringify_identity():
+    """
+    Lists and dicts should only be shared when they are the same object,
+    not when they are equal.
+    """
+    assert flatted.stringify([[1], [1], {}, {}]) == (
+        '[["1","2","3","4"],[1],[1],{},{}]'
+    )
+    shared = [1]
+    assert flatted.stringify([shared, shared, {"s": shared}]) == (
+        '[["1","1","2"],[1],{"s":"1"}]'
+    )
+
+
+def test_stringify_large_graph():
+    """
+    Large graphs with shared references should be stringified (in linear
+    time) and parsed back.
+    """
+    nodes = []
+    for i in range(20000):
+        parent = nodes[i // 2] if i else None
+        nodes.append({"id": i, "name": f"node{i % 100}", "parent": parent})
+    result = flatted.parse(flatted.stringify(nodes))
+    assert len(result) == 20000
+    assert result[19999]["id"] == 19999
+    assert result[19999]["parent"] is result[9999]
+
+
+def test_parse_javascript_output():
+    """
+    Strings produced by the JavaScript library should be parsed into the
+    same structures, with shared and circular references preserved.
+    """
+    result = flatted.parse(
+        '[{"name":"1","children":"2"},"parent",["3","4"],'
+        '{"name":"5","parent":"0"},{"name":"5"},"child"]'
+    )
+    assert result["name"] == "parent"
+    assert result["children"][0]["parent"] is result
+    assert result["children"][1] == {"name": "child"}
+    result = flatted.parse(
+        '[{"a":"1","self":"0","list":"2"},"a",["0","1","3"],"0"]'
+    )
+    assert result["self"] is result
+    assert result["list"] == [result, "a", "0"]
+    assert result["list"][0] is result
+    result = flatted.parse('[["1","1","2"],[1],{"s":"1"}]')
+    assert result[0] is result[1]
+    assert result[2]["s"] is result[0]
+    result = flatted.parse(
+        '[{"k0":"1","k1":"2","k2":"3","k3":null},"s2","2",{"k0":"1","k1":84}]'
+    )
+    assert result == {"k0": "s2", "k1": "2", "k2": {"k0": "s2", "k1": 84}, "k3": None}
+    assert flatted.parse('["hello"]') == "hello"
+    assert flatted.parse("[1]") == 1
+
+
+def test_parse_roundtrip():
+    """
+    Parsing and stringifying again should give the same string.
+    """
+    for value in (tree(), circular(), [[1], [1], {}, {}], "text", None):
+        text = flatted.stringify(value)
+        assert flatted.stringify(flatted.parse(text)) == text
+
+
+def test_parse_deep():
+    """
+    Deeply nested structures should be parsed without recursion.
+    """
+    value = None
+    for i in range(5000):
+        value = {"next": value, "i": i}
+    result = flatted.parse(flatted.stringify(value))
+    depth = 0
+    while result is not None:
+        assert result["i"] == 4999 - depth
+        depth += 1
+        result = result["next"]
+    assert depth == 5000
+
+
+def test_iter_stringify():
+    """
+    The chunks should join into the stringified value, and all but the last
+    should have exactly the requested size.
+    """
+    values = (tree(), circular(), [[1], [1], {}, {}], "text", None, [])
+    for value in values:
+        expected = flatted.stringify(value)
+        for chunk_size in (1, 2, 7, 64, 65536):
+            chunks = list(flatted.iter_stringify(value, chunk_size))
+            assert "".join(chunks) == expected
+            assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
+            assert 0 < len(chunks[-1]) <= chunk_size
+    try:
+        list(flatted.iter_stringify(tree(), 0))
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_dump():
+    """
+    The stringified value should be written to the file-like object, in
+    chunks.
+    """
+    nodes = []
+    for i in range(1000):
+        nodes.append({"id": i, "parent": nodes[i // 2] if i else None})
+    fp = io.StringIO()
+    flatted.dump(nodes, fp, 100)
+    text = fp.getvalue()
+    assert text == flatted.stringify(nodes)
+    result = flatted.parse(text)
+    assert result[999]["parent"] is result[499]
+
+
+@upytest.skip(
+    "MicroPython's json.dumps has no indent option.",
+    skip_when=upytest.is_micropython,
+)
+def test_stringify_options():
+    """
+    Options should be passed to json.dumps.
+    """
+    result = flatted.stringify({"a": 1}, indent=2)
+    assert "\n" in result
+    assert flatted.parse(result) == {"a": 1}
@@ -2,7 +2,15 @@
 Tests for the pyscript.storage module.
 """
 
+import asyncio
 from pyscript import Storage, storage
+from pyscript.storage import (
+    _DECOMPRESS_IN_PYTHON,
+    CacheStorage,
+    _get_records,
+    usage,
+)
+from pyscript.flatted import stringify
 
 test_store = None
 
@@ -322,3 +330,495 @@ async def test_storage_empty_collections():
     assert isinstance(test_store["empty_list"], list)
     assert test_store["empty_dict"] == {}
     assert isinstance(test_store["empty_dict"], dict)
+
+
+async def test_storage_lazy():
+    """
+    A lazy storage should decode values on first access, while behaving
+    as a Python dict.
+    """
+    test_store["a"] = {"x": 1}
+    test_store["b"] = [1, 2, 3]
+    await test_store.sync()
+
+    lazy_store = await storage("test_store", lazy=True)
+    assert len(lazy_store) == 2
+    assert "a" in lazy_store
+    assert lazy_store["a"] == {"x": 1}
+    assert lazy_store.get("b") == [1, 2, 3]
+    assert lazy_store.get("missing", "default") == "default"
+    assert dict(lazy_store.items()) == {"a": {"x": 1}, "b": [1, 2, 3]}
+    assert lazy_store == {"a": {"x": 1}, "b": [1, 2, 3]}
+    assert not (lazy_store != {"a": {"x": 1}, "b": [1, 2, 3]})
+    assert lazy_store != {"a": {"x": 1}}
+    assert lazy_store.pop("a") == {"x": 1}
+    assert "a" not in lazy_store
+    await lazy_store.sync()
+
+
+async def test_storage_lazy_max_decoded():
+    """
+    A lazy storage with max_decoded should still return every value, while
+    only keeping the most recently used ones decoded.
+    """
+    for i in range(20):
+        test_store[f"key{i}"] = i
+    await test_store.sync()
+
+    lazy_store = await storage("test_store", max_decoded=4)
+    for _ in range(2):
+        for i in range(20):
+            assert lazy_store[f"key{i}"] == i
+    assert len(lazy_store) == 20
+    assert sorted(lazy_store.values()) == list(range(20))
+
+
+async def test_storage_binary_roundtrip():
+    """
+    Binary values should be stored natively, and read back after a reload.
+    """
+    data = bytes(range(256)) * 64
+    test_store["bytearray"] = bytearray(data)
+    test_store["memoryview"] = memoryview(data)
+    # Binary data stored as a list of bytes by older versions.
+    test_store._store.set("legacy", stringify(["bytearray", [1, 2, 3]]))
+    await test_store.sync()
+
+    reloaded = await storage("test_store")
+    assert isinstance(reloaded["bytearray"], bytearray)
+    assert reloaded["bytearray"] == data
+    assert isinstance(reloaded["memoryview"], memoryview)
+    assert reloaded["memoryview"] == memoryview(data)
+    assert reloaded["legacy"] == bytearray([1, 2, 3])
+
+
+async def test_storage_packed_roundtrip():
+    """
+    Nested binary data, shared and circular references should survive a
+    reload.
+    """
+    shared = {"name": "shared"}
+    circular = [1, 2]
+    circular.append(circular)
+    test_store["nested"] = {
+        "data": bytearray(b"\x00\x01\x02"),
+        "view": memoryview(b"abc"),
+        "first": shared,
+        "second": shared,
+        "big": 2**100,
+    }
+    test_store["circular"] = circular
+    await test_store.sync()
+
+    reloaded = await storage("test_store")
+    nested = reloaded["nested"]
+    assert nested["data"] == bytearray(b"\x00\x01\x02")
+    assert isinstance(nested["view"], memoryview)
+    assert nested["view"] == memoryview(b"abc")
+    assert nested["first"] is nested["second"]
+    assert nested["big"] == 2**100
+    assert reloaded["circular"][2] is reloaded["circular"]
+
+
+async def test_storage_legacy_records():
+    """
+    Records written by older versions (as Flatted strings) should be read
+    transparently, and replaced by packed records when written.
+    """
+    kind = _get_records().kind
+    test_store._store.set("dict", stringify(["generic", {"a": [1, 2]}]))
+    test_store._store.set("none", stringify(["null", 0]))
+    await test_store.sync()
+
+    reloaded = await storage("test_store")
+    assert reloaded["dict"] == {"a": [1, 2]}
+    assert reloaded["none"] is None
+    assert kind(reloaded._store.get("dict")) == "text"
+    reloaded["dict"] = reloaded["dict"]
+    assert kind(reloaded._store.get("dict")) == "packed"
+    assert reloaded["dict"] == {"a": [1, 2]}
+
+
+async def test_storage_on_change():
+    """
+    Changes made elsewhere to the same store should be applied, and passed
+    to the on_change hook.
+    """
+    changes = []
+    writer = await storage("test_store", shared=True)
+    other = await storage(
+        "test_store", on_change=lambda *change: changes.append(change)
+    )
+    try:
+        writer["a"] = {"b": 1}
+        writer["c"] = 2
+        del writer["c"]
+        await asyncio.sleep(0.1)
+        assert other["a"] == {"b": 1}
+        assert "c" not in other
+        assert changes == [
+            ("set", "a", {"b": 1}),
+            ("set", "c", 2),
+            ("delete", "c", None),
+        ]
+        async with writer.batch():
+            writer["d"] = 3
+            writer["e"] = 4
+        writer.clear()
+        await asyncio.sleep(0.1)
+        assert len(other) == 0
+        assert changes[-1] == ("clear", None, None)
+        assert ("set", "e", 4) in changes
+    finally:
+        other.close()
+    writer["f"] = 5
+    await asyncio.sleep(0.1)
+    assert "f" not in other
+    writer.clear()
+    await writer.sync()
+    writer.close()
+
+
+async def test_storage_close():
+    """
+    Shared storages of the same store should share a channel, until
+    closed, while other storages don't use one.
+    """
+    assert test_store._channel is None
+    with await storage("test_store", shared=True) as writer:
+        with await storage("test_store", shared=True) as first:
+            with await storage("test_store", shared=True) as second:
+                assert first._channel is second._channel
+                assert first._channel is writer._channel
+                writer["a"] = 1
+                assert first["a"] == 1
+                assert second["a"] == 1
+            assert second._channel is None
+            writer["b"] = 2
+            assert "b" not in second
+        assert first._channel is None
+        assert writer._channel is not None
+        test_store["c"] = 3
+        assert "c" not in writer
+
+
+async def test_storage_batch():
+    """
+    Changes made within a batch should be written together, and be there
+    after a reload.
+    """
+    async with test_store.batch():
+        for i in range(100):
+            test_store[f"key{i}"] = i
+        test_store["key0"] = "changed"
+        del test_store["key1"]
+    await test_store.sync()
+
+    reloaded = await storage("test_store")
+    assert len(reloaded) == 99
+    assert reloaded["key0"] == "changed"
+    assert "key1" not in reloaded
+    assert reloaded["key99"] == 99
+
+
+async def test_storage_batch_order():
+    """
+    A change made while a batch is being written should be written after
+    it, so it's the value stored.
+    """
+
+    async def write_batch():
+        async with test_store.batch():
+            test_store["key"] = "batched"
+
+    writing = asyncio.create_task(write_batch())
+    await asyncio.sleep(0)
+    test_store["key"] = "latest"
+    await writing
+    await test_store.sync()
+
+    reloaded = await storage("test_store")
+    assert reloaded["key"] == "latest"
+
+
+async def test_storage_update_many():
+    """
+    The update_many method should write all the items in a single batch.
+    """
+    await test_store.update_many({"a": 1, "b": [2], "c": {"d": 3}})
+    reloaded = await storage("test_store")
+    assert reloaded["a"] == 1
+    assert reloaded["b"] == [2]
+    assert reloaded["c"] == {"d": 3}
+
+
+async def test_storage_debounce():
+    """
+    Debounced changes should be coalesced, and written by sync().
+    """
+    debounced = await storage("test_store", debounce=10)
+    for i in range(10):
+        debounced["counter"] = i
+    assert debounced["counter"] == 9
+    await debounced.sync()
+
+    reloaded = await storage("test_store")
+    assert reloaded["counter"] == 9
+
+
+async def test_storage_scan():
+    """
+    The scan method should return the items of a range of keys, in order.
+    """
+    await test_store.update_many(
+        {"user:3": 3, "user:1": 1, "user:2": 2, "group:1": "g", "zebra": "z"}
+    )
+    assert await test_store.scan(prefix="user:") == [
+        ("user:1", 1),
+        ("user:2", 2),
+        ("user:3", 3),
+    ]
+    assert await test_store.scan(prefix="user:", limit=2, reverse=True) == [
+        ("user:3", 3),
+        ("user:2", 2),
+    ]
+    assert await test_store.scan(start="user:2") == [
+        ("user:2", 2),
+        ("user:3", 3),
+        ("zebra", "z"),
+    ]
+    assert await test_store.scan(stop="user:") == [("group:1", "g")]
+    assert await test_store.scan(prefix="nobody:") == []
+
+
+async def test_storage_scan_batch():
+    """
+    A scan within a batch should include its changes, without writing them.
+    """
+    await test_store.update_many({"user:1": 1, "user:2": 2, "user:3": 3})
+    async with test_store.batch():
+        test_store["user:0"] = 0
+        del test_store["user:2"]
+        assert await test_store.scan(prefix="user:", limit=2) == [
+            ("user:0", 0),
+            ("user:1", 1),
+        ]
+        reloaded = await storage("test_store")
+        assert "user:0" not in reloaded
+        assert "user:2" in reloaded
+    assert await test_store.scan(prefix="user:", reverse=True) == [
+        ("user:3", 3),
+        ("user:1", 1),
+        ("user:0", 0),
+    ]
+
+
+async def test_storage_scan_cache():
+    """
+    A scan should skip a cache's bookkeeping, and still return up to limit
+    items.
+    """
+    cache = await storage("test_cache", max_bytes=2000)
+    cache.clear()
+    cache["a"] = 1
+    cache["b"] = 2
+    await cache.sync()
+    assert await cache.scan(limit=1) == [("a", 1)]
+    cache.clear()
+    await cache.sync()
+
+
+async def test_storage_index():
+    """
+    A secondary index should find values by one of their fields, and be
+    kept up to date as values change.
+    """
+    for i in range(10):
+        test_store[f"event{i}"] = {"ts": 100 - i, "name": f"event {i}"}
+    test_store["other"] = "not indexed"
+    test_store.create_index("by_ts", "ts")
+
+    assert test_store.find("by_ts", 95) == [("event5", {"ts": 95, "name": "event 5"})]
+    assert [key for key, _ in test_store.find("by_ts", start=98)] == [
+        "event2",
+        "event1",
+        "event0",
+    ]
+    assert [key for key, _ in test_store.find("by_ts", stop=93, limit=2)] == [
+        "event9",
+        "event8",
+    ]
+
+    test_store["event0"] = {"ts": 1}
+    del test_store["event9"]
+    assert [key for key, _ in test_store.find("by_ts", stop=93)] == [
+        "event0",
+        "event8",
+    ]
+    try:
+        test_store.find("by_ts", start=True)
+        assert False, "Expected TypeError"
+    except TypeError:
+        pass
+    test_store.drop_index("by_ts")
+
+
+async def test_storage_index_lazy():
+    """
+    Creating an index on a lazy storage should leave its values undecoded.
+    """
+    from pyscript.storage import _NOT_DECODED
+
+    for i in range(10):
+        test_store[f"event{i}"] = {"ts": i}
+    await test_store.sync()
+
+    lazy_store = await storage("test_store", lazy=True)
+    lazy_store.create_index("by_ts", "ts")
+    assert all(value is _NOT_DECODED for value in dict.values(lazy_store))
+    assert lazy_store.find("by_ts", 3) == [("event3", {"ts": 3})]
+
+
+async def test_storage_cache_eviction():
+    """
+    A cache storage should evict the least recently used entries when over
+    its size budget.
+    """
+    cache = await storage("test_cache", max_bytes=2000)
+    cache.clear()
+    assert isinstance(cache, CacheStorage)
+    for i in range(10):
+        cache[f"key{i}"] = "x" * 100
+    # Keep key0 recently used.
+    for i in range(10, 40):
+        assert cache["key0"] == "x" * 100
+        cache[f"key{i}"] = "x" * 100
+    assert cache.size <= 2000
+    assert "key0" in cache
+    assert "key1" not in cache
+    assert "key39" in cache
+    await cache.sync()
+
+    reloaded = await storage("test_cache", max_bytes=2000)
+    assert set(reloaded.keys()) == set(cache.keys())
+    assert reloaded.size == cache.size
+    # The bookkeeping isn't one of the keys.
+    plain = await storage("test_cache")
+    assert set(plain.keys()) == set(cache.keys())
+    reloaded.clear()
+    await reloaded.sync()
+
+
+async def test_storage_cache_ttl():
+    """
+    Entries in a cache storage should expire after the ttl.
+    """
+    cache = await storage("test_cache", ttl=1)
+    cache.clear()
+    cache["key"] = "value"
+    assert cache["key"] == "value"
+    await asyncio.sleep(2.2)
+    assert "key" not in cache
+    assert cache.get("key") is None
+    assert len(cache) == 0
+    await cache.sync()
+
+
+async def test_storage_cache_class():
+    """
+    A cache needs a CacheStorage based storage class.
+    """
+    try:
+        await storage("test_cache", storage_class=dict, ttl=1)
+        assert False, "Expected TypeError"
+    except TypeError:
+        pass
+
+
+async def test_storage_compression():
+    """
+    Values bigger than the threshold should be compressed, and read back
+    as they were.
+    """
+    compressed = await storage("test_store", compress="gzip", threshold=1024)
+    text = "hello world " * 1000
+    data = bytearray(b"\x00\x01" * 5000)
+    compressed["text"] = text
+    compressed["dict"] = {"rows": [[i, "row"] for i in range(500)]}
+    compressed["bytearray"] = data
+    compressed["memoryview"] = memoryview(data)
+    compressed["small"] = "tiny"
+    await compressed.sync()
+    kind = _get_records().kind
+    if _DECOMPRESS_IN_PYTHON:
+        # Otherwise, values are kept decompressed in memory.
+        assert compressed._store.get("text").compressed == "gzip"
+    assert kind(compressed._store.get("small")) == "packed"
+
+    reloaded = await storage("test_store")
+    assert reloaded["text"] == text
+    assert reloaded["dict"]["rows"][499] == [499, "row"]
+    assert reloaded["bytearray"] == data
+    assert isinstance(reloaded["memoryview"], memoryview)
+    assert reloaded["memoryview"] == memoryview(data)
+    assert reloaded["small"] == "tiny"
+
+
+async def test_storage_compression_in_javascript():
+    """
+    Where Python can't decompress values, they should be decompressed in
+    JavaScript when the storage is opened.
+    """
+    import pyscript.storage as storage_module
+
+    compressed = await storage("test_store", compress="gzip", threshold=16)
+    compressed["text"] = "hello world " * 100
+    await compressed.sync()
+
+    storage_module._DECOMPRESS_IN_PYTHON = False
+    try:
+        reloaded = await storage("test_store")
+    finally:
+        storage_module._DECOMPRESS_IN_PYTHON = _DECOMPRESS_IN_PYTHON
+    assert _get_records().kind(reloaded._store.get("text")) == "packed"
+    assert reloaded["text"] == "hello world " * 100
+
+
+async def test_storage_compression_format():
+    """
+    Only compression formats supported by the browser can be used.
+    """
+    try:
+        await storage("test_store", compress="zip")
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+
+
+async def test_storage_usage():
+    """
+    The usage report should include the entries and size of each store, as
+    stored when asked for.
+    """
+    sized = await storage("test_usage")
+    sized.clear()
+    sized["a"] = "x" * 1000
+    sized["b"] = [1, 2, 3]
+    await sized.sync()
+    report = await usage()
+    assert report["stores"]["test_usage"]["entries"] == 2
+    size = report["stores"]["test_usage"]["bytes"]
+    assert size > 1000
+    assert report["quota"] is None or report["quota"] > 0
+    assert isinstance(report["persisted"], bool)
+
+    # Changes made through any storage of the store are counted.
+    other = await storage("test_usage")
+    del other["a"]
+    await other.sync()
+    report = await usage()
+    assert report["stores"]["test_usage"]["entries"] == 1
+    assert report["stores"]["test_usage"]["bytes"] < size - 1000
+    sized.clear()
+    await sized.sync()
+
@@ -46,6 +46,71 @@ def test_as_bytearray_binary_data():
     assert ba == bytearray(data)
 
 
+def test_as_bytearray_large():
+    """
+    The as_bytearray function should convert large buffers in bulk.
+    """
+    data = bytes(range(256)) * 4096
+    ba = util.as_bytearray(util.as_js_buffer(data).buffer)
+    assert len(ba) == len(data)
+    assert ba == data
+
+
+def test_as_js_buffer():
+    """
+    The as_js_buffer function should convert Python bytes to a JavaScript
+    Uint8Array.
+    """
+    msg = b"Hello, world!"
+    ui8a = util.as_js_buffer(msg)
+    assert ui8a.length == len(msg)
+    for i, b in enumerate(msg):
+        assert ui8a[i] == b
+
+
+def test_as_js_buffer_empty():
+    """
+    The as_js_buffer function should handle empty bytes-like objects.
+    """
+    ui8a = util.as_js_buffer(bytearray())
+    assert ui8a.length == 0
+
+
+def test_as_js_buffer_bytes_like():
+    """
+    The as_js_buffer function should accept any object supporting the buffer
+    protocol.
+    """
+    data = bytes(range(256))
+    for obj in (bytearray(data), memoryview(data)):
+        ui8a = util.as_js_buffer(obj)
+        assert util.as_bytearray(ui8a.buffer) == data
+
+
+def test_as_js_buffer_array():
+    """
+    The as_js_buffer function should copy the raw bytes of an array.array.
+    """
+    import array
+
+    arr = array.array("H", [1, 2, 258])
+    ui8a = util.as_js_buffer(arr)
+    assert ui8a.length == 6
+    assert util.as_bytearray(ui8a.buffer) == bytes(arr)
+
+
+def test_as_js_buffer_offset_length():
+    """
+    The as_js_buffer function should only copy the requested slice of bytes.
+    """
+    data = bytes(range(100))
+    assert util.as_bytearray(util.as_js_buffer(data, 10, 5).buffer) == data[10:15]
+    assert util.as_bytearray(util.as_js_buffer(data, 90).buffer) == data[90:]
+    assert util.as_js_buffer(data, 100, 0).length == 0
+    with upytest.raises(ValueError):
+        util.as_js_buffer(data, 95, 10)
+
+
 def test_not_supported_repr():
     """
     The NotSupported class should have a meaningful repr.
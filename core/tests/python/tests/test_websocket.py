@@ -2,10 +2,14 @@
 Exercise the pyscript.Websocket class.
 """
 
+import array
 import asyncio
+import js
 import upytest
 
 from pyscript import WebSocket
+from pyscript.ffi import to_js
+from pyscript.websocket import WebSocketEvent
 
 
 # Websocket tests are disabled by default because they don't reliably work in
@@ -207,6 +211,46 @@ async def test_websocket_send_bytes_conversion():
     assert len(messages) == 2
 
 
+@upytest.skip("Websocket tests are disabled.", skip_when=SKIP_WEBSOCKET_TESTS)
+async def test_websocket_send_buffer_protocol():
+    """
+    WebSocket send should accept any buffer protocol object, and slices of
+    it via offset and length, as well as a list of byte values. Other Python
+    objects should raise a TypeError.
+    """
+    messages = []
+    ready_to_test = asyncio.Event()
+
+    def on_open(event):
+        ws.send(memoryview(b"ABCDEF"))
+        ws.send(array.array("B", [0x41, 0x42, 0x43]))
+        ws.send(bytearray(b"0123456789"), offset=2, length=3)
+        ws.send([0x44, 0x45])
+        with upytest.raises(TypeError):
+            ws.send({"not": "binary"})
+
+    def on_message(event):
+        messages.append(event.data)
+        if len(messages) == 5:
+            ws.close()
+
+    def on_close(event):
+        ready_to_test.set()
+
+    ws = WebSocket(
+        url="wss://echo.websocket.org",
+        onopen=on_open,
+        onmessage=on_message,
+        onclose=on_close,
+    )
+
+    await ready_to_test.wait()
+    assert bytes(messages[1]) == b"ABCDEF"
+    assert bytes(messages[2]) == b"ABC"
+    assert bytes(messages[3]) == b"234"
+    assert bytes(messages[4]) == b"DE"
+
+
 @upytest.skip("Websocket tests are disabled.", skip_when=SKIP_WEBSOCKET_TESTS)
 async def test_websocket_event_wrapper():
     """
@@ -277,3 +321,161 @@ async def test_websocket_reassign_handler():
     # Verify that handler replacement worked.
     assert first_handler_called is False
     assert second_handler_called is True
+
+
+def test_websocket_invalid_overflow_policy():
+    """
+    An unknown overflow policy should raise a ValueError.
+    """
+    with upytest.raises(ValueError):
+        WebSocket(url="wss://echo.websocket.org", overflow="explode")
+
+
+@upytest.skip("Websocket tests are disabled.", skip_when=SKIP_WEBSOCKET_TESTS)
+async def test_websocket_recv():
+    """
+    Messages should be available via await ws.recv().
+    """
+    ws = WebSocket(url="wss://echo.websocket.org")
+    greeting = await ws.recv()
+    assert "request served by" in greeting.lower()
+    ws.send("Hello, world!")
+    assert await ws.recv() == "Hello, world!"
+    ws.close()
+    with upytest.raises(RuntimeError):
+        await ws.recv()
+
+
+@upytest.skip("Websocket tests are disabled.", skip_when=SKIP_WEBSOCKET_TESTS)
+async def test_websocket_async_iteration():
+    """
+    Messages should be available via async for, ending when the connection
+    is closed.
+    """
+    messages = []
+    ws = WebSocket(url="wss://echo.websocket.org")
+    async for message in ws:
+        messages.append(message)
+        if len(messages) == 1:
+            ws.send("one")
+            ws.send(b"two")
+            await ws.drain()
+        elif len(messages) == 3:
+            ws.close()
+    assert messages[1] == "one"
+    assert bytes(messages[2]) == b"two"
+
+
+@upytest.skip("Websocket tests are disabled.", skip_when=SKIP_WEBSOCKET_TESTS)
+async def test_websocket_recv_drop_oldest():
+    """
+    With the drop-oldest policy, a full receive queue should only keep the
+    most recent messages.
+    """
+    ws = WebSocket(url="wss://echo.websocket.org", max_queue=2, overflow="drop-oldest")
+    await ws.recv()  # The greeting.
+    for i in range(5):
+        ws.send(str(i))
+    await asyncio.sleep(1)
+    assert await ws.recv() == "3"
+    assert await ws.recv() == "4"
+    ws.close()
+
+
+@upytest.skip("Websocket tests are disabled.", skip_when=SKIP_WEBSOCKET_TESTS)
+async def test_websocket_recv_after_messages_arrived():
+    """
+    Messages received before the first call to recv() should not be lost.
+    """
+    ws = WebSocket(url="wss://echo.websocket.org")
+    await asyncio.sleep(1)
+    greeting = await ws.recv()
+    assert "request served by" in greeting.lower()
+    ws.close()
+
+
+def test_websocket_invalid_batch():
+    """
+    A batch that is neither "frame" nor a positive number of milliseconds
+    should raise a ValueError.
+    """
+    for batch in ("never", 0, -5):
+        with upytest.raises(ValueError):
+            WebSocket(url="wss://echo.websocket.org", batch=batch)
+
+
+@upytest.skip("Websocket tests are disabled.", skip_when=SKIP_WEBSOCKET_TESTS)
+async def test_websocket_batched_messages():
+    """
+    With batch="frame", the message handler should receive lists of
+    payloads rather than individual events.
+    """
+    batches = []
+    messages = []
+    ready_to_test = asyncio.Event()
+
+    def on_open(event):
+        for i in range(10):
+            ws.send(str(i))
+
+    def on_message(payloads):
+        batches.append(payloads)
+        messages.extend(payloads)
+        if len(messages) == 11:
+            ws.close()
+
+    def on_close(event):
+        # Every message was delivered before the close handler.
+        closed_after.extend(messages)
+        ready_to_test.set()
+
+    closed_after = []
+    # The close handler is assigned first, and still runs last.
+    ws = WebSocket(
+        url="wss://echo.websocket.org",
+        batch="frame",
+        onclose=on_close,
+        onopen=on_open,
+        onmessage=on_message,
+    )
+
+    await ready_to_test.wait()
+    assert all(isinstance(batch, list) for batch in batches)
+    assert messages[1:] == [str(i) for i in range(10)]
+    assert closed_after == messages
+
+
+def test_websocket_event_data_is_cached():
+    """
+    The WebSocketEvent should convert binary data only once, however many
+    times it is accessed.
+    """
+    js_event = js.MessageEvent.new(
+        "message", to_js({"data": js.Uint8Array.new(to_js([1, 2, 3])).buffer})
+    )
+    event = WebSocketEvent(js_event)
+    assert isinstance(event.data, memoryview)
+    assert event.data is event.data
+    assert bytes(event.data) == b"\x01\x02\x03"
+    assert event.type == "message"
+
+
+@upytest.skip("Websocket tests are disabled.", skip_when=SKIP_WEBSOCKET_TESTS)
+def test_websocket_raw_message_handler():
+    """
+    With raw=True, the onmessage handler should receive message payloads
+    rather than WebSocketEvent instances.
+    """
+    payloads = []
+    ws = WebSocket(
+        url="wss://echo.websocket.org", raw=True, onmessage=payloads.append
+    )
+    ws.onerror = lambda event: None
+    onmessage = ws._js_websocket.onmessage
+    onmessage(js.MessageEvent.new("message", to_js({"data": "hello"})))
+    onmessage(
+        js.MessageEvent.new("message", to_js({"data": js.Uint8Array.new(to_js([7])).buffer}))
+    )
+    ws.close()
+    assert payloads[0] == "hello"
+    assert bytes(payloads[1]) == b"\x07"